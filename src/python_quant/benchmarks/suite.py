@@ -0,0 +1,483 @@
+from argparse import ArgumentParser
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter, perf_counter_ns
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+import json
+import os
+import platform
+import sys
+import tracemalloc
+import numpy as np
+from python_quant.instrument.option import Option
+from python_quant.market_data.mkt_data_json import json_market_data_loader
+from python_quant.pricers.bsm_pricer import BSMPricer
+from python_quant.utils.csv import write_output_to_csv
+
+DEFAULT_SIZES = (1, 1_000, 100_000, 1_000_000)
+# Pricers are reused round-robin so memory stays bounded for large books
+PRICER_POOL_SIZE = 10_000
+LOADER_CALLS = 5
+# Timed runs of the sharded RISK scaling benchmark per worker count
+SCALING_CALLS = 3
+AS_OF = datetime(2025, 10, 10)
+LOGGER = getLogger("pyquant.benchmarks")
+LOGGER.disabled = True
+
+
+class BenchmarkResult(NamedTuple):
+    """
+    Timing of one benchmark on one book size.
+
+    Attributes:
+        name: Benchmark name.
+        size: Number of options (or underlyings) in the synthetic book.
+        calls: Number of timed calls.
+        total_seconds: Wall time of all timed calls.
+        throughput: Book items processed per second.
+        latency_us: Per-call latency percentiles (p50, p90, p99, max), in us.
+        peak_memory_bytes: tracemalloc peak of setup and calls, None if off.
+    """
+
+    name: str
+    size: int
+    calls: int
+    total_seconds: float
+    throughput: float
+    latency_us: Dict[str, float]
+    peak_memory_bytes: Optional[int]
+
+
+class Benchmark(NamedTuple):
+    """
+    A benchmark is a setup(size, workdir) returning a state, a step(state, i)
+    timed once per call, and the number of calls and book items per call.
+    """
+
+    name: str
+    setup: Callable[[int, Path], Any]
+    step: Callable[[Any, int], Any]
+    calls: Callable[[int], int]
+    items_per_call: Callable[[int], int]
+
+
+def synthetic_market_data(n_underlyings: int = 1) -> Dict[str, Any]:
+    """Market data snapshot with `n_underlyings` tickers SYM0, SYM1, ..."""
+    rng = np.random.default_rng(0)
+    data: Dict[str, Any] = {"risk_free_rate": 0.05, "dividend_yield": 0.02}
+    for i in range(n_underlyings):
+        data[f"SYM{i}"] = {
+            "spot_price": float(rng.uniform(50.0, 500.0)),
+            "volatility": float(rng.uniform(0.1, 0.6)),
+        }
+    return data
+
+
+def synthetic_book(size: int, quoted: bool = False) -> List[Option]:
+    """
+    European options on SYM0 with strikes from 80% to 120% of spot and
+    expiries from three months to two years. Quoted options carry a BSM
+    market price.
+    """
+    market_data = synthetic_market_data()
+    spot = market_data["SYM0"]["spot_price"]
+    rng = np.random.default_rng(1)
+    strikes = spot * rng.uniform(0.8, 1.2, size)
+    expiries = rng.integers(90, 730, size)
+    calls = rng.random(size) < 0.5
+
+    options = []
+    for strike, days, call in zip(strikes, expiries, calls, strict=True):
+        options.append(
+            Option(
+                strike_price=float(round(strike, 2)),
+                expiration_date=datetime.fromordinal(AS_OF.toordinal() + int(days)),
+                underlying_ticker="SYM0",
+                underlying_type="EQUITY",
+                market_price=None,
+                volatility=market_data["SYM0"]["volatility"],
+                call_put=Option.CallPut.CALL if call else Option.CallPut.PUT,
+            )
+        )
+    if quoted:
+        for option in options:
+            option.market_price = BSMPricer(option, AS_OF, market_data, LOGGER).price()
+    return options
+
+
+def _pricer_pool(size: int, quoted: bool = False) -> List[BSMPricer]:
+    market_data = synthetic_market_data()
+    options = synthetic_book(min(size, PRICER_POOL_SIZE), quoted=quoted)
+    return [BSMPricer(option, AS_OF, market_data, LOGGER) for option in options]
+
+
+def _price_step(pool: List[BSMPricer], i: int) -> float:
+    pricer = pool[i % len(pool)]
+    return pricer._bsm_price_from_vol(
+        S_o=pricer.spot_price,
+        K=pricer.instrument.strike_price,
+        r=pricer.risk_free_rate,
+        d=pricer.dividend_yield,
+        t=pricer.time_to_maturity,
+        sigma=pricer.volatility,
+        cp_flag=pricer.cp_flag,
+        terms=pricer.terms,
+    )
+
+
+def _greeks_step(pool: List[BSMPricer], i: int) -> Dict[str, float]:
+    return pool[i % len(pool)].greeks()
+
+
+def _implied_vol_step(pool: List[BSMPricer], i: int) -> float:
+    pricer = pool[i % len(pool)]
+    return pricer._volatility_from_market_price(
+        S_o=pricer.spot_price,
+        K=pricer.instrument.strike_price,
+        r=pricer.risk_free_rate,
+        d=pricer.dividend_yield,
+        t=pricer.time_to_maturity,
+        market_price=pricer.market_price,
+        cp_flag=pricer.cp_flag,
+    )
+
+
+def _loader_setup(size: int, workdir: Path) -> Path:
+    date_str = AS_OF.strftime("%Y%m%d")
+    path = workdir / f"{date_str}.json"
+    path.write_text(json.dumps({date_str: synthetic_market_data(size)}))
+    return workdir
+
+
+def _loader_step(json_path: Path, i: int) -> dict:
+    return json_market_data_loader(AS_OF, LOGGER, json_path)
+
+
+def _csv_setup(size: int, workdir: Path) -> Dict[str, Any]:
+    pool = _pricer_pool(size)
+    rows = [
+        {"instrument_details": p.instrument.to_dict(), "risk_metrics": p.greeks()}
+        for p in pool
+    ]
+    return {"rows": rows, "csv_path": str(workdir / "output.csv")}
+
+
+def _csv_step(state: Dict[str, Any], i: int) -> None:
+    rows = state["rows"]
+    write_output_to_csv(rows[i % len(rows)], state["csv_path"])
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "bsm_price": Benchmark(
+        "bsm_price",
+        lambda size, _: _pricer_pool(size),
+        _price_step,
+        lambda size: size,
+        lambda size: 1,
+    ),
+    "bsm_greeks": Benchmark(
+        "bsm_greeks",
+        lambda size, _: _pricer_pool(size),
+        _greeks_step,
+        lambda size: size,
+        lambda size: 1,
+    ),
+    "bsm_implied_volatility": Benchmark(
+        "bsm_implied_volatility",
+        lambda size, _: _pricer_pool(size, quoted=True),
+        _implied_vol_step,
+        lambda size: size,
+        lambda size: 1,
+    ),
+    "json_market_data_loader": Benchmark(
+        "json_market_data_loader",
+        _loader_setup,
+        _loader_step,
+        lambda size: LOADER_CALLS,
+        lambda size: size,
+    ),
+    "write_output_to_csv": Benchmark(
+        "write_output_to_csv",
+        _csv_setup,
+        _csv_step,
+        lambda size: size,
+        lambda size: 1,
+    ),
+}
+
+
+def run_benchmark(
+    benchmark: Benchmark, size: int, measure_memory: bool = True
+) -> BenchmarkResult:
+    """
+    Time `benchmark` on a book of `size` items. Latencies come from a plain
+    timed pass after one untimed warm-up call (which absorbs deferred
+    imports); peak memory, when requested, from a second pass (setup and
+    calls) under tracemalloc, so that tracing does not skew the timings.
+    """
+    calls = benchmark.calls(size)
+    with TemporaryDirectory() as tmpdirname:
+        state = benchmark.setup(size, Path(tmpdirname))
+        latencies = np.empty(calls)
+        step = benchmark.step
+        step(state, 0)
+        start = perf_counter()
+        for i in range(calls):
+            t0 = perf_counter_ns()
+            step(state, i)
+            latencies[i] = perf_counter_ns() - t0
+        total_seconds = perf_counter() - start
+        del state
+
+    peak_memory = None
+    if measure_memory:
+        with TemporaryDirectory() as tmpdirname:
+            tracemalloc.start()
+            try:
+                state = benchmark.setup(size, Path(tmpdirname))
+                for i in range(calls):
+                    step(state, i)
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            del state
+
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) / 1e3
+    items = calls * benchmark.items_per_call(size)
+    return BenchmarkResult(
+        name=benchmark.name,
+        size=size,
+        calls=calls,
+        total_seconds=total_seconds,
+        throughput=items / total_seconds if total_seconds > 0 else float("inf"),
+        latency_us={
+            "p50": float(p50),
+            "p90": float(p90),
+            "p99": float(p99),
+            "max": float(latencies.max() / 1e3),
+        },
+        peak_memory_bytes=peak_memory,
+    )
+
+
+def synthetic_portfolio(size: int, n_underlyings: int = 8) -> List[Dict[str, Any]]:
+    """
+    Portfolio instrument dicts on SYM0..SYM{n_underlyings - 1}: half
+    European, half American options (priced on binomial trees), with strikes
+    from 80% to 120% of spot and six expiries.
+    """
+    market_data = synthetic_market_data(n_underlyings)
+    rng = np.random.default_rng(2)
+    symbols = rng.integers(0, n_underlyings, size)
+    moneyness = rng.uniform(0.8, 1.2, size)
+    expiries = rng.choice([91, 182, 273, 365, 547, 730], size)
+    instruments = []
+    for i in range(size):
+        symbol = f"SYM{symbols[i]}"
+        expiry = datetime.fromordinal(AS_OF.toordinal() + int(expiries[i]))
+        instruments.append(
+            {
+                "type": "OPTION",
+                "underlying": {"type": "EQUITY", "symbol": symbol},
+                "option_type": "CALL" if i % 4 < 2 else "PUT",
+                "strike": round(market_data[symbol]["spot_price"] * moneyness[i], 2),
+                "expiry": expiry.strftime("%Y%m%d"),
+                "style": "EUROPEAN" if i % 2 else "AMERICAN",
+            }
+        )
+    return instruments
+
+
+def run_scaling(
+    sizes: Sequence[int],
+    workers: Sequence[int] = (1, 2, 4),
+    chunk_size: Optional[int] = None,
+    calls: int = SCALING_CALLS,
+) -> List[BenchmarkResult]:
+    """
+    Time portfolio RISK runs through a ShardedRiskRunner with each worker
+    count, recorded as "sharded_risk_<n>w" results. One latency is one run
+    over the whole book; the pool is started and warmed up before timing.
+    Shards default to a quarter of the book per worker of the largest count,
+    the same for every worker count.
+    """
+    from python_quant.mode_handler.parallel_risk import ShardedRiskRunner
+
+    results = []
+    for size in sizes:
+        instruments = synthetic_portfolio(size)
+        market_data = synthetic_market_data(8)
+        shard = chunk_size or max(1, -(-size // (4 * max(workers))))
+        shards = [instruments[i : i + shard] for i in range(0, size, shard)]
+        for n in workers:
+            with ShardedRiskRunner(AS_OF, market_data, LOGGER, workers=n) as runner:
+                for _ in runner.run(shards):
+                    pass
+                latencies = np.empty(calls)
+                for i in range(calls):
+                    t0 = perf_counter_ns()
+                    for _ in runner.run(shards):
+                        pass
+                    latencies[i] = perf_counter_ns() - t0
+            total_seconds = latencies.sum() / 1e9
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) / 1e3
+            results.append(
+                BenchmarkResult(
+                    name=f"sharded_risk_{n}w",
+                    size=size,
+                    calls=calls,
+                    total_seconds=total_seconds,
+                    throughput=size * calls / total_seconds,
+                    latency_us={
+                        "p50": float(p50),
+                        "p90": float(p90),
+                        "p99": float(p99),
+                        "max": float(latencies.max() / 1e3),
+                    },
+                    peak_memory_bytes=None,
+                )
+            )
+    return results
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    names: Optional[Sequence[str]] = None,
+    measure_memory: bool = True,
+) -> List[BenchmarkResult]:
+    """Run the selected benchmarks (all by default) on every book size."""
+    results = []
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark: {name}")
+        for size in sizes:
+            results.append(run_benchmark(BENCHMARKS[name], size, measure_memory))
+    return results
+
+
+def host_metadata() -> Dict[str, Any]:
+    """The host fields recorded next to the results, which throughput depends on."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def results_to_dict(results: Sequence[BenchmarkResult]) -> Dict[str, Any]:
+    return {**host_metadata(), "results": [result._asdict() for result in results]}
+
+
+def compare_to_baseline(
+    results: Sequence[BenchmarkResult],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+) -> List[Dict[str, Any]]:
+    """
+    Compare throughputs with a baseline written by results_to_dict().
+
+    Returns:
+        List[Dict[str, Any]]: One entry per (benchmark, size) whose
+        throughput fell by more than `tolerance` (0.25 is a 25% slowdown)
+        relative to the baseline. Pairs missing from the baseline are ignored.
+    """
+    reference = {
+        (entry["name"], entry["size"]): entry["throughput"]
+        for entry in baseline.get("results", [])
+    }
+    regressions = []
+    for result in results:
+        baseline_throughput = reference.get((result.name, result.size))
+        if not baseline_throughput:
+            continue
+        slowdown = baseline_throughput / result.throughput - 1.0
+        if slowdown > tolerance:
+            regressions.append(
+                {
+                    "name": result.name,
+                    "size": result.size,
+                    "baseline_throughput": baseline_throughput,
+                    "throughput": result.throughput,
+                    "slowdown": slowdown,
+                }
+            )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = ArgumentParser(description="PyQuant benchmark suite")
+    parser.add_argument(
+        "--sizes",
+        help="Comma separated book sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+    )
+    parser.add_argument(
+        "--benchmarks",
+        help=f"Comma separated benchmarks to run [{', '.join(BENCHMARKS)}]",
+    )
+    parser.add_argument(
+        "--workers",
+        help="Comma separated worker counts of the sharded RISK scaling "
+        "benchmark, run on every book size when given",
+    )
+    parser.add_argument(
+        "--output", help="Path of the JSON results file", default="benchmarks.json"
+    )
+    parser.add_argument("--baseline", help="Baseline JSON results to compare with")
+    parser.add_argument(
+        "--tolerance",
+        help="Allowed throughput slowdown against the baseline",
+        type=float,
+        default=0.25,
+    )
+    parser.add_argument(
+        "--no_memory",
+        help="Skip the tracemalloc peak memory pass",
+        default=False,
+        action="store_true",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        sizes=[int(size) for size in args.sizes.split(",")],
+        names=args.benchmarks.split(",") if args.benchmarks else None,
+        measure_memory=not args.no_memory,
+    )
+    if args.workers:
+        results += run_scaling(
+            sizes=[int(size) for size in args.sizes.split(",")],
+            workers=[int(n) for n in args.workers.split(",")],
+        )
+    for result in results:
+        print(
+            f"{result.name:<26}{result.size:>10}{result.throughput:>16,.0f}/s"
+            f"  p50 {result.latency_us['p50']:>9.1f}us"
+            f"  p99 {result.latency_us['p99']:>9.1f}us"
+        )
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results_to_dict(results), indent=2))
+    print(f"Results written to: {output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        # Throughputs from another host are not comparable like for like
+        for key, value in host_metadata().items():
+            if baseline.get(key) != value:
+                print(f"Baseline {key} {baseline.get(key)} differs from {value}")
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['name']} size {regression['size']}: "
+                f"{regression['slowdown']:.0%} slower than baseline"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+from collections.abc import Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import multiprocessing
+import os
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from python_quant.market_data.vol_surface import SVI_PARAMETERS, svi_total_variance
+
+# Weight of the no-arbitrage constraint residuals relative to the fit
+CONSTRAINT_PENALTY = 1e3
+# Roger Lee's moment bound on the wings of total variance: b (1 + |rho|) <= 2
+MAX_WING_SLOPE = 2.0
+# log-moneyness margin around the quotes checked for butterfly arbitrage
+BUTTERFLY_MARGIN = 1.0
+# Points of the log-moneyness grid on which g(k) >= 0 is enforced and checked
+BUTTERFLY_GRID_POINTS = 201
+# Density the penalty aims for, so the fit lands clear of g(k) = 0
+BUTTERFLY_FLOOR = 1e-4
+# Weight of the g(k) residuals; g is O(1), total variance residuals are far
+# smaller, and a weight as large as CONSTRAINT_PENALTY stalls the solver
+DENSITY_PENALTY = 1.0
+
+
+class SVIParameters(NamedTuple):
+    """Raw SVI parameters of one expiry, see svi_total_variance()."""
+
+    a: float
+    b: float
+    rho: float
+    m: float
+    sigma: float
+
+
+class SVISliceQuotes(NamedTuple):
+    """
+    Implied total variances of one expiry, the input of a slice fit.
+
+    Attributes:
+        symbol: Underlying symbol.
+        expiry: Expiry as YYYYMMDD.
+        tenor: Year fraction to expiry.
+        forward: Forward price at expiry.
+        log_moneyness: log(K / F) of every quote.
+        total_variance: Implied volatility squared times tenor of every quote.
+        initial: Parameters to start the fit from (e.g. the previous date's),
+            or None for a guess from the quotes.
+    """
+
+    symbol: str
+    expiry: str
+    tenor: float
+    forward: float
+    log_moneyness: NDArray[np.float64]
+    total_variance: NDArray[np.float64]
+    initial: Optional[SVIParameters] = None
+
+
+class SVISlice(NamedTuple):
+    """
+    Fitted SVI slice.
+
+    Attributes:
+        rmse: Root mean square error of the fit in implied volatility.
+        n_quotes: Number of quotes the slice was fitted to.
+        evaluations: Number of residual evaluations of the solver.
+        success: Whether the solver reported convergence.
+        butterfly_arbitrage: Whether the slice has negative density
+            somewhere near the quotes.
+    """
+
+    symbol: str
+    expiry: str
+    tenor: float
+    forward: float
+    params: SVIParameters
+    rmse: float
+    n_quotes: int
+    evaluations: int
+    success: bool
+    butterfly_arbitrage: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Market data form of the slice, as read by SVISurface.from_dict()."""
+        return {
+            "expiry": self.expiry,
+            "tenor": self.tenor,
+            "forward": self.forward,
+            **self.params._asdict(),
+        }
+
+
+def svi_jacobian(k: ArrayLike, params: Sequence[float]) -> NDArray[np.float64]:
+    """Derivatives of svi_total_variance() by (a, b, rho, m, sigma), (n, 5)."""
+    _, b, rho, m, sigma = params
+    x = np.asarray(k, dtype=np.float64) - m
+    root = np.sqrt(x * x + sigma * sigma)
+    return np.column_stack(
+        [
+            np.ones_like(x),
+            rho * x + root,
+            b * x,
+            -b * (rho + x / root),
+            b * sigma / root,
+        ]
+    )
+
+
+def _constraints(params: Sequence[float]) -> NDArray[np.float64]:
+    """Constraint values, feasible when <= 0: wing slope, minimum variance."""
+    a, b, rho, _, sigma = params
+    return np.array(
+        [
+            b * (1.0 + abs(rho)) - MAX_WING_SLOPE,
+            -(a + b * sigma * np.sqrt(1.0 - rho * rho)),
+        ]
+    )
+
+
+def _constraints_jacobian(params: Sequence[float]) -> NDArray[np.float64]:
+    _, b, rho, _, sigma = params
+    root = np.sqrt(1.0 - rho * rho)
+    return np.array(
+        [
+            [0.0, 1.0 + abs(rho), b * np.sign(rho), 0.0, 0.0],
+            [-1.0, -sigma * root, b * sigma * rho / root, 0.0, -b * root],
+        ]
+    )
+
+
+def butterfly_grid(k: ArrayLike, n_points: int = BUTTERFLY_GRID_POINTS) -> NDArray:
+    """Grid spanning the quoted log-moneyness plus BUTTERFLY_MARGIN either side."""
+    k = np.asarray(k, dtype=np.float64)
+    return np.linspace(k.min() - BUTTERFLY_MARGIN, k.max() + BUTTERFLY_MARGIN, n_points)
+
+
+def butterfly_density(
+    params: Sequence[float], grid: ArrayLike
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Total variance w(k) and Gatheral's density function g(k) of a raw SVI
+    slice on `grid`; the slice is free of butterfly arbitrage where both are
+    positive.
+    """
+    _, b, rho, m, sigma = params
+    grid = np.asarray(grid, dtype=np.float64)
+    w = svi_total_variance(grid, *params)
+    x = grid - m
+    root = np.sqrt(x * x + sigma * sigma)
+    dw = b * (rho + x / root)
+    d2w = b * sigma * sigma / root**3
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g = (1.0 - grid * dw / (2.0 * w)) ** 2 - dw * dw / 4.0 * (1.0 / w + 0.25)
+    return w, g + d2w / 2.0
+
+
+def _density_shortfall(
+    params: Sequence[float], grid: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """How far g(k) is below BUTTERFLY_FLOOR on the grid (0 where it is not)."""
+    w, g = butterfly_density(params, grid)
+    return np.where(w > 0.0, np.maximum(BUTTERFLY_FLOOR - g, 0.0), BUTTERFLY_FLOOR)
+
+
+def _residuals(
+    params: NDArray[np.float64],
+    k: NDArray[np.float64],
+    w: NDArray[np.float64],
+    grid: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    fit = svi_total_variance(k, *params) - w
+    penalty = CONSTRAINT_PENALTY * np.maximum(_constraints(params), 0.0)
+    density = DENSITY_PENALTY * _density_shortfall(params, grid)
+    return np.concatenate([fit, penalty, density])
+
+
+def _residuals_jacobian(
+    params: NDArray[np.float64],
+    k: NDArray[np.float64],
+    w: NDArray[np.float64],
+    grid: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    active = (_constraints(params) > 0.0)[:, None]
+    penalty = CONSTRAINT_PENALTY * np.where(active, _constraints_jacobian(params), 0.0)
+    # The density residuals are mostly inactive: forward differences only
+    # when some grid point is short
+    density = np.zeros((grid.size, params.size))
+    shortfall = _density_shortfall(params, grid)
+    if shortfall.any():
+        for j in range(params.size):
+            bumped = params.copy()
+            step = 1e-7 * max(1.0, abs(params[j]))
+            bumped[j] += step
+            density[:, j] = (_density_shortfall(bumped, grid) - shortfall) / step
+    return np.vstack([svi_jacobian(k, params), penalty, DENSITY_PENALTY * density])
+
+
+def _initial_guess(k: NDArray[np.float64], w: NDArray[np.float64]) -> SVIParameters:
+    atm = int(np.argmin(w))
+    sigma = 0.1
+    b = 0.1
+    return SVIParameters(
+        a=max(float(w[atm]) - b * sigma, 1e-6),
+        b=b,
+        rho=0.0,
+        m=float(k[atm]),
+        sigma=sigma,
+    )
+
+
+def has_butterfly_arbitrage(
+    params: Sequence[float], k: ArrayLike, n_points: int = BUTTERFLY_GRID_POINTS
+) -> bool:
+    """
+    Check Gatheral's density condition g(k) >= 0 (and w(k) > 0) on
+    butterfly_grid() of the quoted log-moneyness `k`.
+    """
+    w, g = butterfly_density(params, butterfly_grid(k, n_points))
+    return bool(np.any(w <= 0.0) or np.any(g < -1e-10))
+
+
+def fit_svi_slice(quotes: SVISliceQuotes, max_evaluations: int = 500) -> SVISlice:
+    """
+    Least-squares fit of one SVI slice to its total variances, with the
+    analytic Jacobian. Roger Lee's wing bound and a non-negative minimum
+    variance are enforced as penalty residuals. If the fit has butterfly
+    arbitrage, it is refitted from there with Gatheral's density condition
+    g(k) >= 0 on butterfly_grid() as further penalty residuals; starting
+    from the unconstrained fit keeps the solver out of the poor local minima
+    of the penalized problem. butterfly_arbitrage is checked on the result.
+    """
+    from scipy.optimize import least_squares
+
+    k, w = quotes.log_moneyness, quotes.total_variance
+    lower = [-np.inf, 0.0, -0.999, k.min() - 1.0, 1e-4]
+    upper = [np.inf, MAX_WING_SLOPE, 0.999, k.max() + 1.0, 5.0]
+    start = np.clip(
+        np.asarray(quotes.initial or _initial_guess(k, w), dtype=np.float64),
+        np.add(lower, 1e-8),
+        np.subtract(upper, 1e-8),
+    )
+
+    def solve(x0: NDArray[np.float64], grid: NDArray[np.float64], x_scale: Any) -> Any:
+        return least_squares(
+            _residuals,
+            x0,
+            jac=_residuals_jacobian,
+            bounds=(lower, upper),
+            args=(k, w, grid),
+            method="trf",
+            x_scale=x_scale,
+            max_nfev=max_evaluations,
+        )
+
+    result = solve(start, np.empty(0), "jac")
+    evaluations = result.nfev
+    if has_butterfly_arbitrage(result.x, k):
+        # Scaling by the Jacobian, whose density rows switch on and off
+        # between steps, slows the penalized fit down to a crawl
+        result = solve(result.x, butterfly_grid(k), 1.0)
+        evaluations += result.nfev
+    params = SVIParameters(*(float(p) for p in result.x))
+    model_vol = np.sqrt(np.maximum(svi_total_variance(k, *params), 0.0) / quotes.tenor)
+    market_vol = np.sqrt(w / quotes.tenor)
+    return SVISlice(
+        symbol=quotes.symbol,
+        expiry=quotes.expiry,
+        tenor=quotes.tenor,
+        forward=quotes.forward,
+        params=params,
+        rmse=float(np.sqrt(np.mean((model_vol - market_vol) ** 2))),
+        n_quotes=int(k.size),
+        evaluations=int(evaluations),
+        success=bool(result.success),
+        butterfly_arbitrage=has_butterfly_arbitrage(params, k),
+    )
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Pool of `workers` processes to fit slices on, reusable across dates."""
+    # forkserver: forking a process that runs polars/BLAS threads can deadlock
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("forkserver")
+    )
+
+
+def fit_svi_slices(
+    slices: Iterable[SVISliceQuotes],
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[SVISlice]:
+    """
+    Fit every slice, in parallel across a process pool of `workers`
+    processes (default: one per CPU). Results keep the order of `slices`;
+    a single slice or worker is fitted in-process. Pass a process_pool() as
+    `executor` to reuse its processes across calls instead of starting a
+    pool per call.
+    """
+    slices = list(slices)
+    workers = min(workers or os.cpu_count() or 1, len(slices))
+    if workers <= 1:
+        return [fit_svi_slice(quotes) for quotes in slices]
+    chunksize = max(1, len(slices) // (4 * workers))
+    if executor is not None:
+        return list(executor.map(fit_svi_slice, slices, chunksize=chunksize))
+    with process_pool(workers) as pool:
+        return list(pool.map(fit_svi_slice, slices, chunksize=chunksize))
+
+
+def svi_parameters_from_market_data(
+    market_data: Mapping[str, Any],
+) -> Dict[tuple, SVIParameters]:
+    """
+    SVI parameters of every (symbol, expiry) slice in a market data snapshot,
+    used to warm-start the next date's fits.
+    """
+    params: Dict[tuple, SVIParameters] = {}
+    for symbol, ticker_data in market_data.items():
+        if not isinstance(ticker_data, Mapping):
+            continue
+        spec = ticker_data.get("vol_surface")
+        if not spec or str(spec.get("type", "")).upper() != "SVI":
+            continue
+        for fitted in spec["slices"]:
+            params[(symbol, str(fitted["expiry"]))] = SVIParameters(
+                *(float(fitted[key]) for key in SVI_PARAMETERS)
+            )
+    return params
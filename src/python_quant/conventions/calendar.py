@@ -0,0 +1,83 @@
+from datetime import date, datetime
+from typing import Any, Iterable, Tuple, Union
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+DateLike = Union[date, datetime, np.datetime64, str]
+
+# Index range built up front; dates outside it grow the index on demand
+DEFAULT_INDEX_RANGE: Tuple[str, str] = ("1970-01-01", "2100-01-01")
+
+
+class HolidayCalendar:
+    """
+    Business-day calendar with a precomputed business-day index.
+
+    The index holds, for every calendar day d of its range, the number of
+    business days in [start, d). The business days in [d1, d2) are then
+    index[d2] - index[d1]: two array lookups per date pair, however far apart
+    the dates are, and whole arrays of pairs at once. The index is built once
+    (about 48k days for the default range) and extended if a date falls
+    outside it.
+
+    Args:
+        holidays: Non-business dates on top of the weekend.
+        weekmask: Business days of the week, Monday first, as in
+            numpy.busday_count ("1111100" is Monday to Friday).
+        index_range: First and last date covered by the initial index.
+    """
+
+    def __init__(
+        self,
+        holidays: Iterable[DateLike] = (),
+        weekmask: str = "1111100",
+        index_range: Tuple[DateLike, DateLike] = DEFAULT_INDEX_RANGE,
+    ) -> None:
+        self.weekmask = weekmask
+        self.holidays = np.unique(to_datetime64([*holidays]))
+        self._build_index(*to_datetime64(list(index_range)))
+
+    def _build_index(self, start: np.datetime64, end: np.datetime64) -> None:
+        days = np.arange(start, end + 1, dtype="datetime64[D]")
+        is_business = np.is_busday(days, weekmask=self.weekmask, holidays=self.holidays)
+        self._start = start
+        self._index = np.zeros(days.size + 1, dtype=np.int32)
+        np.cumsum(is_business, out=self._index[1:])
+
+    def _ensure_covered(self, days: NDArray[np.datetime64]) -> None:
+        if not days.size:
+            return
+        first, last = days.min(), days.max()
+        end = self._start + np.timedelta64(self._index.size - 1, "D")
+        if first < self._start or last > end:
+            self._build_index(min(first, self._start), max(last, end))
+
+    def business_days(self, start: ArrayLike, end: ArrayLike) -> NDArray[np.int64]:
+        """
+        Business days in [start, end) for arrays (or scalars) of dates;
+        negative where end is before start, like numpy.busday_count.
+        """
+        start_days, end_days = np.broadcast_arrays(
+            to_datetime64(start), to_datetime64(end)
+        )
+        self._ensure_covered(start_days)
+        self._ensure_covered(end_days)
+        counts = (
+            self._index[(end_days - self._start).astype(np.int64)]
+            - self._index[(start_days - self._start).astype(np.int64)]
+        )
+        return counts.astype(np.int64)
+
+    def is_business_day(self, days: ArrayLike) -> NDArray[np.bool_]:
+        return np.is_busday(
+            to_datetime64(days), weekmask=self.weekmask, holidays=self.holidays
+        )
+
+
+def to_datetime64(values: Any) -> NDArray[np.datetime64]:
+    """Dates, datetimes, ISO strings or datetime64 values as datetime64[D]."""
+    return np.asarray(values, dtype="datetime64[D]")
+
+
+# Saturday/Sunday only; the calendar of BUS/252 unless another is given
+WEEKEND_CALENDAR = HolidayCalendar()
@@ -1,23 +1,62 @@
 from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from python_quant.conventions.calendar import (
+    WEEKEND_CALENDAR,
+    HolidayCalendar,
+    to_datetime64,
+)
+
+BUSINESS_DAYS_PER_YEAR = 252.0
 
 
 class DayCount:
-    """A class representing day count conventions for financial calculations."""
+    """
+    A class representing day count conventions for financial calculations.
+
+    Supported conventions: 30/360, ACT/360, ACT/365, ACT/ACT ISDA and BUS/252.
+    year_fraction() works on a pair of datetimes and year_fractions() on
+    whole numpy.datetime64 arrays; both dispatch through a table looked up
+    once at construction.
+
+    Args:
+        convention: Day count convention name (case insensitive).
+        calendar: Business-day calendar of BUS/252; defaults to weekends only.
+    """
 
-    def __init__(self, convention: str) -> None:
+    _DISPATCH: Dict[str, Tuple[Callable[..., float], Callable[..., Any]]]
+
+    def __init__(
+        self, convention: str, calendar: Optional[HolidayCalendar] = None
+    ) -> None:
         self.convention = convention and convention.upper()
+        self.calendar = calendar or WEEKEND_CALENDAR
+        self._scalar, self._vector = self._DISPATCH.get(self.convention, (None, None))
+
+    def _unsupported(self) -> ValueError:
+        return ValueError(f"Unsupported day count convention: {self.convention}")
 
     def year_fraction(self, start_date: datetime, end_date: datetime) -> float:
         """Calculate the year fraction between two dates based on the convention."""
-        match self.convention:
-            case "30/360":
-                return self._year_fraction_30_360(start_date, end_date)
-            case "ACT/360":
-                return self._year_fraction_act_360(start_date, end_date)
-            case "ACT/365":
-                return self._year_fraction_act_365(start_date, end_date)
-            case _:
-                raise ValueError(f"Unsupported day count convention: {self.convention}")
+        if self._scalar is None:
+            raise self._unsupported()
+        return self._scalar(self, start_date, end_date)
+
+    def year_fractions(
+        self, start_dates: ArrayLike, end_dates: ArrayLike
+    ) -> NDArray[np.float64]:
+        """
+        Year fractions between arrays (or scalars, broadcast) of dates, as
+        datetime64 values, datetimes or ISO strings. Dates are taken at day
+        resolution.
+        """
+        if self._vector is None:
+            raise self._unsupported()
+        start, end = np.broadcast_arrays(
+            to_datetime64(start_dates), to_datetime64(end_dates)
+        )
+        return self._vector(self, start, end)
 
     def _year_fraction_30_360(self, start_date: datetime, end_date: datetime) -> float:
         d1 = start_date.day
@@ -41,3 +80,92 @@ class DayCount:
     def _year_fraction_act_365(self, start_date: datetime, end_date: datetime) -> float:
         delta = end_date - start_date
         return delta.days / 365.0
+
+    def _year_fraction_act_act_isda(
+        self, start_date: datetime, end_date: datetime
+    ) -> float:
+        if end_date < start_date:
+            return -self._year_fraction_act_act_isda(end_date, start_date)
+        y1, y2 = start_date.year, end_date.year
+        if y1 == y2:
+            return (end_date - start_date).days / _days_in_year(y1)
+        first = (datetime(y1 + 1, 1, 1) - start_date).days / _days_in_year(y1)
+        last = (end_date - datetime(y2, 1, 1)).days / _days_in_year(y2)
+        return first + (y2 - y1 - 1) + last
+
+    def _year_fraction_bus_252(self, start_date: datetime, end_date: datetime) -> float:
+        days = self.calendar.business_days(start_date, end_date)
+        return int(days) / BUSINESS_DAYS_PER_YEAR
+
+    def _year_fractions_30_360(
+        self, start: NDArray[np.datetime64], end: NDArray[np.datetime64]
+    ) -> NDArray[np.float64]:
+        y1, m1, d1 = _year_month_day(start)
+        y2, m2, d2 = _year_month_day(end)
+        d1 = np.where(d1 == 31, 30, d1)
+        d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+        return ((360 * (y2 - y1)) + (30 * (m2 - m1)) + (d2 - d1)) / 360.0
+
+    def _year_fractions_act_360(
+        self, start: NDArray[np.datetime64], end: NDArray[np.datetime64]
+    ) -> NDArray[np.float64]:
+        return (end - start).astype(np.int64) / 360.0
+
+    def _year_fractions_act_365(
+        self, start: NDArray[np.datetime64], end: NDArray[np.datetime64]
+    ) -> NDArray[np.float64]:
+        return (end - start).astype(np.int64) / 365.0
+
+    def _year_fractions_act_act_isda(
+        self, start: NDArray[np.datetime64], end: NDArray[np.datetime64]
+    ) -> NDArray[np.float64]:
+        sign = np.where(end < start, -1.0, 1.0)
+        lo, hi = np.minimum(start, end), np.maximum(start, end)
+        y1, y2 = lo.astype("datetime64[Y]"), hi.astype("datetime64[Y]")
+        y1_start, y2_start = y1.astype("datetime64[D]"), y2.astype("datetime64[D]")
+        y1_end = (y1 + 1).astype("datetime64[D]")
+        y1_days = (y1_end - y1_start).astype(np.int64)
+        y2_days = ((y2 + 1).astype("datetime64[D]") - y2_start).astype(np.int64)
+
+        same_year = (hi - lo).astype(np.int64) / y1_days
+        spanning = (
+            (y1_end - lo).astype(np.int64) / y1_days
+            + (y2 - y1).astype(np.int64)
+            - 1
+            + (hi - y2_start).astype(np.int64) / y2_days
+        )
+        return sign * np.where(y1 == y2, same_year, spanning)
+
+    def _year_fractions_bus_252(
+        self, start: NDArray[np.datetime64], end: NDArray[np.datetime64]
+    ) -> NDArray[np.float64]:
+        return self.calendar.business_days(start, end) / BUSINESS_DAYS_PER_YEAR
+
+
+DayCount._DISPATCH = {
+    "30/360": (DayCount._year_fraction_30_360, DayCount._year_fractions_30_360),
+    "ACT/360": (DayCount._year_fraction_act_360, DayCount._year_fractions_act_360),
+    "ACT/365": (DayCount._year_fraction_act_365, DayCount._year_fractions_act_365),
+    "ACT/ACT ISDA": (
+        DayCount._year_fraction_act_act_isda,
+        DayCount._year_fractions_act_act_isda,
+    ),
+    "BUS/252": (DayCount._year_fraction_bus_252, DayCount._year_fractions_bus_252),
+}
+CONVENTIONS = tuple(DayCount._DISPATCH)
+
+
+def _days_in_year(year: int) -> int:
+    return 366 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 365
+
+
+def _year_month_day(
+    days: NDArray[np.datetime64],
+) -> Tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.int64]]:
+    years = days.astype("datetime64[Y]")
+    months = days.astype("datetime64[M]")
+    return (
+        years.astype(np.int64) + 1970,
+        (months - years.astype("datetime64[M]")).astype(np.int64) + 1,
+        (days - months.astype("datetime64[D]")).astype(np.int64) + 1,
+    )
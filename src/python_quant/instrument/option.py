@@ -1,10 +1,33 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Sequence
+import numpy as np
+from numpy.typing import NDArray
+from python_quant.conventions.calendar import to_datetime64
 from python_quant.conventions.day_count import DayCount
 
 
+@lru_cache(maxsize=None)
+def shared_day_count(convention: str) -> DayCount:
+    """One DayCount instance per convention, shared by every option."""
+    return DayCount(convention=convention)
+
+
 class Option:
+    # Slotted: books of options hold no per-instance __dict__
+    __slots__ = (
+        "strike_price",
+        "expiration_date",
+        "option_type",
+        "call_put",
+        "underlying",
+        "market_price",
+        "volatility",
+        "exercise_dates",
+        "day_count_convention",
+    )
+
     class OptionType(Enum):
         AMERICAN = "American"
         EUROPEAN = "European"
@@ -26,6 +49,7 @@ class Option:
         call_put: CallPut = CallPut.CALL,
         *,
         conventions: Optional[Dict[str, str]] = None,
+        exercise_dates: Optional[List[datetime]] = None,
     ) -> None:
         self.strike_price = strike_price
         self.expiration_date = expiration_date
@@ -34,13 +58,14 @@ class Option:
         self.underlying = {"symbol": underlying_ticker, "type": underlying_type}
         self.market_price = market_price or None
         self.volatility = volatility
+        self.exercise_dates = sorted(exercise_dates) if exercise_dates else None
 
         if conventions:
-            self.day_count_convention = DayCount(
-                convention=conventions.get("day_count_convention", "ACT/365")
+            self.day_count_convention = shared_day_count(
+                conventions.get("day_count_convention", "ACT/365")
             )
         else:
-            self.day_count_convention = DayCount(convention="ACT/365")
+            self.day_count_convention = shared_day_count("ACT/365")
 
     def __repr__(self) -> str:
         return f"EquityOption(strike_price={self.strike_price}, \
@@ -60,6 +85,27 @@ class Option:
             start_date=as_of_date, end_date=self.expiration_date
         )
 
+    @staticmethod
+    def times_to_maturity(
+        options: Sequence["Option"], as_of_date: datetime
+    ) -> NDArray[np.float64]:
+        """
+        time_to_maturity() of many options at once, with one vectorized
+        year_fractions() call per day count convention in use.
+        """
+        times = np.zeros(len(options))
+        if not options:
+            return times
+        expiries = to_datetime64([option.expiration_date for option in options])
+        day_counts = [option.day_count_convention for option in options]
+        groups = np.array([id(day_count) for day_count in day_counts])
+        as_of = to_datetime64(as_of_date)
+        for group in np.unique(groups):
+            idx = np.flatnonzero(groups == group)
+            day_count = day_counts[idx[0]]
+            times[idx] = day_count.year_fractions(as_of, expiries[idx])
+        return np.where(expiries < as_of, 0.0, times)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "strike_price": self.strike_price,
@@ -0,0 +1,374 @@
+from collections.abc import Mapping
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from numpy.typing import NDArray
+from python_quant.conventions.calendar import to_datetime64
+from python_quant.instrument.option import Option, shared_day_count
+
+if TYPE_CHECKING:
+    import polars as pl
+
+# Style codes of OptionBook.style, in Option.OptionType order
+STYLES: Tuple[Option.OptionType, ...] = tuple(Option.OptionType)
+_STYLE_CODES = {style.name: code for code, style in enumerate(STYLES)}
+_EUROPEAN = _STYLE_CODES["EUROPEAN"]
+_KEY_SEPARATOR = "\x1f"
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+class OptionBook:
+    """
+    Struct-of-arrays container for a book of vanilla options.
+
+    Every field is one contiguous array: strike (float64), expiry
+    (datetime64[D]), cp_flag (int8, +1 call / -1 put), style (int8 code into
+    STYLES), underlying_id (int32 index into `underlyings`) and market_price
+    (float64, NaN where not quoted). Underlyings are stored once as
+    (symbol, type) pairs, in sorted order, and the day count convention once
+    per book.
+
+    A book sorted by sorted() is ordered by underlying and expiry, so
+    by_underlying() and chain() return zero-copy slices (numpy views);
+    `index` maps every row back to its position in the input. Option objects
+    are only created on request by option()/options(), and share their
+    underlying dict and DayCount with the other views of the book;
+    to_frame() gives the Option.to_dict() columns of all rows without them.
+    """
+
+    __slots__ = (
+        "strike",
+        "expiry",
+        "cp_flag",
+        "style",
+        "underlying_id",
+        "market_price",
+        "index",
+        "underlyings",
+        "day_count_convention",
+        "is_sorted",
+        "_underlying_dicts",
+    )
+
+    def __init__(
+        self,
+        strike: NDArray[np.float64],
+        expiry: NDArray[np.datetime64],
+        cp_flag: NDArray[np.int8],
+        style: NDArray[np.int8],
+        underlying_id: NDArray[np.int32],
+        market_price: NDArray[np.float64],
+        underlyings: Sequence[Tuple[str, str]],
+        index: Optional[NDArray[np.int64]] = None,
+        day_count_convention: str = "ACT/365",
+        is_sorted: bool = False,
+    ) -> None:
+        self.strike = np.asarray(strike, dtype=np.float64)
+        self.expiry = np.asarray(expiry, dtype="datetime64[D]")
+        self.cp_flag = np.asarray(cp_flag, dtype=np.int8)
+        self.style = np.asarray(style, dtype=np.int8)
+        self.underlying_id = np.asarray(underlying_id, dtype=np.int32)
+        self.market_price = np.asarray(market_price, dtype=np.float64)
+        self.index = (
+            np.arange(self.strike.size, dtype=np.int64) if index is None else index
+        )
+        self.underlyings = tuple(underlyings)
+        self.day_count_convention = day_count_convention
+        self.is_sorted = is_sorted
+        self._underlying_dicts = [
+            {"symbol": symbol, "type": kind} for symbol, kind in self.underlyings
+        ]
+
+        n = self.strike.size
+        for name in ("expiry", "cp_flag", "style", "underlying_id", "market_price"):
+            if getattr(self, name).shape != (n,):
+                raise ValueError(f"OptionBook field {name} must have {n} entries.")
+
+    def __len__(self) -> int:
+        return self.strike.size
+
+    @classmethod
+    def from_columns(
+        cls,
+        underlying_symbol: Sequence[str],
+        underlying_type: Sequence[str],
+        option_type: Sequence[str],
+        strike: Sequence[float],
+        expiry: Sequence[Any],
+        style: Optional[Sequence[Optional[str]]] = None,
+        market_price: Optional[Sequence[Optional[float]]] = None,
+        day_count_convention: str = "ACT/365",
+    ) -> "OptionBook":
+        """
+        Build a book from flat portfolio columns (see utils/portfolio.py).
+        Expiries are YYYYMMDD strings or ints; missing styles default to
+        EUROPEAN and missing market prices to NaN.
+        """
+        import polars as pl
+
+        columns: Dict[str, Any] = {
+            "underlying_symbol": underlying_symbol,
+            "underlying_type": underlying_type,
+            "option_type": option_type,
+            "strike": strike,
+            "expiry": [str(e) for e in expiry],
+        }
+        if style is not None:
+            columns["style"] = pl.Series(list(style), dtype=pl.Utf8)
+        if market_price is not None:
+            columns["market_price"] = pl.Series(list(market_price), dtype=pl.Float64)
+        return cls.from_frame(pl.DataFrame(columns), day_count_convention)
+
+    @classmethod
+    def from_frame(
+        cls, df: "pl.DataFrame", day_count_convention: str = "ACT/365"
+    ) -> "OptionBook":
+        """
+        Build a book straight from the columns of a polars portfolio frame
+        (underlying_symbol, underlying_type, option_type, strike, expiry and
+        the optional style/market_price columns). All per-row parsing is done
+        by polars expressions.
+        """
+        import polars as pl
+
+        key = pl.concat_str(
+            ["underlying_symbol", "underlying_type"], separator=_KEY_SEPARATOR
+        )
+        style = (
+            pl.col("style").str.to_uppercase()
+            if "style" in df.columns
+            else pl.lit(None, dtype=pl.Utf8)
+        )
+        # A zero market price is no quote, as for Option
+        market_price = (
+            pl.col("market_price")
+            .cast(pl.Float64)
+            .replace(0.0, None)
+            .fill_null(float("nan"))
+            if "market_price" in df.columns
+            else pl.lit(float("nan"))
+        )
+        fields = df.select(
+            key.alias("key"),
+            (key.rank("dense") - 1).cast(pl.Int32).alias("underlying_id"),
+            pl.col("strike").cast(pl.Float64),
+            pl.col("expiry").cast(pl.Utf8).str.strptime(pl.Date, "%Y%m%d"),
+            pl.when(pl.col("option_type").str.to_uppercase() == "CALL")
+            .then(1)
+            .otherwise(-1)
+            .cast(pl.Int8)
+            .alias("cp_flag"),
+            style.replace_strict(
+                _STYLE_CODES, default=_EUROPEAN, return_dtype=pl.Int8
+            ).alias("style"),
+            market_price.alias("market_price"),
+        )
+        underlyings = [
+            tuple(k.split(_KEY_SEPARATOR, 1))
+            for k in fields["key"].unique().sort().to_list()
+        ]
+        return cls(
+            strike=fields["strike"].to_numpy(),
+            expiry=fields["expiry"].to_numpy(),
+            cp_flag=fields["cp_flag"].to_numpy(),
+            style=fields["style"].to_numpy(),
+            underlying_id=fields["underlying_id"].to_numpy(),
+            market_price=fields["market_price"].to_numpy(),
+            underlyings=underlyings,
+            day_count_convention=day_count_convention,
+        )
+
+    @classmethod
+    def from_instruments(cls, instruments: Sequence[Dict[str, Any]]) -> "OptionBook":
+        """Build a book from instrument dicts of the JSON/JSONL input."""
+        return cls.from_columns(
+            underlying_symbol=[i["underlying"]["symbol"] for i in instruments],
+            underlying_type=[i["underlying"]["type"] for i in instruments],
+            option_type=[i["option_type"] for i in instruments],
+            strike=[float(i["strike"]) for i in instruments],
+            expiry=[str(i["expiry"]) for i in instruments],
+            style=[i.get("style") for i in instruments],
+            market_price=[i.get("market_price") for i in instruments],
+        )
+
+    def _take(self, rows: Any, is_sorted: bool) -> "OptionBook":
+        """Sub-book of `rows`: a view for slices, a copy for index arrays."""
+        book = OptionBook(
+            strike=self.strike[rows],
+            expiry=self.expiry[rows],
+            cp_flag=self.cp_flag[rows],
+            style=self.style[rows],
+            underlying_id=self.underlying_id[rows],
+            market_price=self.market_price[rows],
+            underlyings=self.underlyings,
+            index=self.index[rows],
+            day_count_convention=self.day_count_convention,
+            is_sorted=is_sorted,
+        )
+        book._underlying_dicts = self._underlying_dicts
+        return book
+
+    def sorted(self) -> "OptionBook":
+        """Copy of the book ordered by underlying and expiry (stable)."""
+        order = np.lexsort((self.expiry, self.underlying_id))
+        return self._take(order, is_sorted=True)
+
+    def by_underlying(self, symbol: str) -> "OptionBook":
+        """Options on `symbol`; a zero-copy slice when the book is sorted."""
+        ids = [i for i, (s, _) in enumerate(self.underlyings) if s == symbol]
+        if not ids:
+            return self._take(slice(0, 0), is_sorted=self.is_sorted)
+        if not self.is_sorted or max(ids) - min(ids) + 1 != len(ids):
+            return self._take(np.isin(self.underlying_id, ids), self.is_sorted)
+        lo = np.searchsorted(self.underlying_id, min(ids), side="left")
+        hi = np.searchsorted(self.underlying_id, max(ids), side="right")
+        return self._take(slice(int(lo), int(hi)), is_sorted=True)
+
+    def by_expiry(self, expiry: Any) -> "OptionBook":
+        """
+        Options expiring on `expiry`. A zero-copy slice for sorted books on a
+        single underlying (e.g. the result of by_underlying()).
+        """
+        day = _to_datetime64([expiry])[0]
+        ids = self.underlying_id
+        if self.is_sorted and (ids.size == 0 or ids[0] == ids[-1]):
+            lo = np.searchsorted(self.expiry, day, side="left")
+            hi = np.searchsorted(self.expiry, day, side="right")
+            return self._take(slice(int(lo), int(hi)), is_sorted=True)
+        return self._take(self.expiry == day, is_sorted=self.is_sorted)
+
+    def chain(self, symbol: str, expiry: Any) -> "OptionBook":
+        """Options on `symbol` expiring on `expiry`."""
+        return self.by_underlying(symbol).by_expiry(expiry)
+
+    def groups(self) -> Iterator[Tuple[str, np.datetime64, "OptionBook"]]:
+        """Yield (symbol, expiry, chain) for every chain of a sorted book."""
+        book = self if self.is_sorted else self.sorted()
+        if not len(book):
+            return
+        keys = np.stack(
+            [book.underlying_id.astype(np.int64), book.expiry.astype(np.int64)]
+        )
+        starts = np.flatnonzero(np.any(np.diff(keys, axis=1) != 0, axis=0)) + 1
+        bounds = np.concatenate([[0], starts, [len(book)]])
+        for lo, hi in zip(bounds[:-1], bounds[1:], strict=True):
+            symbol = book.underlyings[book.underlying_id[lo]][0]
+            yield symbol, book.expiry[lo], book._take(slice(lo, hi), is_sorted=True)
+
+    def option(self, i: int, volatility: float = 0.0) -> Option:
+        """Lightweight Option view of row `i`."""
+        option = Option.__new__(Option)
+        option.strike_price = float(self.strike[i])
+        option.expiration_date = datetime.fromordinal(
+            _EPOCH_ORDINAL + int(self.expiry[i].astype(np.int64))
+        )
+        option.option_type = STYLES[self.style[i]]
+        option.call_put = (
+            Option.CallPut.CALL if self.cp_flag[i] > 0 else Option.CallPut.PUT
+        )
+        option.underlying = self._underlying_dicts[self.underlying_id[i]]
+        price = self.market_price[i]
+        option.market_price = None if np.isnan(price) else float(price)
+        option.volatility = volatility
+        option.exercise_dates = None
+        option.day_count_convention = shared_day_count(self.day_count_convention)
+        return option
+
+    def options(self, volatility: float = 0.0) -> List[Option]:
+        """Option views of every row."""
+        return [self.option(i, volatility) for i in range(len(self))]
+
+    def time_to_maturity(self, as_of_date: Any) -> NDArray[np.float64]:
+        """Year fractions from `as_of_date` to every expiry; 0 once expired."""
+        as_of = to_datetime64(as_of_date)
+        times = shared_day_count(self.day_count_convention).year_fractions(
+            as_of, self.expiry
+        )
+        return np.where(self.expiry < as_of, 0.0, times)
+
+    def is_european(self) -> NDArray[np.bool_]:
+        """Mask of the rows with European exercise."""
+        return self.style == _EUROPEAN
+
+    def is_expired(self, as_of_date: Any) -> NDArray[np.bool_]:
+        """Mask of the rows that expired before `as_of_date`, as Option.is_expired."""
+        return self.expiry < to_datetime64(as_of_date)
+
+    def to_frame(self, volatility: Any) -> "pl.DataFrame":
+        """
+        Option.to_dict() fields of every row as a polars frame with the
+        result sink's OPTION_SCHEMA, built column by column.
+
+        Args:
+            volatility: Volatility of every row, e.g. from market data.
+        """
+        import polars as pl
+        from python_quant.utils.result_sink import OPTION_SCHEMA
+
+        option_types = np.array([style.value for style in STYLES])
+        symbols = np.array([symbol for symbol, _ in self.underlyings], dtype=str)
+        kinds = np.array([kind for _, kind in self.underlyings], dtype=str)
+        return pl.DataFrame(
+            {
+                "strike_price": self.strike,
+                "expiration_date": pl.Series(self.expiry).dt.strftime("%Y-%m-%d"),
+                "option_type": option_types[self.style],
+                "call_put": np.where(self.cp_flag > 0, "call", "put"),
+                "underlying_ticker": symbols[self.underlying_id],
+                "underlying_type": kinds[self.underlying_id],
+                "market_price": pl.Series(self.market_price).fill_nan(None),
+                "volatility": np.broadcast_to(
+                    np.asarray(volatility, dtype=np.float64), (len(self),)
+                ),
+                "day_count_convention": np.full(len(self), self.day_count_convention),
+            },
+            schema=OPTION_SCHEMA,
+        )
+
+    def symbols(self) -> NDArray[np.object_]:
+        """Underlying symbol of every row."""
+        return np.array([symbol for symbol, _ in self.underlyings], dtype=object)[
+            self.underlying_id
+        ]
+
+    def spot(self, market_data: Mapping[str, Any]) -> NDArray[np.float64]:
+        """Spot price of every row, looked up once per underlying."""
+        spots = np.array(
+            [
+                market_data[symbol]["spot_price"]
+                if isinstance(market_data[symbol], Mapping)
+                else market_data[symbol]
+                for symbol, _ in self.underlyings
+            ],
+            dtype=np.float64,
+        )
+        return spots[self.underlying_id]
+
+    def volatility(self, market_data: Mapping[str, Any]) -> NDArray[np.float64]:
+        """Flat market data volatility of every row (0 where there is none)."""
+        vols = np.array(
+            [
+                float(market_data[symbol].get("volatility") or 0.0)
+                for symbol, _ in self.underlyings
+            ],
+            dtype=np.float64,
+        )
+        return vols[self.underlying_id]
+
+
+def _to_datetime64(values: Any) -> NDArray[np.datetime64]:
+    """YYYYMMDD strings/ints, ISO dates, datetimes or datetime64 to datetime64[D]."""
+    array = np.asarray(values)
+    if array.dtype.kind == "M" or (
+        array.dtype.kind == "O" and array.size and isinstance(array.flat[0], datetime)
+    ):
+        return array.astype("datetime64[D]")
+    text = array.astype(str)
+    if text.size and np.char.find(text, "-").max() >= 0:
+        return text.astype("datetime64[D]")
+
+    digits = text.astype(np.int64)
+    years = (digits // 10_000 - 1970).astype("datetime64[Y]")
+    months = (digits // 100 % 100 - 1).astype("timedelta64[M]")
+    days = (digits % 100 - 1).astype("timedelta64[D]")
+    return (years.astype("datetime64[M]") + months).astype("datetime64[D]") + days
@@ -1,10 +1,11 @@
 from argparse import ArgumentParser
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 from pathlib import Path
 from python_quant.utils.json import json_file_to_dict
-from python_quant.mode_handler.risk_mode import risk_mode_main
 from python_quant.utils.text import print_intro_message
+from python_quant.utils.profiling import Profiler, set_profiler
 import os
+import sys
 
 
 def risk_mode(
@@ -14,14 +15,116 @@ def risk_mode(
     json_path: Union[str, Path],
     write_csv: bool,
     csv_path: str,
+    portfolio: Optional[str] = None,
+    chunk_size: int = 10_000,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    dates: Optional[str] = None,
+    output_format: str = "CSV",
+    higher_order_greeks: Optional[str] = None,
+    result_cache: Optional[str] = None,
+    result_cache_max_mb: float = 256.0,
+    workers: int = 1,
 ) -> None:
-    risk_mode_main(
-        instrument=instrument,
+    # Mode handlers pull in numpy/scipy/polars, so load them only when used
+    from python_quant.mode_handler.risk_mode import (
+        risk_mode_history_main,
+        risk_mode_main,
+        risk_mode_portfolio_main,
+    )
+
+    higher_order = higher_order_greeks.split(",") if higher_order_greeks else []
+    cache = None
+    if result_cache:
+        from python_quant.utils.result_cache import ResultCache
+
+        cache = ResultCache(result_cache, max_bytes=int(result_cache_max_mb * 2**20))
+
+    try:
+        if dates or start_date or end_date:
+            risk_mode_history_main(
+                verbose=verbose,
+                json_path=json_path,
+                write_csv=write_csv,
+                csv_path=csv_path,
+                instrument=instrument,
+                portfolio_path=portfolio,
+                chunk_size=chunk_size,
+                start_date=start_date,
+                end_date=end_date,
+                dates=dates.split(",") if dates else None,
+                output_format=output_format,
+                higher_order=higher_order,
+                result_cache=cache,
+            )
+        elif portfolio:
+            risk_mode_portfolio_main(
+                portfolio_path=portfolio,
+                as_of_date=as_of_date,
+                verbose=verbose,
+                json_path=json_path,
+                write_csv=write_csv,
+                csv_path=csv_path,
+                chunk_size=chunk_size,
+                output_format=output_format,
+                higher_order=higher_order,
+                result_cache=cache,
+                workers=workers,
+            )
+        else:
+            risk_mode_main(
+                instrument=instrument,
+                as_of_date=as_of_date,
+                verbose=verbose,
+                json_path=json_path,
+                write_csv=write_csv,
+                csv_path=csv_path,
+                output_format=output_format,
+                higher_order=higher_order,
+                result_cache=cache,
+            )
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def invalidate_result_cache(
+    result_cache: str, symbols: str, as_of_date: Optional[str] = None
+) -> None:
+    from datetime import datetime
+    from python_quant.utils.result_cache import ResultCache
+
+    with ResultCache(result_cache) as cache:
+        dropped = cache.invalidate(
+            symbols=None if symbols.upper() == "ALL" else symbols.split(","),
+            as_of_date=datetime.strptime(as_of_date, "%Y%m%d") if as_of_date else None,
+        )
+    print(f"\tDropped {dropped} cached results from: {result_cache}")
+
+
+def scenario_mode(
+    instrument: Dict[str, Any],
+    scenario: Dict[str, Any],
+    as_of_date: str,
+    verbose: str,
+    json_path: Union[str, Path],
+    write_csv: bool,
+    csv_path: str,
+    portfolio: Optional[str] = None,
+    chunk_size: int = 10_000,
+) -> None:
+    from python_quant.mode_handler.scenario_mode import scenario_mode_main
+
+    scenario_mode_main(
+        scenario=scenario,
         as_of_date=as_of_date,
         verbose=verbose,
         json_path=json_path,
         write_csv=write_csv,
         csv_path=csv_path,
+        instrument=instrument,
+        portfolio_path=portfolio,
+        chunk_size=chunk_size,
     )
 
 
@@ -29,36 +132,151 @@ def price_mode(
     instrument: Dict[str, Any],
     as_of_date: str,
     verbose: str,
+    json_path: Union[str, Path],
+    write_csv: bool,
+    csv_path: str,
+    portfolio: Optional[str] = None,
+    chunk_size: int = 10_000,
+    output_format: str = "CSV",
+) -> None:
+    from python_quant.mode_handler.price_mode import price_mode_main
+
+    price_mode_main(
+        as_of_date=as_of_date,
+        verbose=verbose,
+        json_path=json_path,
+        write_csv=write_csv,
+        csv_path=csv_path,
+        instrument=instrument,
+        portfolio_path=portfolio,
+        chunk_size=chunk_size,
+        output_format=output_format,
+    )
+
+
+def stream_mode(
+    instrument: Dict[str, Any],
+    stream: str,
+    as_of_date: str,
+    verbose: str,
+    json_path: Union[str, Path],
     write_csv: bool,
     csv_path: str,
+    portfolio: Optional[str] = None,
+    chunk_size: int = 10_000,
+    idle_timeout: Optional[float] = None,
+    output_format: str = "CSV",
+    higher_order_greeks: Optional[str] = None,
 ) -> None:
-    pass
+    from python_quant.mode_handler.stream_mode import stream_mode_main
+
+    if not stream:
+        raise ValueError("STREAM mode requires a --stream source.")
+    stream_mode_main(
+        as_of_date=as_of_date,
+        verbose=verbose,
+        json_path=json_path,
+        write_csv=write_csv,
+        csv_path=csv_path,
+        stream=stream,
+        instrument=instrument,
+        portfolio_path=portfolio,
+        chunk_size=chunk_size,
+        idle_timeout=idle_timeout,
+        output_format=output_format,
+        higher_order=higher_order_greeks.split(",") if higher_order_greeks else [],
+    )
 
 
 def calibrate_mode(
     calibrate: Dict[str, Any],
     as_of_date: str,
     verbose: str,
+    json_path: Union[str, Path],
     write_csv: bool,
     csv_path: str,
+    portfolio: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    dates: Optional[str] = None,
 ) -> None:
-    pass
+    from python_quant.mode_handler.calibrate_mode import calibrate_mode_main
+
+    calibrate_mode_main(
+        calibrate=calibrate,
+        as_of_date=as_of_date,
+        verbose=verbose,
+        json_path=json_path,
+        write_csv=write_csv,
+        csv_path=csv_path,
+        portfolio_path=portfolio,
+        start_date=start_date,
+        end_date=end_date,
+        dates=dates.split(",") if dates else None,
+    )
 
 
 def main():
     dir_path = os.getcwd()
     parser = ArgumentParser(description="PyQuant Main Execution Script")
 
-    parser.add_argument("--mode", help="Mode [PRICE, RISK, CALIBRATE]")
+    parser.add_argument(
+        "--mode", help="Mode [PRICE, RISK, SCENARIO, CALIBRATE, STREAM]"
+    )
     parser.add_argument(
         "--instrument",
-        help="Instrument for PRICE/RISK mode to be passed as a JSON file",
+        help="Instrument for PRICE/RISK/STREAM mode to be passed as a JSON file",
+    )
+    parser.add_argument(
+        "--portfolio",
+        help="Portfolio file (JSONL, CSV or Parquet) for PRICE/RISK/SCENARIO/STREAM "
+        "mode, or the quoted option chain for CALIBRATE mode",
+    )
+    parser.add_argument(
+        "--chunk_size",
+        help="Number of portfolio positions priced per batch",
+        type=int,
+        default=10_000,
+    )
+    parser.add_argument(
+        "--workers",
+        help="Worker processes pricing the chunks of a portfolio RISK run "
+        "(0 for one per CPU)",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--scenario",
+        help="Spot/vol ladder spec for SCENARIO mode to be passed as a JSON file",
     )
     parser.add_argument(
         "--calibrate",
-        help="Simulation parameters for calibrate mode",
+        help="SVI calibration settings for CALIBRATE mode to be passed as a JSON file",
+    )
+    parser.add_argument(
+        "--stream",
+        help="Market updates for STREAM mode: a JSON lines file to follow, or "
+        "unix:<path> to listen on a Unix socket",
+    )
+    parser.add_argument(
+        "--stream_idle_timeout",
+        help="End STREAM mode after this many seconds without a market update",
+        type=float,
     )
     parser.add_argument("--as_of_date", help="As of date for pricing/risk calculations")
+    parser.add_argument(
+        "--start_date",
+        help="First as of date (YYYYMMDD) of a historical RISK or CALIBRATE run",
+    )
+    parser.add_argument(
+        "--end_date",
+        help="Last as of date (YYYYMMDD) of a historical RISK or CALIBRATE run",
+    )
+    parser.add_argument(
+        "--dates",
+        help="Comma separated as of dates (YYYYMMDD) of a historical RISK or "
+        "CALIBRATE run",
+    )
     parser.add_argument(
         "--verbose", help="Logging (I for INFO, D for DEBUG) enabled if set to True"
     )
@@ -74,31 +292,97 @@ def main():
     )
     parser.add_argument(
         "--csv_path",
-        help="Path for input market data JSON files",
+        help="Path of the output file (directory of part files for PARQUET/IPC)",
         default=os.path.join(dir_path, "output.csv"),
     )
+    parser.add_argument(
+        "--output_format",
+        help="Format of PRICE/RISK/STREAM output written with --write_csv "
+        "[CSV, PARQUET, IPC]",
+        default="CSV",
+        choices=["CSV", "PARQUET", "IPC"],
+        type=str.upper,
+    )
+    parser.add_argument(
+        "--higher_order_greeks",
+        help="Comma separated extra RISK/STREAM greeks "
+        "[vanna, volga, charm, speed, color, dividend_rho]",
+    )
+    parser.add_argument(
+        "--result_cache",
+        help="SQLite file caching RISK results; positions whose instrument and "
+        "market data are unchanged are not repriced on a rerun",
+    )
+    parser.add_argument(
+        "--result_cache_max_mb",
+        help="Size budget of --result_cache in MB, least recently used results "
+        "are evicted beyond it",
+        type=float,
+        default=256.0,
+    )
+    parser.add_argument(
+        "--invalidate_cache",
+        help="Drop results from --result_cache: ALL, or comma separated "
+        "underlyings (only as of --as_of_date if given)",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Print per-stage timings and counters at the end of the run",
+        default=False,
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile_memory",
+        help="Also trace allocations per stage (slower) when profiling",
+        default=False,
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile_json",
+        help="Write the profile as JSON to this path (implies --profile)",
+    )
 
     args = parser.parse_args()
 
+    profiler = None
+    if args.profile or args.profile_json:
+        profiler = Profiler(trace_memory=args.profile_memory)
+        set_profiler(profiler)
+
+    if args.invalidate_cache:
+        if not args.result_cache:
+            parser.error("--invalidate_cache requires --result_cache")
+        invalidate_result_cache(
+            args.result_cache, args.invalidate_cache, args.as_of_date
+        )
+        if not args.mode:
+            return
+
     instrument_data = json_file_to_dict(args.instrument) if args.instrument else {}
 
-    print_intro_message()
+    # PRICE and STREAM output is meant to be piped, so they skip the banner
+    if args.mode not in ("PRICE", "STREAM"):
+        print_intro_message()
 
-    logging_levels = {"I": "INFO", "D": "DEBUG"}
-    logging_level = logging_levels.get(args.verbose, "DISABLED")
-    print(f"\tLogging Level: {logging_level}")
+        logging_levels = {"I": "INFO", "D": "DEBUG"}
+        logging_level = logging_levels.get(args.verbose, "DISABLED")
+        print(f"\tLogging Level: {logging_level}")
 
-    print(f"\tWrite CSV: {args.write_csv}")
-    if args.write_csv:
-        print(f"\tCSV Path: {args.csv_path}")
+        print(f"\tWrite CSV: {args.write_csv}")
+        if args.write_csv:
+            print(f"\tCSV Path: {args.csv_path}")
 
     if args.mode == "PRICE":
         price_mode(
             instrument=instrument_data,
             as_of_date=args.as_of_date,
             verbose=args.verbose,
+            json_path=args.input_data_path,
             write_csv=args.write_csv,
             csv_path=args.csv_path,
+            portfolio=args.portfolio,
+            chunk_size=args.chunk_size,
+            output_format=args.output_format,
         )
     elif args.mode == "RISK":
         risk_mode(
@@ -108,17 +392,74 @@ def main():
             json_path=args.input_data_path,
             write_csv=args.write_csv,
             csv_path=args.csv_path,
+            portfolio=args.portfolio,
+            chunk_size=args.chunk_size,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            dates=args.dates,
+            output_format=args.output_format,
+            higher_order_greeks=args.higher_order_greeks,
+            result_cache=args.result_cache,
+            result_cache_max_mb=args.result_cache_max_mb,
+            workers=args.workers,
+        )
+    elif args.mode == "SCENARIO":
+        scenario_mode(
+            instrument=instrument_data,
+            scenario=json_file_to_dict(args.scenario) if args.scenario else {},
+            as_of_date=args.as_of_date,
+            verbose=args.verbose,
+            json_path=args.input_data_path,
+            write_csv=args.write_csv,
+            csv_path=args.csv_path,
+            portfolio=args.portfolio,
+            chunk_size=args.chunk_size,
+        )
+    elif args.mode == "STREAM":
+        stream_mode(
+            instrument=instrument_data,
+            stream=args.stream,
+            as_of_date=args.as_of_date,
+            verbose=args.verbose,
+            json_path=args.input_data_path,
+            write_csv=args.write_csv,
+            csv_path=args.csv_path,
+            portfolio=args.portfolio,
+            chunk_size=args.chunk_size,
+            idle_timeout=args.stream_idle_timeout,
+            output_format=args.output_format,
+            higher_order_greeks=args.higher_order_greeks,
         )
     elif args.mode == "CALIBRATE":
         calibrate_mode(
-            calibrate=args.calibrate,
-            verbose=args.verbose,
+            calibrate=json_file_to_dict(args.calibrate) if args.calibrate else {},
             as_of_date=args.as_of_date,
+            verbose=args.verbose,
+            json_path=args.input_data_path,
             write_csv=args.write_csv,
             csv_path=args.csv_path,
+            portfolio=args.portfolio,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            dates=args.dates,
         )
     else:
-        print("Invalid mode selected. Please choose PRICE, RISK, or CALIBRATE.")
+        print(
+            "Invalid mode selected. Please choose PRICE, RISK, SCENARIO, CALIBRATE "
+            "or STREAM."
+        )
+
+    if profiler is not None:
+        # On stderr: results may be streamed to stdout, e.g. PRICE mode CSV
+        profiler.finish()
+        print("\t================================", file=sys.stderr)
+        print("\tPROFILE", file=sys.stderr)
+        print("\t================================", file=sys.stderr)
+        print(profiler.summary_table(), file=sys.stderr)
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
+            print(f"\tProfile written to: {args.profile_json}", file=sys.stderr)
+        set_profiler(None)
 
 
 if __name__ == "__main__":
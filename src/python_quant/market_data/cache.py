@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple, Union
+from python_quant.utils.json import json_file_to_dict
+
+
+def freeze(obj: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(obj, Mapping):
+        return MappingProxyType({key: freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(value) for value in obj)
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """Inverse of freeze(): plain, JSON-serializable dicts and lists."""
+    if isinstance(obj, Mapping):
+        return {key: thaw(value) for key, value in obj.items()}
+    if isinstance(obj, tuple):
+        return [thaw(value) for value in obj]
+    return obj
+
+
+class MarketDataCache:
+    """
+    LRU cache of parsed market data snapshots keyed by (file path, date).
+
+    Before an entry is reused the file's mtime and size are compared with
+    the values recorded when it was parsed, so an edited snapshot is reloaded
+    transparently. Snapshots are returned as read-only views so that callers
+    cannot corrupt the cached copy.
+    """
+
+    def __init__(self, max_entries: int = 16) -> None:
+        if max_entries < 1:
+            raise ValueError("Market data cache size must be at least 1.")
+        self.max_entries = max_entries
+        self._entries: OrderedDict[
+            Tuple[str, str], Tuple[int, int, Mapping[str, Any]]
+        ] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(
+        self, analysis_date: datetime, logger: Logger, json_path: Union[Path, str]
+    ) -> Mapping[str, Any]:
+        """
+        Return the market data snapshot for `analysis_date`, parsing
+        `<json_path>/<YYYYMMDD>.json` only if it is not cached or has changed
+        on disk since it was cached.
+        """
+        date_str = analysis_date.strftime("%Y%m%d")
+        file_path = (Path(json_path) / f"{date_str}.json").resolve()
+        key = (str(file_path), date_str)
+        stat = file_path.stat()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            self.hits += 1
+            self._entries.move_to_end(key)
+            logger.debug("Market data cache hit for %s", file_path)
+            return entry[2]
+
+        self.misses += 1
+        logger.info(f"Loading market data from {file_path}")
+        market_data = freeze(json_file_to_dict(file_path))
+        self._entries[key] = (stat.st_mtime_ns, stat.st_size, market_data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return market_data
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+DEFAULT_MARKET_DATA_CACHE = MarketDataCache()
+
+
+def cached_json_market_data_loader(
+    analysis_date: datetime,
+    logger: Logger,
+    json_path: Union[Path, str],
+    cache: Optional[MarketDataCache] = None,
+) -> Mapping[str, Any]:
+    """
+    Cached, read-only counterpart of json_market_data_loader().
+
+    Args:
+        analysis_date (datetime): The date for which market data is to be loaded.
+        cache (MarketDataCache): Cache to use, the process-wide default if None.
+    Returns:
+        Mapping: Read-only view of the market data.
+    """
+    cache = cache or DEFAULT_MARKET_DATA_CACHE
+    return cache.load(analysis_date=analysis_date, logger=logger, json_path=json_path)
@@ -0,0 +1,237 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+CURVE_CACHE_SIZE = 64
+# Distinct scalar maturities remembered by each curve
+MATURITY_MEMO_SIZE = 4096
+INTERPOLATIONS = ("LOG_LINEAR", "MONOTONE_CUBIC")
+# Market data entries holding the rate curves, as (yield, dividend)
+RATE_KEYS = ("risk_free_rate", "dividend_yield")
+
+
+def _pchip_slopes(
+    x: NDArray[np.float64], y: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """
+    Fritsch-Carlson node slopes of the monotone cubic through (x, y), with
+    the same shape-preserving end conditions as scipy's PchipInterpolator.
+    """
+    h = np.diff(x)
+    m = np.diff(y) / h
+    if m.size == 1:
+        return np.array([m[0], m[0]])
+
+    slopes = np.zeros_like(y)
+    w1 = 2.0 * h[1:] + h[:-1]
+    w2 = h[1:] + 2.0 * h[:-1]
+    same_sign = m[:-1] * m[1:] > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        harmonic = (w1 + w2) / (w1 / m[:-1] + w2 / m[1:])
+    slopes[1:-1] = np.where(same_sign, harmonic, 0.0)
+
+    def edge(h0: float, h1: float, m0: float, m1: float) -> float:
+        d = ((2.0 * h0 + h1) * m0 - h0 * m1) / (h0 + h1)
+        if np.sign(d) != np.sign(m0):
+            return 0.0
+        if np.sign(m0) != np.sign(m1) and abs(d) > abs(3.0 * m0):
+            return 3.0 * m0
+        return d
+
+    slopes[0] = edge(h[0], h[1], m[0], m[1])
+    slopes[-1] = edge(h[-1], h[-2], m[-1], m[-2])
+    return slopes
+
+
+class Curve:
+    """
+    Term structure of continuously compounded zero rates, e.g. a yield or a
+    dividend yield curve, built from pillar tenors and rates.
+
+    The curve interpolates y(t) = r(t) * t = -log(DF(t)) through the pillars
+    and y(0) = 0. "LOG_LINEAR" is linear in y, i.e. log-linear in discount
+    factors with flat forwards between pillars; "MONOTONE_CUBIC" is a
+    Fritsch-Carlson monotone cubic in y, whose forwards are continuous. The
+    piecewise polynomial coefficients are computed once at construction, so
+    lookups only evaluate them. Past the last pillar the forward rate is
+    extrapolated flat.
+
+    Lookups accept arrays of maturities and evaluate each distinct maturity
+    once; scalar lookups, the single-option pricing path, are memoized.
+
+    Args:
+        tenors: Increasing, positive pillar tenors, in years.
+        rates: Zero rate of each pillar.
+        interpolation: "LOG_LINEAR" or "MONOTONE_CUBIC".
+    """
+
+    def __init__(
+        self,
+        tenors: Sequence[float],
+        rates: Sequence[float],
+        interpolation: str = "LOG_LINEAR",
+    ) -> None:
+        self.tenors = np.asarray(tenors, dtype=np.float64)
+        self.rates = np.asarray(rates, dtype=np.float64)
+        self.interpolation = interpolation.upper()
+
+        if self.interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unsupported curve interpolation: {interpolation}")
+        if self.tenors.ndim != 1 or self.tenors.size == 0:
+            raise ValueError("Curve needs at least one pillar.")
+        if self.rates.shape != self.tenors.shape:
+            raise ValueError("Curve needs one rate per tenor.")
+        if self.tenors[0] <= 0 or np.any(np.diff(self.tenors) <= 0):
+            raise ValueError("Curve tenors must be positive and increasing.")
+
+        x = np.concatenate(([0.0], self.tenors))
+        y = np.concatenate(([0.0], self.rates * self.tenors))
+        h = np.diff(x)
+        if self.interpolation == "LOG_LINEAR":
+            slopes = np.diff(y) / h
+            # Segment k has coefficients (y_k, f_k, 0, 0)
+            c1 = np.append(slopes, slopes[-1])
+            c2 = np.zeros_like(c1)
+            c3 = np.zeros_like(c1)
+        else:
+            d = _pchip_slopes(x, y)
+            m = np.diff(y) / h
+            c1 = d.copy()
+            c2 = np.append((3.0 * m - 2.0 * d[:-1] - d[1:]) / h, 0.0)
+            c3 = np.append((d[:-1] + d[1:] - 2.0 * m) / h**2, 0.0)
+        # One polynomial per segment, plus the flat-forward extrapolation
+        self._knots = x
+        self._coefficients = np.stack([y, c1, c2, c3])
+        self._memo: Dict[float, Tuple[float, float]] = {}
+
+    @classmethod
+    def from_dict(cls, spec: Mapping[str, Any]) -> "Curve":
+        """
+        Build a curve from its market data JSON form:
+         {
+            "tenors": [0.25, 0.5, 1.0, 2.0, 5.0],
+            "rates": [0.043, 0.042, 0.040, 0.038, 0.039],
+            "interpolation": "LOG_LINEAR"   # or "MONOTONE_CUBIC"
+         }
+        """
+        return cls(
+            tenors=spec["tenors"],
+            rates=spec["rates"],
+            interpolation=str(spec.get("interpolation", "LOG_LINEAR")),
+        )
+
+    @classmethod
+    def flat(cls, rate: float) -> "Curve":
+        """A curve with the same zero rate at every maturity."""
+        return cls([1.0], [rate])
+
+    def _evaluate(
+        self, t: NDArray[np.float64]
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """y(t) = -log(DF(t)) and its derivative, the instantaneous forward."""
+        t = np.maximum(t, 0.0)
+        segment = np.searchsorted(self._knots, t, side="right") - 1
+        s = t - self._knots[segment]
+        c0, c1, c2, c3 = self._coefficients[:, segment]
+        y = c0 + s * (c1 + s * (c2 + s * c3))
+        forward = c1 + s * (2.0 * c2 + 3.0 * s * c3)
+        return y, forward
+
+    def _lookup(
+        self, time_to_maturity: ArrayLike
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+        T = np.asarray(time_to_maturity, dtype=np.float64)
+        if T.ndim == 0:
+            key = float(T)
+            cached = self._memo.get(key)
+            if cached is None:
+                y, forward = self._evaluate(T.reshape(1))
+                cached = (float(y[0]), float(forward[0]))
+                if len(self._memo) >= MATURITY_MEMO_SIZE:
+                    self._memo.clear()
+                self._memo[key] = cached
+            return T, np.float64(cached[0]), np.float64(cached[1])
+
+        # Options in a book share few expiries: price each distinct one once
+        unique, inverse = np.unique(T, return_inverse=True)
+        y, forward = self._evaluate(unique)
+        return T, y[inverse].reshape(T.shape), forward[inverse].reshape(T.shape)
+
+    def discount(self, time_to_maturity: ArrayLike) -> NDArray[np.float64]:
+        """Discount factors exp(-r(t) * t) in the shape of `time_to_maturity`."""
+        _, y, _ = self._lookup(time_to_maturity)
+        return np.exp(-y)
+
+    def zero_rate(self, time_to_maturity: ArrayLike) -> NDArray[np.float64]:
+        """
+        Continuously compounded zero rates r(t); the short rate at t <= 0.
+        """
+        T, y, forward = self._lookup(time_to_maturity)
+        return np.where(T > 0, y / np.where(T > 0, T, 1.0), forward)
+
+    def forward_rate(self, time_to_maturity: ArrayLike) -> NDArray[np.float64]:
+        """Instantaneous forward rates f(t) = -d log(DF(t)) / dt."""
+        _, _, forward = self._lookup(time_to_maturity)
+        return forward
+
+
+_CURVE_CACHE: OrderedDict[int, Tuple[Any, Curve]] = OrderedDict()
+
+
+def curve_from_market_data(value: Any) -> Optional[Curve]:
+    """
+    Return the Curve of a "risk_free_rate" or "dividend_yield" market data
+    entry given as pillars, or None if it is a single flat rate.
+
+    Curves are memoized on the identity of their spec, as vol surfaces are,
+    so the interpolation is set up once per loaded snapshot and shared by
+    every option priced from it.
+    """
+    if not isinstance(value, Mapping):
+        return None
+    key = id(value)
+    cached = _CURVE_CACHE.get(key)
+    if cached is not None and cached[0] is value:
+        _CURVE_CACHE.move_to_end(key)
+        return cached[1]
+
+    curve = Curve.from_dict(value)
+    _CURVE_CACHE[key] = (value, curve)
+    while len(_CURVE_CACHE) > CURVE_CACHE_SIZE:
+        _CURVE_CACHE.popitem(last=False)
+    return curve
+
+
+def rate_to_maturity(
+    value: Any, time_to_maturity: ArrayLike
+) -> Union[float, NDArray[np.float64]]:
+    """
+    Zero rate of a market data rate entry, a flat rate or a curve spec, to
+    each maturity: a float for a scalar maturity, else an array of its shape.
+    """
+    curve = curve_from_market_data(value)
+    scalar = np.ndim(time_to_maturity) == 0
+    if curve is None:
+        rate = float(value)
+        return rate if scalar else np.full(np.shape(time_to_maturity), rate)
+    rates = curve.zero_rate(time_to_maturity)
+    return float(rates) if scalar else rates
+
+
+def rates_to_maturity(
+    market_data: Mapping[str, Any], time_to_maturity: ArrayLike
+) -> Tuple[Any, Any]:
+    """
+    (risk-free rate, dividend yield) zero rates to `time_to_maturity`, from
+    flat rates or curves in the market data.
+
+    With zero rates to expiry, European prices discount exactly as on the
+    curves; lattice and PDE pricers run at those (constant) rates.
+    """
+    yield_value, dividend_value = (market_data[key] for key in RATE_KEYS)
+    return (
+        rate_to_maturity(yield_value, time_to_maturity),
+        rate_to_maturity(dividend_value, time_to_maturity),
+    )
@@ -22,5 +22,5 @@ def json_market_data_loader(
 
     market_data = json_file_to_dict(file_path)
     logger.info("Market data successfully loaded.")
-    logger.info(f"Market Data: {market_data}")
+    logger.debug("Market Data: %s", market_data)
     return market_data
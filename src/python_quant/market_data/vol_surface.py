@@ -0,0 +1,248 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Optional, Sequence, Tuple, Union
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+SURFACE_CACHE_SIZE = 64
+# Raw SVI parameters, in the order of SVISurface.params columns
+SVI_PARAMETERS = ("a", "b", "rho", "m", "sigma")
+
+
+class VolSurface:
+    """
+    Implied volatility surface on a tenor x strike (or moneyness) grid.
+
+    Each tenor's smile is interpolated with a monotone cubic (PCHIP) in the
+    strike/moneyness direction, and total variance is interpolated linearly
+    between tenors. The spline coefficients for every smile are computed once
+    at construction, so lookups only evaluate polynomials. Outside the grid
+    volatilities are extrapolated flat.
+
+    Args:
+        tenors: Increasing tenors of the smiles, in years.
+        axis_values: Increasing strikes (or K/S moneyness) of the grid.
+        vols: Volatilities, one row per tenor and one column per axis value.
+        axis: "STRIKE" or "MONEYNESS".
+    """
+
+    def __init__(
+        self,
+        tenors: Sequence[float],
+        axis_values: Sequence[float],
+        vols: Sequence[Sequence[float]],
+        axis: str = "STRIKE",
+    ) -> None:
+        self.tenors = np.asarray(tenors, dtype=np.float64)
+        self.axis_values = np.asarray(axis_values, dtype=np.float64)
+        self.vols = np.asarray(vols, dtype=np.float64)
+        self.axis = axis.upper()
+
+        if self.axis not in ("STRIKE", "MONEYNESS"):
+            raise ValueError(f"Unsupported vol surface axis: {axis}")
+        if self.vols.shape != (self.tenors.size, self.axis_values.size):
+            raise ValueError("Vol surface grid must be n_tenors x n_strikes.")
+        if np.any(np.diff(self.tenors) <= 0) or np.any(np.diff(self.axis_values) <= 0):
+            raise ValueError("Vol surface tenors and strikes must be increasing.")
+        if self.axis_values.size < 2:
+            raise ValueError("Vol surface needs at least two strikes per tenor.")
+
+        from scipy.interpolate import PchipInterpolator
+
+        self._smiles = PchipInterpolator(self.axis_values, self.vols, axis=1)
+
+    @classmethod
+    def from_dict(cls, spec: Mapping[str, Any]) -> "VolSurface":
+        """
+        Build a surface from its market data JSON form:
+         {
+            "axis": "STRIKE",            # or "MONEYNESS"
+            "tenors": [0.25, 0.5, 1.0],
+            "strikes": [240, 270, 300],  # "moneyness" for the MONEYNESS axis
+            "vols": [[...], [...], [...]]
+         }
+        """
+        axis = str(spec.get("axis", "STRIKE")).upper()
+        axis_key = "moneyness" if axis == "MONEYNESS" else "strikes"
+        return cls(
+            tenors=spec["tenors"],
+            axis_values=spec[axis_key],
+            vols=spec["vols"],
+            axis=axis,
+        )
+
+    def volatility(
+        self, strike: ArrayLike, time_to_maturity: ArrayLike, spot: float = 1.0
+    ) -> NDArray[np.float64]:
+        """
+        Look up volatilities for arrays of (strike, time to maturity) pairs.
+
+        Args:
+            strike: Strike prices.
+            time_to_maturity: Year fractions to expiry.
+            spot: Spot price, used to turn strikes into moneyness.
+
+        Returns:
+            NDArray[np.float64]: Volatilities in the broadcast shape of inputs.
+        """
+        K, T = np.broadcast_arrays(
+            np.asarray(strike, dtype=np.float64),
+            np.asarray(time_to_maturity, dtype=np.float64),
+        )
+        shape = K.shape
+        x = K.ravel() / spot if self.axis == "MONEYNESS" else K.ravel()
+        T = T.ravel()
+
+        x = np.clip(x, self.axis_values[0], self.axis_values[-1])
+        smiles = self._smiles(x)  # (n_tenors, n_points)
+        total_variance = smiles**2 * self.tenors[:, None]
+        return _interpolate_in_tenor(self.tenors, total_variance, T).reshape(shape)
+
+
+def svi_total_variance(
+    k: ArrayLike, a: Any, b: Any, rho: Any, m: Any, sigma: Any
+) -> NDArray[np.float64]:
+    """
+    Raw SVI total implied variance at log-moneyness k = log(K / F):
+    w(k) = a + b * (rho * (k - m) + sqrt((k - m)^2 + sigma^2)).
+    """
+    x = np.asarray(k, dtype=np.float64) - m
+    return a + b * (rho * x + np.sqrt(x * x + sigma * sigma))
+
+
+class SVISurface:
+    """
+    Implied volatility surface made of raw SVI slices, one per expiry.
+
+    Each slice gives the total variance at log-moneyness log(K / F) against
+    its own forward F, so lookups are sticky-strike. Between slices the total
+    variance at the strike is interpolated linearly in time and outside the
+    slice tenors volatilities are extrapolated flat, as for VolSurface.
+
+    Args:
+        tenors: Increasing tenors of the slices, in years.
+        forwards: Forward price of each slice.
+        params: SVI (a, b, rho, m, sigma) of each slice, one row per tenor.
+    """
+
+    def __init__(
+        self,
+        tenors: Sequence[float],
+        forwards: Sequence[float],
+        params: Sequence[Sequence[float]],
+    ) -> None:
+        self.tenors = np.asarray(tenors, dtype=np.float64)
+        self.forwards = np.asarray(forwards, dtype=np.float64)
+        self.params = np.asarray(params, dtype=np.float64)
+
+        if self.params.shape != (self.tenors.size, 5):
+            raise ValueError("SVI surface needs (a, b, rho, m, sigma) per tenor.")
+        if self.forwards.shape != self.tenors.shape:
+            raise ValueError("SVI surface needs one forward per tenor.")
+        if self.tenors.size == 0 or np.any(np.diff(self.tenors) <= 0):
+            raise ValueError("SVI surface tenors must be increasing.")
+
+    @classmethod
+    def from_dict(cls, spec: Mapping[str, Any]) -> "SVISurface":
+        """
+        Build a surface from its market data JSON form, as written by
+        CALIBRATE mode:
+         {
+            "type": "SVI",
+            "slices": [
+                {"expiry": "20261220", "tenor": 1.19, "forward": 281.4,
+                 "a": 0.01, "b": 0.1, "rho": -0.4, "m": 0.02, "sigma": 0.2},
+                ...
+            ]
+         }
+        """
+        slices = sorted(spec["slices"], key=lambda s: s["tenor"])
+        return cls(
+            tenors=[s["tenor"] for s in slices],
+            forwards=[s["forward"] for s in slices],
+            params=[[s[key] for key in SVI_PARAMETERS] for s in slices],
+        )
+
+    def total_variance(self, strike: ArrayLike) -> NDArray[np.float64]:
+        """Total variance of every slice at `strike`, shape (n_tenors, ...)."""
+        K = np.asarray(strike, dtype=np.float64)
+        extra_dims = (1,) * K.ndim
+        k = np.log(K[None, ...] / self.forwards.reshape(-1, *extra_dims))
+        a, b, rho, m, sigma = (p.reshape(-1, *extra_dims) for p in self.params.T)
+        return svi_total_variance(k, a, b, rho, m, sigma)
+
+    def volatility(
+        self, strike: ArrayLike, time_to_maturity: ArrayLike, spot: float = 1.0
+    ) -> NDArray[np.float64]:
+        """
+        Look up volatilities for arrays of (strike, time to maturity) pairs.
+        `spot` is accepted for interface parity with VolSurface; the slices
+        carry their own forwards.
+        """
+        K, T = np.broadcast_arrays(
+            np.asarray(strike, dtype=np.float64),
+            np.asarray(time_to_maturity, dtype=np.float64),
+        )
+        total_variance = np.maximum(self.total_variance(K.ravel()), 0.0)
+        return _interpolate_in_tenor(self.tenors, total_variance, T.ravel()).reshape(
+            K.shape
+        )
+
+
+def _interpolate_in_tenor(
+    tenors: NDArray[np.float64],
+    total_variance: NDArray[np.float64],
+    time_to_maturity: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    Volatilities at `time_to_maturity` from per-tenor total variances of
+    shape (n_tenors, n_points): linear in time between tenors, flat vol
+    outside them.
+    """
+    if tenors.size == 1:
+        return np.sqrt(total_variance[0] / tenors[0])
+
+    points = np.arange(time_to_maturity.size)
+    hi = np.clip(np.searchsorted(tenors, time_to_maturity), 1, tenors.size - 1)
+    lo = hi - 1
+    t_lo, t_hi = tenors[lo], tenors[hi]
+    w_lo = total_variance[lo, points]
+    w_hi = total_variance[hi, points]
+    t = np.clip(time_to_maturity, tenors[0], tenors[-1])
+    weight = (t - t_lo) / (t_hi - t_lo)
+    return np.sqrt((w_lo + weight * (w_hi - w_lo)) / t)
+
+
+_SURFACE_CACHE: OrderedDict[int, Tuple[Any, Any]] = OrderedDict()
+
+
+def vol_surface_from_market_data(
+    ticker_data: Any,
+) -> Optional[Union[VolSurface, SVISurface]]:
+    """
+    Return the surface of an underlying's market data entry: a VolSurface
+    for grid specs, an SVISurface for "type": "SVI" specs, or None if it
+    only has a flat volatility.
+
+    Surfaces are memoized on the identity of their spec, so the build cost is
+    paid once per loaded snapshot (see MarketDataCache) and shared by every
+    option on that underlying. Cache entries keep their spec alive, so an id
+    cannot be reused while it is cached.
+    """
+    if not isinstance(ticker_data, Mapping) or "vol_surface" not in ticker_data:
+        return None
+    spec = ticker_data["vol_surface"]
+    key = id(spec)
+    cached = _SURFACE_CACHE.get(key)
+    if cached is not None and cached[0] is spec:
+        _SURFACE_CACHE.move_to_end(key)
+        return cached[1]
+
+    if str(spec.get("type", "GRID")).upper() == "SVI":
+        surface: Union[VolSurface, SVISurface] = SVISurface.from_dict(spec)
+    else:
+        surface = VolSurface.from_dict(spec)
+    _SURFACE_CACHE[key] = (spec, surface)
+    while len(_SURFACE_CACHE) > SURFACE_CACHE_SIZE:
+        _SURFACE_CACHE.popitem(last=False)
+    return surface
@@ -0,0 +1,289 @@
+from contextlib import ExitStack
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+import json
+import os
+import sys
+import numpy as np
+import polars as pl
+from python_quant.calibration.svi import (
+    SVIParameters,
+    SVISlice,
+    SVISliceQuotes,
+    fit_svi_slices,
+    process_pool,
+    svi_parameters_from_market_data,
+)
+from python_quant.instrument.option import Option
+from python_quant.market_data.cache import cached_json_market_data_loader, thaw
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    option_arrays,
+    option_from_instrument,
+)
+from python_quant.mode_handler.risk_mode import history_dates, mode_logger
+from python_quant.pricers.implied_vol import implied_volatility
+from python_quant.utils.json import json_file_to_dict
+from python_quant.utils.portfolio import iter_portfolio_chunks
+from python_quant.utils.profiling import get_profiler
+
+# Fewer quotes than SVI parameters leave a slice underdetermined
+MIN_QUOTES_PER_SLICE = 5
+
+
+def svi_slice_quotes(
+    instruments: List[Dict[str, Any]],
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+    logger: Logger,
+    previous: Optional[Dict[tuple, SVIParameters]] = None,
+    min_quotes: int = MIN_QUOTES_PER_SLICE,
+) -> List[SVISliceQuotes]:
+    """
+    Turn the quoted options of a chain into implied total variances per
+    (underlying, expiry) with one batched implied volatility solve.
+
+    Options without a market price, expired ones and quotes with no implied
+    volatility are left out; so are slices with fewer than `min_quotes`
+    quotes. Slices found in `previous` start their fit from those parameters.
+    """
+    options: List[Option] = []
+    for instrument in instruments:
+        if instrument.get("market_price") is None:
+            continue
+        option = option_from_instrument(instrument, market_data)
+        if not option.is_expired(as_of_date):
+            options.append(option)
+    if len(options) < len(instruments):
+        logger.info(
+            f"Calibrating to {len(options)} of {len(instruments)} options "
+            "(unquoted and expired options are skipped)."
+        )
+    if not options:
+        return []
+
+    arrays = option_arrays(options, as_of_date, market_data)
+    with get_profiler().stage("implied_volatility"):
+        solved = implied_volatility(
+            market_price=arrays["market_price"],
+            spot=arrays["spot"],
+            strike=arrays["strike"],
+            time_to_maturity=arrays["time_to_maturity"],
+            risk_free_rate=arrays["risk_free_rate"],
+            dividend_yield=arrays["dividend_yield"],
+            cp_flag=arrays["cp_flag"],
+        )
+    usable = (
+        solved.converged
+        & (solved.volatility > 0.0)
+        & (arrays["time_to_maturity"] > 0.0)
+    )
+    if not usable.all():
+        logger.warning(
+            f"{int((~usable).sum())} quotes have no implied volatility and are "
+            "left out of the calibration."
+        )
+
+    T = arrays["time_to_maturity"]
+    forward = arrays["spot"] * np.exp(
+        (arrays["risk_free_rate"] - arrays["dividend_yield"]) * T
+    )
+    log_moneyness = np.log(arrays["strike"] / forward)
+    total_variance = solved.volatility**2 * T
+    keys = np.array(
+        [
+            f"{option.underlying['symbol']}|{option.expiration_date:%Y%m%d}"
+            for option in options
+        ]
+    )
+
+    slices: List[SVISliceQuotes] = []
+    for key in np.unique(keys[usable]):
+        idx = np.flatnonzero((keys == key) & usable)
+        symbol, expiry = str(key).split("|")
+        if idx.size < min_quotes:
+            logger.warning(
+                f"Skipping {symbol} {expiry}: {idx.size} quotes, "
+                f"at least {min_quotes} are needed for an SVI fit."
+            )
+            continue
+        idx = idx[np.argsort(log_moneyness[idx])]
+        slices.append(
+            SVISliceQuotes(
+                symbol=symbol,
+                expiry=expiry,
+                tenor=float(T[idx[0]]),
+                forward=float(forward[idx[0]]),
+                log_moneyness=log_moneyness[idx],
+                total_variance=total_variance[idx],
+                initial=(previous or {}).get((symbol, expiry)),
+            )
+        )
+    return slices
+
+
+def calibrated_market_data(
+    market_data: Dict[str, Any], slices: Sequence[SVISlice]
+) -> Dict[str, Any]:
+    """
+    Copy of a market data snapshot in which the vol_surface of every
+    calibrated underlying is replaced by its fitted SVI slices.
+    """
+    calibrated = thaw(market_data)
+    surfaces: Dict[str, List[Dict[str, Any]]] = {}
+    for fitted in slices:
+        surfaces.setdefault(fitted.symbol, []).append(fitted.to_dict())
+    for symbol, fitted_slices in surfaces.items():
+        calibrated[symbol]["vol_surface"] = {"type": "SVI", "slices": fitted_slices}
+    return calibrated
+
+
+def previous_svi_parameters(
+    output_path: Union[str, Path], as_of_date: datetime
+) -> Dict[tuple, SVIParameters]:
+    """
+    SVI parameters of the latest calibrated snapshot in `output_path` dated
+    before `as_of_date`, or an empty dict if there is none.
+    """
+    date_str = as_of_date.strftime("%Y%m%d")
+    earlier = sorted(
+        path
+        for path in Path(output_path).glob("*.json")
+        if path.stem.isdigit() and len(path.stem) == 8 and path.stem < date_str
+    )
+    if not earlier:
+        return {}
+    snapshot = json_file_to_dict(earlier[-1])
+    return svi_parameters_from_market_data(snapshot.get(earlier[-1].stem, {}))
+
+
+def calibrate_mode_main(
+    calibrate: Dict[str, Any],
+    as_of_date: Optional[str],
+    verbose: str,
+    json_path: Union[str, Path],
+    write_csv: bool,
+    csv_path: str,
+    portfolio_path: Optional[Union[str, Path]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    dates: Optional[Sequence[str]] = None,
+) -> None:
+    """
+    Fit an SVI slice per underlying and expiry to the quoted options of a
+    chain, for one as-of date or a range of dates (see history_dates()).
+
+    Settings come from the `calibrate` JSON spec:
+     {
+        "chain": "chain.csv",              # unless --portfolio is given
+        "output_path": "calibrated_market_data",
+        "workers": 4,                      # default: one per CPU
+        "min_quotes": 5
+     }
+
+    For every date the market data snapshot is written back to
+    `<output_path>/<YYYYMMDD>.json` with the fitted slices as SVI
+    vol_surfaces, so it can be used as --input_data_path of later runs.
+    Slices that still have butterfly arbitrage after the penalized fit are
+    not published there. One process pool fits the slices of every date.
+    Each date's fits start from the previous date's parameters (or from the
+    latest snapshot already in output_path). The fitted parameters and fit
+    diagnostics are also written as CSV to `csv_path` (or to stdout).
+    """
+    logger = mode_logger(verbose, name="pyquant.calibrate_mode")
+    profiler = get_profiler()
+    chain_path = portfolio_path or calibrate.get("chain")
+    if not chain_path:
+        raise ValueError("An option chain (--portfolio) is required for CALIBRATE.")
+    output_path = Path(calibrate.get("output_path", "calibrated_market_data"))
+    workers = int(calibrate.get("workers") or os.cpu_count() or 1)
+    min_quotes = int(calibrate.get("min_quotes", MIN_QUOTES_PER_SLICE))
+
+    if dates or start_date or end_date:
+        as_of_dates = history_dates(json_path, start_date, end_date, dates, logger)
+    elif as_of_date:
+        as_of_dates = [datetime.strptime(as_of_date, "%Y%m%d")]
+    else:
+        raise ValueError("An as of date is required for CALIBRATE mode.")
+
+    instruments = [
+        instrument
+        for chunk in iter_portfolio_chunks(chain_path, 100_000)
+        for instrument in chunk
+    ]
+    previous = (
+        previous_svi_parameters(output_path, as_of_dates[0]) if as_of_dates else {}
+    )
+    rows: List[Dict[str, Any]] = []
+    with ExitStack() as stack:
+        pool = stack.enter_context(process_pool(workers)) if workers > 1 else None
+        for analysis_date in as_of_dates:
+            date_str = analysis_date.strftime("%Y%m%d")
+            logger.info(f"Calibrating SVI slices as of date: {analysis_date}")
+            with profiler.stage("market_data"):
+                market_data = cached_json_market_data_loader(
+                    analysis_date=analysis_date, logger=logger, json_path=json_path
+                ).get(date_str, {})
+
+            with profiler.stage("calibration_inputs"):
+                quotes = svi_slice_quotes(
+                    instruments,
+                    analysis_date,
+                    market_data,
+                    logger,
+                    previous,
+                    min_quotes,
+                )
+            with profiler.stage("svi_fit"):
+                slices = fit_svi_slices(quotes, workers=workers, executor=pool)
+            profiler.count("svi_slices_fitted", len(slices))
+            profiler.count(
+                "svi_warm_starts", sum(q.initial is not None for q in quotes)
+            )
+
+            for fitted in slices:
+                if not fitted.success or fitted.butterfly_arbitrage:
+                    logger.warning(
+                        f"SVI slice {fitted.symbol} {fitted.expiry}: "
+                        f"converged={fitted.success}, "
+                        f"butterfly arbitrage={fitted.butterfly_arbitrage}"
+                        + (", not published." if fitted.butterfly_arbitrage else ".")
+                    )
+                rows.append(
+                    {
+                        "as_of_date": date_str,
+                        "underlying_ticker": fitted.symbol,
+                        "expiry": fitted.expiry,
+                        "tenor": fitted.tenor,
+                        "forward": fitted.forward,
+                        **fitted.params._asdict(),
+                        "rmse": fitted.rmse,
+                        "n_quotes": fitted.n_quotes,
+                        "evaluations": fitted.evaluations,
+                        "success": fitted.success,
+                        "butterfly_arbitrage": fitted.butterfly_arbitrage,
+                    }
+                )
+
+            published = [fitted for fitted in slices if not fitted.butterfly_arbitrage]
+            with profiler.stage("output_write"):
+                output_path.mkdir(parents=True, exist_ok=True)
+                snapshot_file = output_path / f"{date_str}.json"
+                snapshot_file.write_text(
+                    json.dumps(
+                        {date_str: calibrated_market_data(market_data, published)},
+                        indent=2,
+                    )
+                )
+            logger.info(f"Calibrated market data written to: {snapshot_file}")
+            previous = {(s.symbol, s.expiry): s.params for s in slices}
+
+    df = pl.DataFrame(rows)
+    if write_csv:
+        csv_file = Path(csv_path)
+        csv_file.parent.mkdir(parents=True, exist_ok=True)
+        df.write_csv(csv_file)
+        logger.info(f"Calibration parameters written to CSV at: {csv_path}")
+    else:
+        df.write_csv(sys.stdout.buffer)
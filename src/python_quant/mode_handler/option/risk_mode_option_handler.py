@@ -1,44 +1,648 @@
-from typing import Dict, Any
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence
 from datetime import datetime
 from logging import Logger
+import numpy as np
 from python_quant.instrument.option import Option
+from python_quant.instrument.option_book import OptionBook
 from python_quant.pricers.bsm_pricer import BSMPricer
+from python_quant.pricers.binomial_tree import (
+    BinomialTreePricer,
+    binomial_implied_volatility,
+    binomial_tree_risk,
+)
+from python_quant.pricers.bsm_batch import BSMBatchPricer, resolve_greek_names
+from python_quant.pricers.finite_difference import (
+    FiniteDifferencePricer,
+    finite_difference_implied_volatility,
+    finite_difference_risk,
+)
+from python_quant.pricers.heston import HestonParameters, HestonPricer, heston_risk
+from python_quant.pricers.implied_vol import implied_volatility
+from python_quant.pricers.monte_carlo import MonteCarloPricer
+from python_quant.market_data.curves import rates_to_maturity
+from python_quant.market_data.vol_surface import vol_surface_from_market_data
+from python_quant.utils.profiling import get_profiler
 
+if TYPE_CHECKING:
+    import polars as pl
 
-def risk_mode_option_handler(
+
+def option_from_instrument(
     instrument: Dict[str, Any],
-    as_of_date: datetime,
     market_data: Dict[str, Any],
-    logger: Logger,
-) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    as_of_date: Optional[datetime] = None,
+) -> Option:
+    """
+    Build an Option from an instrument dict. Its volatility is the flat
+    market data volatility of the underlying, or, when the underlying has a
+    vol surface and `as_of_date` is given, the surface volatility at the
+    option's strike and maturity.
+    """
     underlying = instrument["underlying"]
+    ticker_data = market_data[underlying["symbol"]]
+    style = (instrument.get("style") or "EUROPEAN").upper()
+    exercise_dates = [
+        datetime.strptime(str(date), "%Y%m%d")
+        for date in instrument.get("exercise_dates") or []
+    ]
     option = Option(
         strike_price=float(instrument["strike"]),
         expiration_date=datetime.strptime(instrument["expiry"], "%Y%m%d"),
         market_price=instrument.get("market_price", None),
-        volatility=float(market_data[underlying["symbol"]].get("volatility")),
+        volatility=float(ticker_data.get("volatility") or 0.0),
         underlying_ticker=underlying["symbol"],
         underlying_type=underlying["type"],
         call_put=Option.CallPut.CALL
         if instrument["option_type"].upper() == "CALL"
         else Option.CallPut.PUT,
-        option_type=Option.OptionType.EUROPEAN,
+        option_type=Option.OptionType[style]
+        if style in Option.OptionType.__members__
+        else Option.OptionType.EUROPEAN,
+        exercise_dates=exercise_dates,
     )
+
+    surface = vol_surface_from_market_data(ticker_data)
+    if surface is not None and as_of_date is not None:
+        option.volatility = float(
+            surface.volatility(
+                option.strike_price,
+                option.time_to_maturity(as_of_date),
+                ticker_data["spot_price"],
+            )
+        )
+    return option
+
+
+def uses_monte_carlo(instrument: Dict[str, Any]) -> bool:
+    """Path-dependent payoffs, or an explicit MONTE_CARLO pricer, need MC."""
+    payoff = (instrument.get("payoff") or "VANILLA").upper()
+    pricer = (instrument.get("pricer") or "").upper()
+    return payoff != "VANILLA" or pricer == "MONTE_CARLO"
+
+
+def _uses_vanilla_pricer(instrument: Dict[str, Any], pricer: str, label: str) -> bool:
+    """Whether `instrument` selects `pricer`, which prices vanilla payoffs only."""
+    if (instrument.get("pricer") or "").upper() != pricer:
+        return False
+    payoff = (instrument.get("payoff") or "VANILLA").upper()
+    if payoff != "VANILLA":
+        raise NotImplementedError(
+            f"{label} pricing not implemented for payoff: {payoff}"
+        )
+    return True
+
+
+def uses_heston(instrument: Dict[str, Any]) -> bool:
+    """Vanilla options with an explicit HESTON pricer."""
+    return _uses_vanilla_pricer(instrument, "HESTON", "Heston")
+
+
+def uses_pde(instrument: Dict[str, Any]) -> bool:
+    """Vanilla options with an explicit PDE (Crank-Nicolson) pricer."""
+    return _uses_vanilla_pricer(instrument, "PDE", "Finite difference")
+
+
+def _monte_carlo_pricer(
+    instrument: Dict[str, Any],
+    option: Option,
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+    logger: Logger,
+) -> MonteCarloPricer:
+    return MonteCarloPricer(
+        instrument=option,
+        as_of_date=as_of_date,
+        market_data=market_data,
+        logger=logger,
+        payoff=instrument.get("payoff") or "VANILLA",
+        **instrument.get("monte_carlo", {}),
+    )
+
+
+def risk_mode_option_handler(
+    instrument: Dict[str, Any],
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+    logger: Logger,
+    higher_order: Sequence[str] = (),
+) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Price one option instrument and return Option.to_dict() and its greeks.
+    Requested `higher_order` greeks are analytic for BSM-priced options and
+    NaN for tree, PDE, Heston and Monte Carlo priced ones.
+    """
+    profiler = get_profiler()
+    names = resolve_greek_names(higher_order)
+    with profiler.stage("option_construction"):
+        option = option_from_instrument(instrument, market_data, as_of_date)
     style = instrument.get("style") or ""
 
-    match style.upper():
-        case "EUROPEAN":
-            logger.info("Processing EUROPEAN option in RISK mode.")
-            logger.info(f"Using BSM Pricer for option: {option}")
-            pricer = BSMPricer(
+    with profiler.stage("pricer_init"):
+        if uses_heston(instrument):
+            logger.info("Using Heston Pricer for option: %s", option)
+            pricer = HestonPricer(
                 instrument=option,
                 as_of_date=as_of_date,
                 market_data=market_data,
                 logger=logger,
             )
-            return option.to_dict(), pricer.greeks()
+        elif uses_pde(instrument):
+            logger.info("Using Finite Difference Pricer for option: %s", option)
+            pricer = FiniteDifferencePricer(
+                instrument=option,
+                as_of_date=as_of_date,
+                market_data=market_data,
+                logger=logger,
+            )
+        elif uses_monte_carlo(instrument):
+            logger.info("Using Monte Carlo Pricer for option: %s", option)
+            pricer = _monte_carlo_pricer(
+                instrument, option, as_of_date, market_data, logger
+            )
+        else:
+            match style.upper():
+                case "EUROPEAN":
+                    logger.info("Processing EUROPEAN option in RISK mode.")
+                    logger.info("Using BSM Pricer for option: %s", option)
+                    pricer = BSMPricer(
+                        instrument=option,
+                        as_of_date=as_of_date,
+                        market_data=market_data,
+                        logger=logger,
+                    )
+
+                case "AMERICAN" | "BERMUDAN":
+                    logger.info("Processing %s option in RISK mode.", style.upper())
+                    logger.info("Using Binomial Tree Pricer for option: %s", option)
+                    pricer = BinomialTreePricer(
+                        instrument=option,
+                        as_of_date=as_of_date,
+                        market_data=market_data,
+                        logger=logger,
+                    )
+
+                case _:
+                    raise NotImplementedError(
+                        f"RISK mode not implemented for option style: {style}"
+                    )
+
+    with profiler.stage("greeks"):
+        if isinstance(pricer, BSMPricer):
+            greeks = pricer.greeks(higher_order=names)
+        else:
+            greeks = pricer.greeks()
+            if names:
+                logger.warning(
+                    "Higher-order greeks are only computed for BSM priced options."
+                )
+            greeks.update(dict.fromkeys(names, float("nan")))
+    profiler.count("options_priced")
+    return option.to_dict(), greeks
+
+
+RISK_KEYS = ("price", "implied_volatility", "delta", "gamma", "theta", "rho", "vega")
+
+
+def option_arrays(
+    options: List[Option],
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+) -> Dict[str, np.ndarray]:
+    """
+    Gather the per-option pricing inputs of a batch into arrays: spot,
+    strike, time_to_maturity, volatility (from market data), market_price
+    (NaN where not quoted), cp_flag, and the risk_free_rate and
+    dividend_yield zero rates to each expiry. Underlyings with a vol surface
+    get their volatilities from one vectorized surface lookup, which is also
+    written back to the options. Times to maturity come from one vectorized
+    day count per convention, and rates from one lookup per curve that
+    evaluates each distinct expiry once.
+    """
+    arrays = {
+        key: np.empty(len(options))
+        for key in ("spot", "strike", "volatility", "cp_flag")
+    }
+    arrays["market_price"] = np.full(len(options), np.nan)
+    for i, option in enumerate(options):
+        ticker_data = market_data[option.underlying["symbol"]]
+        arrays["spot"][i] = (
+            ticker_data["spot_price"]
+            if isinstance(ticker_data, Mapping)
+            else ticker_data
+        )
+        arrays["strike"][i] = option.strike_price
+        arrays["volatility"][i] = option.volatility
+        if option.market_price is not None:
+            arrays["market_price"][i] = option.market_price
+        arrays["cp_flag"][i] = 1.0 if option.call_put == Option.CallPut.CALL else -1.0
+    arrays["time_to_maturity"] = Option.times_to_maturity(options, as_of_date)
+    symbols = np.array([option.underlying["symbol"] for option in options])
+    for i in _add_market_arrays(arrays, symbols, market_data):
+        options[i].volatility = float(arrays["volatility"][i])
+    return arrays
+
+
+def book_arrays(
+    book: OptionBook,
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+) -> Dict[str, np.ndarray]:
+    """
+    option_arrays() of an OptionBook, read from its columns without
+    creating Option objects.
+    """
+    arrays = {
+        "spot": book.spot(market_data),
+        "strike": book.strike,
+        "volatility": book.volatility(market_data),
+        "market_price": book.market_price,
+        "cp_flag": book.cp_flag.astype(np.float64),
+        "time_to_maturity": book.time_to_maturity(as_of_date),
+    }
+    _add_market_arrays(arrays, book.symbols(), market_data)
+    return arrays
+
 
-        case _:
+def _add_market_arrays(
+    arrays: Dict[str, np.ndarray],
+    symbols: np.ndarray,
+    market_data: Dict[str, Any],
+) -> np.ndarray:
+    """
+    Add the zero rates to each expiry to `arrays` and replace the
+    volatilities of underlyings with a vol surface by one vectorized surface
+    lookup per underlying.
+
+    Returns:
+        np.ndarray: Indices of the rows priced off a surface.
+    """
+    arrays["risk_free_rate"], arrays["dividend_yield"] = rates_to_maturity(
+        market_data, arrays["time_to_maturity"]
+    )
+    on_surface = []
+    for symbol in np.unique(symbols):
+        surface = vol_surface_from_market_data(market_data[symbol])
+        if surface is None:
+            continue
+        idx = np.flatnonzero(symbols == symbol)
+        arrays["volatility"][idx] = surface.volatility(
+            arrays["strike"][idx],
+            arrays["time_to_maturity"][idx],
+            market_data[symbol]["spot_price"],
+        )
+        on_surface.append(idx)
+    return np.concatenate(on_surface) if on_surface else np.array([], dtype=int)
+
+
+def european_volatility(
+    spot: np.ndarray,
+    strike: np.ndarray,
+    time_to_maturity: np.ndarray,
+    risk_free_rate: np.ndarray,
+    dividend_yield: np.ndarray,
+    volatility: np.ndarray,
+    market_price: np.ndarray,
+    cp_flag: np.ndarray,
+    logger: Logger,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Volatilities to price European options with: the batch implied
+    volatility where a market price is quoted, the market data volatility
+    otherwise.
+
+    Returns:
+        tuple: Volatilities, and a mask of quoted options with no implied
+        volatility (NaN volatility).
+    """
+    volatility = volatility.copy()
+    has_market_price = ~np.isnan(market_price)
+    failed = np.zeros(len(spot), dtype=bool)
+    if has_market_price.any():
+        with get_profiler().stage("implied_volatility"):
+            solved = implied_volatility(
+                market_price=market_price[has_market_price],
+                spot=spot[has_market_price],
+                strike=strike[has_market_price],
+                time_to_maturity=time_to_maturity[has_market_price],
+                risk_free_rate=risk_free_rate[has_market_price],
+                dividend_yield=dividend_yield[has_market_price],
+                cp_flag=cp_flag[has_market_price],
+            )
+        volatility[has_market_price] = solved.volatility
+        failed[has_market_price] = ~solved.converged | (solved.volatility <= 0.0)
+        if failed.any():
+            logger.warning(
+                f"{int(failed.sum())} options have no implied volatility "
+                f"({int(solved.arbitrage_violation.sum())} violate no-arbitrage "
+                "bounds); their greeks are reported as NaN."
+            )
+    volatility[failed] = np.nan
+    return volatility, failed
+
+
+def _european_batch_risk(
+    spot: np.ndarray,
+    strike: np.ndarray,
+    time_to_maturity: np.ndarray,
+    risk_free_rate: np.ndarray,
+    dividend_yield: np.ndarray,
+    volatility: np.ndarray,
+    market_price: np.ndarray,
+    cp_flag: np.ndarray,
+    logger: Logger,
+    higher_order: Sequence[str] = (),
+) -> Dict[str, np.ndarray]:
+    volatility, failed = european_volatility(
+        spot=spot,
+        strike=strike,
+        time_to_maturity=time_to_maturity,
+        risk_free_rate=risk_free_rate,
+        dividend_yield=dividend_yield,
+        volatility=volatility,
+        market_price=market_price,
+        cp_flag=cp_flag,
+        logger=logger,
+    )
+    risk = BSMBatchPricer(
+        spot=spot,
+        strike=strike,
+        time_to_maturity=time_to_maturity,
+        risk_free_rate=risk_free_rate,
+        dividend_yield=dividend_yield,
+        volatility=volatility,
+        cp_flag=cp_flag,
+    ).greeks(higher_order)
+    risk["price"] = np.where(np.isnan(market_price), risk["price"], market_price)
+    for key in risk.keys() - {"price"}:
+        risk[key] = np.where(failed, np.nan, risk[key])
+    return risk
+
+
+def _numerical_batch_risk(
+    options: List[Option],
+    as_of_date: datetime,
+    spot: float,
+    risk_free_rate: float,
+    dividend_yield: float,
+    volatility: np.ndarray,
+    market_price: np.ndarray,
+    logger: Logger,
+    pde: bool = False,
+) -> Dict[str, np.ndarray]:
+    """
+    Risk for options sharing underlying, expiry and exercise schedule, from
+    one binomial tree build or, with `pde`, one Crank-Nicolson grid solve.
+    """
+    solve_implied_volatility, model_risk, model = (
+        (finite_difference_implied_volatility, finite_difference_risk, "PDE")
+        if pde
+        else (binomial_implied_volatility, binomial_tree_risk, "tree")
+    )
+    first = options[0]
+    strike = np.array([option.strike_price for option in options])
+    cp_flag = np.array(
+        [1.0 if option.call_put == Option.CallPut.CALL else -1.0 for option in options]
+    )
+    tree_kwargs = {
+        "time_to_maturity": first.time_to_maturity(as_of_date),
+        "risk_free_rate": risk_free_rate,
+        "dividend_yield": dividend_yield,
+        "exercise": first.option_type.name,
+        "exercise_times": [
+            first.day_count_convention.year_fraction(as_of_date, date)
+            for date in first.exercise_dates or []
+        ],
+    }
+
+    volatility = volatility.copy()
+    has_market_price = ~np.isnan(market_price)
+    failed = np.zeros(len(options), dtype=bool)
+    if has_market_price.any():
+        solved = solve_implied_volatility(
+            market_price=market_price[has_market_price],
+            spot=spot,
+            strike=strike[has_market_price],
+            cp_flag=cp_flag[has_market_price],
+            **tree_kwargs,
+        )
+        volatility[has_market_price] = solved.volatility
+        failed[has_market_price] = ~solved.converged | (solved.volatility <= 0.0)
+        if failed.any():
+            logger.warning(
+                f"{int(failed.sum())} {first.option_type.name} "
+                f"{first.underlying['symbol']} options expiring "
+                f"{first.expiration_date:%Y-%m-%d} have no {model} implied "
+                "volatility; their greeks are reported as NaN: "
+                + ", ".join(
+                    f"{options[i].call_put.name} {options[i].strike_price}"
+                    for i in np.flatnonzero(failed)
+                )
+            )
+
+    # Options without a volatility are left out of the build rather than
+    # priced on a made-up one, and keep NaN greeks
+    risk = {key: np.full(len(options), np.nan) for key in RISK_KEYS}
+    priced = ~failed
+    if priced.any():
+        priced_risk = model_risk(
+            spot=spot,
+            strike=strike[priced],
+            volatility=volatility[priced],
+            cp_flag=cp_flag[priced],
+            **tree_kwargs,
+        )
+        for key in RISK_KEYS:
+            risk[key][priced] = priced_risk[key]
+    risk["price"] = np.where(has_market_price, market_price, risk["price"])
+    return risk
+
+
+def batch_book(
+    instruments: List[Dict[str, Any]],
+    as_of_date: datetime,
+    logger: Logger,
+    mode: str = "RISK",
+) -> tuple[OptionBook, np.ndarray]:
+    """
+    OptionBook of a batch of instruments, and the mask of its options that
+    expired before `as_of_date`. Expired options are not priced: their
+    results are reported as NaN instead of failing the whole batch.
+    """
+    for instrument in instruments:
+        style = instrument.get("style") or ""
+        if style.upper() not in ("EUROPEAN", "AMERICAN", "BERMUDAN"):
             raise NotImplementedError(
-                f"RISK mode not implemented for option style: {style}"
+                f"{mode} mode not implemented for option style: {style}"
+            )
+    book = OptionBook.from_instruments(instruments)
+    expired = book.is_expired(as_of_date)
+    if expired.any():
+        logger.warning(
+            f"{int(expired.sum())} options have expired (first: "
+            f"{book.option(int(np.argmax(expired)))}); their {mode} results are "
+            "reported as NaN."
+        )
+    return book, expired
+
+
+def model_options(
+    instruments: List[Dict[str, Any]],
+    market_data: Dict[str, Any],
+    volatility: np.ndarray,
+    mask: np.ndarray,
+) -> List[Optional[Option]]:
+    """
+    Options of the instruments selected by `mask`, None elsewhere: only rows
+    priced by a tree, PDE grid, Heston transform or simulation need one, for
+    their exercise schedule and pricer settings.
+    """
+    options: List[Optional[Option]] = [None] * len(instruments)
+    for i in np.flatnonzero(mask):
+        option = option_from_instrument(instruments[i], market_data)
+        option.volatility = float(volatility[i])
+        options[i] = option
+    return options
+
+
+def expiry_groups(
+    options: Sequence[Optional[Option]], mask: np.ndarray
+) -> List[List[int]]:
+    """
+    Indices of the options selected by `mask`, grouped by underlying,
+    expiry and exercise schedule so that each group shares one tree build,
+    PDE grid solve or Heston transform.
+    """
+    groups: Dict[tuple, List[int]] = {}
+    for i in np.flatnonzero(mask):
+        option = options[i]
+        assert option is not None
+        key = (
+            option.underlying["symbol"],
+            option.expiration_date,
+            option.option_type,
+            tuple(option.exercise_dates or ()),
+        )
+        groups.setdefault(key, []).append(int(i))
+    return list(groups.values())
+
+
+def risk_mode_option_batch_handler(
+    instruments: List[Dict[str, Any]],
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+    logger: Logger,
+    higher_order: Sequence[str] = (),
+) -> tuple["pl.DataFrame", Dict[str, np.ndarray]]:
+    """
+    Price a batch of option instruments in vectorized passes.
+
+    Produces the same fields as risk_mode_option_handler for every
+    instrument. European options are priced together with the batch
+    implied volatility solver and BSMBatchPricer; American and Bermudan
+    options are grouped by underlying, expiry and exercise schedule so that
+    every strike of a group shares one binomial tree build, or one
+    Crank-Nicolson grid solve for options with a PDE pricer. Options with a
+    HESTON pricer share one characteristic function transform per
+    underlying and expiry. Path-dependent payoffs are simulated one
+    instrument at a time. Options whose market price violates no-arbitrage
+    bounds (or whose implied volatility does not converge) get NaN greeks
+    instead of failing the whole batch, as do options that have expired.
+    Requested `higher_order` greeks come from BSMBatchPricer and are NaN for
+    tree, PDE, Heston and Monte Carlo priced options.
+
+    The batch is held as an OptionBook: European options are priced from
+    its columns, and Option objects are only built for the rows a tree, PDE
+    grid, Heston transform or simulation prices.
+
+    Returns:
+        tuple: The Option.to_dict() fields of every instrument as a polars
+        frame, and a dict of greek arrays aligned with it.
+    """
+    profiler = get_profiler()
+    with profiler.stage("option_construction"):
+        book, expired = batch_book(instruments, as_of_date, logger)
+        arrays = book_arrays(book, as_of_date, market_data)
+        live = ~expired
+        heston = live & np.array([uses_heston(i) for i in instruments], dtype=bool)
+        monte_carlo = live & np.array(
+            [uses_monte_carlo(i) for i in instruments], dtype=bool
+        )
+        pde = live & np.array([uses_pde(i) for i in instruments], dtype=bool)
+        european = live & ~monte_carlo & ~heston & ~pde & book.is_european()
+        tree = live & ~european & ~monte_carlo & ~heston & ~pde
+        options = model_options(
+            instruments, market_data, arrays["volatility"], live & ~european
+        )
+    profiler.count("options_priced", len(book))
+    spot = arrays["spot"]
+    volatility = arrays["volatility"]
+    market_price = arrays["market_price"]
+
+    names = resolve_greek_names(higher_order)
+    risk = {key: np.full(len(book), np.nan) for key in RISK_KEYS + names}
+
+    for idx in expiry_groups(options, heston):
+        first = options[idx[0]]
+        assert first is not None
+        if first.option_type != Option.OptionType.EUROPEAN:
+            raise NotImplementedError("Heston pricing supports European exercise only.")
+        with profiler.stage("heston_batch_greeks"):
+            heston_expiry_risk = heston_risk(
+                spot=float(spot[idx[0]]),
+                strike=arrays["strike"][idx],
+                time_to_maturity=float(arrays["time_to_maturity"][idx[0]]),
+                risk_free_rate=float(arrays["risk_free_rate"][idx[0]]),
+                dividend_yield=float(arrays["dividend_yield"][idx[0]]),
+                params=HestonParameters.from_market_data(
+                    market_data[first.underlying["symbol"]]
+                ),
+                cp_flag=arrays["cp_flag"][idx],
+                market_price=market_price[idx],
+            )
+        for key in RISK_KEYS:
+            risk[key][idx] = heston_expiry_risk[key]
+
+    for i in np.flatnonzero(monte_carlo):
+        with profiler.stage("monte_carlo_greeks"):
+            greeks = _monte_carlo_pricer(
+                instruments[i], options[i], as_of_date, market_data, logger
+            ).greeks()
+        for key in RISK_KEYS:
+            risk[key][i] = greeks[key]
+
+    if european.any():
+        idx = np.flatnonzero(european)
+        with profiler.stage("european_batch_greeks"):
+            european_risk = _european_batch_risk(
+                **{key: value[idx] for key, value in arrays.items()},
+                logger=logger,
+                higher_order=names,
             )
+        for key in RISK_KEYS + names:
+            risk[key][idx] = european_risk[key]
+
+    for on_grid, mask in ((False, tree), (True, pde)):
+        for idx in expiry_groups(options, mask):
+            logger.info(
+                "Pricing %d %s options on one %s.",
+                len(idx),
+                book.option(idx[0]).option_type.name,
+                "Crank-Nicolson grid" if on_grid else "binomial tree",
+            )
+            with profiler.stage("pde_batch_greeks" if on_grid else "tree_batch_greeks"):
+                group_risk = _numerical_batch_risk(
+                    options=[options[i] for i in idx],
+                    as_of_date=as_of_date,
+                    spot=float(spot[idx[0]]),
+                    risk_free_rate=float(arrays["risk_free_rate"][idx[0]]),
+                    dividend_yield=float(arrays["dividend_yield"][idx[0]]),
+                    volatility=volatility[idx],
+                    market_price=market_price[idx],
+                    logger=logger,
+                    pde=on_grid,
+                )
+            for key in RISK_KEYS:
+                risk[key][idx] = group_risk[key]
+
+    return book.to_frame(volatility), risk
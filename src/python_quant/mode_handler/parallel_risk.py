@@ -0,0 +1,243 @@
+import multiprocessing
+import os
+import pickle
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from logging import Logger
+from multiprocessing import shared_memory
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from python_quant.market_data.cache import thaw
+from python_quant.mode_handler.risk_mode import (
+    CacheLookup,
+    mode_logger,
+    result_cache_lookup,
+    result_cache_merge,
+    risk_mode_batch,
+    risk_mode_batch_parts,
+)
+from python_quant.utils.profiling import get_profiler
+
+if TYPE_CHECKING:
+    import polars as pl
+    from python_quant.utils.result_cache import ResultCache
+
+# Shards queued per worker, enough to keep every worker busy while the
+# parent merges, without reading the whole portfolio ahead
+SHARDS_IN_FLIGHT_PER_WORKER = 2
+
+
+class SharedSnapshot(NamedTuple):
+    """Name and payload size of a market data snapshot in shared memory."""
+
+    name: str
+    size: int
+
+
+def publish_market_data(
+    market_data: Mapping[str, Any],
+) -> Tuple[shared_memory.SharedMemory, SharedSnapshot]:
+    """
+    Pickle a parsed market data snapshot once into a new shared memory
+    block. The caller owns the block and must close() and unlink() it.
+
+    This saves the transfer, not the memory: the snapshot is nested dicts
+    and lists parsed from JSON, which cannot be read in place, so every
+    worker unpickles a private copy of it (once, when it starts).
+
+    Returns:
+        tuple: The block, and the handle workers attach to it with.
+    """
+    payload = pickle.dumps(thaw(market_data), protocol=pickle.HIGHEST_PROTOCOL)
+    block = shared_memory.SharedMemory(create=True, size=len(payload))
+    block.buf[: len(payload)] = payload
+    return block, SharedSnapshot(block.name, len(payload))
+
+
+def load_market_data(snapshot: SharedSnapshot) -> Dict[str, Any]:
+    """
+    Unpickle a private copy of a snapshot published by publish_market_data()
+    in another process.
+    """
+    # Only the publisher unlinks the block, so attaching must not track it
+    kwargs = {"track": False} if sys.version_info >= (3, 13) else {}
+    block = shared_memory.SharedMemory(name=snapshot.name, **kwargs)
+    try:
+        return pickle.loads(block.buf[: snapshot.size])
+    finally:
+        block.close()
+
+
+# State of a worker process, set once by _init_worker()
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(
+    snapshot: SharedSnapshot,
+    as_of_date: datetime,
+    higher_order: Sequence[str],
+    verbose: Optional[str],
+) -> None:
+    _WORKER["market_data"] = load_market_data(snapshot)
+    _WORKER["as_of_date"] = as_of_date
+    _WORKER["higher_order"] = higher_order
+    _WORKER["logger"] = mode_logger(verbose, name="pyquant.risk_mode.worker")
+
+
+def _price_shard(
+    instruments: List[Dict[str, Any]],
+) -> Tuple["pl.DataFrame", "pl.DataFrame"]:
+    return risk_mode_batch_parts(
+        instruments=instruments,
+        as_of_date=_WORKER["as_of_date"],
+        market_data=_WORKER["market_data"],
+        logger=_WORKER["logger"],
+        higher_order=_WORKER["higher_order"],
+    )
+
+
+class _Shard(NamedTuple):
+    instruments: List[Dict[str, Any]]
+    lookup: Optional[CacheLookup]
+    priced: Optional["Future[Tuple[pl.DataFrame, pl.DataFrame]]"]
+
+
+class ShardedRiskRunner:
+    """
+    Prices portfolio shards (lists of instruments) on a process pool.
+
+    The market data snapshot is published once to shared memory and each
+    worker unpickles its own copy of it when it starts, so shards are sent
+    without it; memory use still grows with one snapshot per worker. Shards are
+    priced with risk_mode_batch() exactly as in a serial run, and results
+    are yielded in shard order whatever order the workers finish in, so the
+    output does not depend on the number of workers. At most
+    SHARDS_IN_FLIGHT_PER_WORKER shards per worker are queued ahead of the
+    one being yielded. Result cache lookups and stores stay in the parent
+    process; only the cache misses of a shard are sent to the pool. With a
+    single worker the shards are priced in-process.
+
+    Use it as a context manager, or call close() to stop the pool and
+    release the shared memory.
+
+    Args:
+        workers: Number of worker processes, one per CPU if None.
+        verbose: Logging level of the workers, as for mode_logger().
+    """
+
+    def __init__(
+        self,
+        as_of_date: datetime,
+        market_data: Mapping[str, Any],
+        logger: Logger,
+        workers: Optional[int] = None,
+        higher_order: Sequence[str] = (),
+        verbose: Optional[str] = None,
+        result_cache: Optional["ResultCache"] = None,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("The number of workers must be a positive integer.")
+        self.as_of_date = as_of_date
+        self.market_data = market_data
+        self.logger = logger
+        self.higher_order = higher_order
+        self.result_cache = result_cache
+        self._block: Optional[shared_memory.SharedMemory] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if self.workers > 1:
+            self._block, snapshot = publish_market_data(market_data)
+            logger.info(
+                f"Market data published to shared memory ({snapshot.size} bytes), "
+                f"starting {self.workers} workers."
+            )
+            # forkserver: forking a process that runs polars/BLAS threads can
+            # deadlock
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_init_worker,
+                initargs=(snapshot, as_of_date, tuple(higher_order), verbose),
+            )
+
+    def _submit(self, instruments: List[Dict[str, Any]]) -> _Shard:
+        lookup = None
+        missed = instruments
+        if self.result_cache is not None:
+            lookup = result_cache_lookup(
+                self.result_cache,
+                instruments,
+                self.as_of_date,
+                self.market_data,  # type: ignore[arg-type]
+                self.logger,
+                self.higher_order,
+            )
+            missed = [instruments[i] for i in lookup.missed]
+        priced = self._pool.submit(_price_shard, missed) if missed else None  # type: ignore[union-attr]
+        return _Shard(instruments, lookup, priced)
+
+    def _collect(self, shard: _Shard) -> "pl.DataFrame":
+        with get_profiler().stage("shard_wait"):
+            priced = shard.priced.result() if shard.priced is not None else None
+        if shard.lookup is None:
+            instrument_df, risk_df = priced  # type: ignore[misc]
+            return instrument_df.hstack(risk_df)
+        return result_cache_merge(
+            self.result_cache,  # type: ignore[arg-type]
+            shard.instruments,
+            self.as_of_date,
+            shard.lookup,
+            priced,
+        )
+
+    def run(self, shards: Iterable[List[Dict[str, Any]]]) -> Iterator["pl.DataFrame"]:
+        """Yield the RISK output of every shard, in shard order."""
+        if self._pool is None:
+            for instruments in shards:
+                yield risk_mode_batch(
+                    instruments=instruments,
+                    as_of_date=self.as_of_date,
+                    market_data=self.market_data,  # type: ignore[arg-type]
+                    logger=self.logger,
+                    higher_order=self.higher_order,
+                    result_cache=self.result_cache,
+                )
+            return
+
+        pending: Deque[_Shard] = deque()
+        for instruments in shards:
+            pending.append(self._submit(instruments))
+            get_profiler().count("shards")
+            if len(pending) >= SHARDS_IN_FLIGHT_PER_WORKER * self.workers:
+                yield self._collect(pending.popleft())
+        while pending:
+            yield self._collect(pending.popleft())
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def __enter__(self) -> "ShardedRiskRunner":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,183 @@
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
+import polars as pl
+from python_quant.instrument.option import Option
+from python_quant.market_data.cache import cached_json_market_data_loader
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    _monte_carlo_pricer,
+    batch_book,
+    book_arrays,
+    expiry_groups,
+    model_options,
+    uses_heston,
+    uses_monte_carlo,
+    uses_pde,
+)
+from python_quant.mode_handler.risk_mode import mode_logger
+from python_quant.pricers.binomial_tree import binomial_tree
+from python_quant.pricers.bsm_batch import bsm_price
+from python_quant.pricers.finite_difference import crank_nicolson
+from python_quant.pricers.heston import HestonParameters, heston_price
+from python_quant.utils.portfolio import iter_portfolio_chunks
+from python_quant.utils.profiling import get_profiler
+from python_quant.utils.result_sink import PRICE_SCHEMA, ResultSink
+
+
+def price_option_batch(
+    instruments: List[Dict[str, Any]],
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+    logger: Logger,
+) -> pl.DataFrame:
+    """
+    Value a batch of option instruments without computing any greeks.
+
+    Quoted options are marked at their market price, so no implied
+    volatility is solved. Unquoted European options are valued in one
+    bsm_price() pass, American and Bermudan ones with one binomial tree
+    build per underlying, expiry and exercise schedule (no bumped rebuilds)
+    or one Crank-Nicolson grid solve for options with a PDE pricer, options
+    with a HESTON pricer with one transform per expiry, and
+    path-dependent payoffs with one Monte Carlo run each. Expired options
+    get a NaN price.
+
+    The batch is held as an OptionBook, and Option objects are only built
+    for the unquoted rows priced by a tree, PDE grid, Heston transform or
+    simulation.
+
+    Returns:
+        pl.DataFrame: Option.to_dict() fields and the price of every
+        instrument.
+    """
+    profiler = get_profiler()
+    with profiler.stage("option_construction"):
+        book, expired = batch_book(instruments, as_of_date, logger, mode="PRICE")
+        arrays = book_arrays(book, as_of_date, market_data)
+        price = np.where(expired, np.nan, arrays["market_price"])
+        unquoted = ~expired & np.isnan(price)
+        heston = unquoted & np.array([uses_heston(i) for i in instruments], dtype=bool)
+        monte_carlo = unquoted & np.array(
+            [uses_monte_carlo(i) for i in instruments], dtype=bool
+        )
+        pde = unquoted & np.array([uses_pde(i) for i in instruments], dtype=bool)
+        european = unquoted & ~monte_carlo & ~heston & ~pde & book.is_european()
+        tree = unquoted & ~monte_carlo & ~heston & ~pde & ~european
+        options = model_options(
+            instruments, market_data, arrays["volatility"], unquoted & ~european
+        )
+
+    with profiler.stage("pricing"):
+        if european.any():
+            price[european] = bsm_price(
+                spot=arrays["spot"][european],
+                strike=arrays["strike"][european],
+                time_to_maturity=arrays["time_to_maturity"][european],
+                risk_free_rate=arrays["risk_free_rate"][european],
+                dividend_yield=arrays["dividend_yield"][european],
+                volatility=arrays["volatility"][european],
+                cp_flag=arrays["cp_flag"][european],
+            )
+        for idx in expiry_groups(options, heston):
+            first = options[idx[0]]
+            assert first is not None
+            if first.option_type != Option.OptionType.EUROPEAN:
+                raise NotImplementedError(
+                    "Heston pricing supports European exercise only."
+                )
+            price[idx] = heston_price(
+                spot=float(arrays["spot"][idx[0]]),
+                strike=arrays["strike"][idx],
+                time_to_maturity=float(arrays["time_to_maturity"][idx[0]]),
+                risk_free_rate=float(arrays["risk_free_rate"][idx[0]]),
+                dividend_yield=float(arrays["dividend_yield"][idx[0]]),
+                params=HestonParameters.from_market_data(
+                    market_data[first.underlying["symbol"]]
+                ),
+                cp_flag=arrays["cp_flag"][idx],
+            )
+        for on_grid, mask in ((False, tree), (True, pde)):
+            for idx in expiry_groups(options, mask):
+                first = options[idx[0]]
+                assert first is not None
+                model = crank_nicolson if on_grid else binomial_tree
+                price[idx] = model(
+                    spot=float(arrays["spot"][idx[0]]),
+                    strike=arrays["strike"][idx],
+                    time_to_maturity=float(arrays["time_to_maturity"][idx[0]]),
+                    risk_free_rate=float(arrays["risk_free_rate"][idx[0]]),
+                    dividend_yield=float(arrays["dividend_yield"][idx[0]]),
+                    volatility=arrays["volatility"][idx],
+                    cp_flag=arrays["cp_flag"][idx],
+                    exercise=first.option_type.name,
+                    exercise_times=[
+                        first.day_count_convention.year_fraction(as_of_date, date)
+                        for date in first.exercise_dates or []
+                    ],
+                )["price"]
+        for i in np.flatnonzero(monte_carlo):
+            price[i] = _monte_carlo_pricer(
+                instruments[i], options[i], as_of_date, market_data, logger
+            ).price()
+    profiler.count("options_priced", len(book))
+
+    df = book.to_frame(arrays["volatility"])
+    return df.with_columns(pl.Series("price", price))
+
+
+def price_mode_main(
+    as_of_date: str,
+    verbose: str,
+    json_path: Union[str, Path],
+    write_csv: bool,
+    csv_path: str,
+    instrument: Optional[Dict[str, Any]] = None,
+    portfolio_path: Optional[Union[str, Path]] = None,
+    chunk_size: int = 10_000,
+    output_format: str = "CSV",
+) -> None:
+    """
+    Price-only run over one instrument or a portfolio (JSONL, CSV or
+    Parquet): prices are streamed chunk by chunk through a ResultSink with
+    PRICE_SCHEMA to `csv_path` (Parquet/IPC part files for `output_format`)
+    or to stdout as CSV. Nothing else is printed.
+    """
+    logger = mode_logger(verbose, name="pyquant.price_mode")
+    profiler = get_profiler()
+    analysis_date = datetime.strptime(as_of_date, "%Y%m%d")
+    with profiler.stage("market_data"):
+        market_data = cached_json_market_data_loader(
+            analysis_date=analysis_date, logger=logger, json_path=json_path
+        ).get(as_of_date, {})
+
+    if portfolio_path:
+        chunks = iter_portfolio_chunks(portfolio_path, chunk_size)
+    elif instrument:
+        chunks = iter([[instrument]])
+    else:
+        raise ValueError("An instrument or a portfolio is required for PRICE mode.")
+
+    n_positions = 0
+    sink = ResultSink(
+        csv_path if write_csv else None,
+        output_format,
+        schema=PRICE_SCHEMA,
+        batch_rows=chunk_size,
+    )
+    with sink:
+        for instruments in chunks:
+            for i in instruments:
+                if str(i.get("type")).upper() != "OPTION":
+                    raise NotImplementedError(
+                        f"PRICE mode not implemented for instrument type: "
+                        f"{i.get('type')}"
+                    )
+            df = price_option_batch(instruments, analysis_date, market_data, logger)
+            with profiler.stage("output_write"):
+                sink.write(df)
+            n_positions += len(instruments)
+
+    if write_csv:
+        logger.info(f"Prices of {n_positions} positions written to: {csv_path}")
@@ -1,13 +1,32 @@
-from logging import getLogger, INFO, basicConfig, DEBUG
-from typing import Dict, Any, Union
+from logging import getLogger, INFO, basicConfig, DEBUG, Logger
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Any,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from pathlib import Path
-from datetime import datetime
-from python_quant.market_data.mkt_data_json import json_market_data_loader
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from python_quant.market_data.cache import cached_json_market_data_loader
 from python_quant.utils.csv import write_output_to_csv
+from python_quant.utils.profiling import get_profiler
+from python_quant.pricers.bsm_batch import resolve_greek_names
 from python_quant.mode_handler.option.risk_mode_option_handler import (
     risk_mode_option_handler,
+    risk_mode_option_batch_handler,
 )
 
+if TYPE_CHECKING:
+    import polars as pl
+    from python_quant.utils.result_cache import ResultCache
+
 
 def pretty_print_output(
     instrument: Dict[str, Any], risk: Dict[str, Any], indent: int = 4
@@ -26,6 +45,20 @@ def pretty_print_output(
     print("\t================================")
 
 
+def mode_logger(verbose: Optional[str], name: str = "pyquant.risk_mode") -> Logger:
+    logger = getLogger(name)
+    basicConfig(level=INFO, format="{asctime} - {levelname} - {message}", style="{")
+
+    match verbose and verbose.upper():
+        case "I":
+            logger.setLevel(INFO)
+        case "D":
+            logger.setLevel(DEBUG)
+        case _:
+            logger.disabled = True
+    return logger
+
+
 def risk_mode_main(
     instrument: Dict[str, Any],
     as_of_date: str,
@@ -33,6 +66,9 @@ def risk_mode_main(
     json_path: Union[str, Path],
     write_csv: bool,
     csv_path: str,
+    output_format: str = "CSV",
+    higher_order: Sequence[str] = (),
+    result_cache: Optional["ResultCache"] = None,
 ) -> None:
     intro_message = """
     ========================================
@@ -40,47 +76,404 @@ def risk_mode_main(
     ========================================
     """
     print(intro_message)
-    logger = getLogger("pyquant.risk_mode")
-    basicConfig(level=INFO, format="{asctime} - {levelname} - {message}", style="{")
+    logger = mode_logger(verbose)
+    profiler = get_profiler()
 
     analysis_date = datetime.strptime(as_of_date, "%Y%m%d")
 
-    match verbose and verbose.upper():
-        case "I":
-            logger.setLevel(INFO)
-        case "D":
-            logger.setLevel(DEBUG)
-        case _:
-            logger.disabled = True
-
-    logger.info(f"Starting RISK mode as of date: {analysis_date}")
+    logger.info("Starting RISK mode as of date: %s", analysis_date)
 
-    logger.info(f"Getting Market Data for RISK mode as_of_date: {analysis_date}")
-    market_data = json_market_data_loader(
-        analysis_date=analysis_date, logger=logger, json_path=json_path
-    ).get(as_of_date, {})
-    logger.info(f"Instrument details:\n{instrument}")
+    logger.info("Getting Market Data for RISK mode as_of_date: %s", analysis_date)
+    with profiler.stage("market_data"):
+        market_data = cached_json_market_data_loader(
+            analysis_date=analysis_date, logger=logger, json_path=json_path
+        ).get(as_of_date, {})
+    logger.info("Instrument details:\n%s", instrument)
 
     instrument_type = str(instrument.get("type"))
 
-    match instrument_type.upper():
-        case "OPTION":
-            instrument_dict, risk = risk_mode_option_handler(
-                instrument=instrument,
-                as_of_date=analysis_date,
+    cached = None
+    if result_cache is not None:
+        key = result_cache.result_key(
+            instrument, analysis_date, market_data, resolve_greek_names(higher_order)
+        )
+        with profiler.stage("result_cache"):
+            cached = result_cache.get_many([key]).get(key)
+
+    if cached is not None:
+        logger.info("Risk served from the result cache.")
+        instrument_dict, risk = cached["instrument"], cached["risk"]
+    else:
+        with profiler.stage("pricing"):
+            match instrument_type.upper():
+                case "OPTION":
+                    instrument_dict, risk = risk_mode_option_handler(
+                        instrument=instrument,
+                        as_of_date=analysis_date,
+                        market_data=market_data,
+                        logger=logger,
+                        higher_order=higher_order,
+                    )
+                case _:
+                    raise NotImplementedError(
+                        f"RISK mode not implemented for instrument type: {
+                            instrument.get('type')
+                        }"
+                    )
+        if result_cache is not None:
+            result_cache.put_many(
+                [key],
+                [instrument],
+                analysis_date,
+                [{"instrument": instrument_dict, "risk": risk}],
+            )
+
+    pretty_print_output(instrument, risk)
+
+    if write_csv and output_format.upper() != "CSV":
+        from python_quant.utils.result_sink import ResultSink, result_schema
+
+        schema = result_schema(resolve_greek_names(higher_order))
+        with (
+            profiler.stage("output_write"),
+            ResultSink(csv_path, output_format, schema) as sink,
+        ):
+            sink.write_rows([{**instrument_dict, **risk}])
+        logger.info("Risk mode %s output written at: %s", output_format, csv_path)
+    elif write_csv:
+        output_data = {"instrument_details": instrument_dict, "risk_metrics": risk}
+        with profiler.stage("csv_write"):
+            write_output_to_csv(data=output_data, csv_path=csv_path)
+        logger.info("Risk mode output written to CSV at: %s", csv_path)
+
+
+class CacheLookup(NamedTuple):
+    """Result keys of a chunk, the rows found under them and the missed indices."""
+
+    keys: List[str]
+    rows: Dict[str, Dict[str, Any]]
+    missed: List[int]
+
+
+def result_cache_lookup(
+    result_cache: "ResultCache",
+    instruments: List[Dict[str, Any]],
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+    logger: Logger,
+    higher_order: Sequence[str] = (),
+) -> CacheLookup:
+    """Look up the cached rows of a chunk of instruments."""
+    keys = [
+        result_cache.result_key(i, as_of_date, market_data, higher_order)
+        for i in instruments
+    ]
+    with get_profiler().stage("result_cache"):
+        rows = result_cache.get_many(keys)
+    missed = [i for i, key in enumerate(keys) if key not in rows]
+    get_profiler().count("result_cache_hits", len(keys) - len(missed))
+    logger.info(f"Result cache: {len(keys) - len(missed)} hits, {len(missed)} misses.")
+    return CacheLookup(keys, rows, missed)
+
+
+def result_cache_merge(
+    result_cache: "ResultCache",
+    instruments: List[Dict[str, Any]],
+    as_of_date: datetime,
+    lookup: CacheLookup,
+    priced: Optional[Tuple["pl.DataFrame", "pl.DataFrame"]],
+) -> "pl.DataFrame":
+    """
+    Store the (instrument details, risk metrics) frames `priced` for the
+    missed instruments of `lookup` and return the output rows of the whole
+    chunk, in instrument order.
+    """
+    import polars as pl
+
+    rows = dict(lookup.rows)
+    if lookup.missed:
+        instrument_df, risk_df = priced  # type: ignore[misc]
+        priced_rows = [
+            {"instrument": instrument_row, "risk": risk_row}
+            for instrument_row, risk_row in zip(
+                instrument_df.to_dicts(), risk_df.to_dicts(), strict=True
+            )
+        ]
+        missed_keys = [lookup.keys[i] for i in lookup.missed]
+        result_cache.put_many(
+            missed_keys,
+            [instruments[i] for i in lookup.missed],
+            as_of_date,
+            priced_rows,
+        )
+        rows.update(zip(missed_keys, priced_rows, strict=True))
+    return pl.DataFrame(
+        [{**rows[key]["instrument"], **rows[key]["risk"]} for key in lookup.keys],
+        infer_schema_length=None,
+    )
+
+
+def risk_mode_batch(
+    instruments: List[Dict[str, Any]],
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+    logger: Logger,
+    higher_order: Sequence[str] = (),
+    result_cache: Optional["ResultCache"] = None,
+) -> "pl.DataFrame":
+    """
+    Price a chunk of instruments and return one output row per instrument,
+    made of the instrument details followed by the risk metrics.
+
+    With a `result_cache`, rows cached under the instruments' result keys
+    are reused and only the misses are priced (in one batch) and stored.
+    """
+    if result_cache is not None:
+        lookup = result_cache_lookup(
+            result_cache, instruments, as_of_date, market_data, logger, higher_order
+        )
+        priced = None
+        if lookup.missed:
+            priced = risk_mode_batch_parts(
+                instruments=[instruments[i] for i in lookup.missed],
+                as_of_date=as_of_date,
                 market_data=market_data,
                 logger=logger,
+                higher_order=higher_order,
             )
-        case _:
+        return result_cache_merge(result_cache, instruments, as_of_date, lookup, priced)
+
+    instrument_df, risk_df = risk_mode_batch_parts(
+        instruments, as_of_date, market_data, logger, higher_order
+    )
+    return instrument_df.hstack(risk_df)
+
+
+def risk_mode_batch_parts(
+    instruments: List[Dict[str, Any]],
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+    logger: Logger,
+    higher_order: Sequence[str] = (),
+) -> Tuple["pl.DataFrame", "pl.DataFrame"]:
+    """
+    Price a chunk of instruments, returning the instrument details and the
+    risk metrics as two row-aligned frames.
+    """
+    import polars as pl
+
+    for instrument in instruments:
+        instrument_type = str(instrument.get("type"))
+        if instrument_type.upper() != "OPTION":
             raise NotImplementedError(
                 f"RISK mode not implemented for instrument type: {
                     instrument.get('type')
                 }"
             )
 
-    pretty_print_output(instrument, risk)
+    instrument_df, risk = risk_mode_option_batch_handler(
+        instruments=instruments,
+        as_of_date=as_of_date,
+        market_data=market_data,
+        logger=logger,
+        higher_order=higher_order,
+    )
+    return instrument_df, pl.DataFrame(risk)
+
+
+def risk_mode_portfolio_main(
+    portfolio_path: Union[str, Path],
+    as_of_date: str,
+    verbose: str,
+    json_path: Union[str, Path],
+    write_csv: bool,
+    csv_path: str,
+    chunk_size: int = 10_000,
+    output_format: str = "CSV",
+    higher_order: Sequence[str] = (),
+    result_cache: Optional["ResultCache"] = None,
+    workers: int = 1,
+) -> None:
+    """
+    Run RISK mode over a portfolio file (JSONL, CSV or Parquet).
+
+    The portfolio is streamed in chunks of at most `chunk_size` instruments;
+    each chunk is priced in one batch and its rows are handed to a
+    ResultSink before the next chunk is read, so memory use does not grow
+    with the size of the book. Rows are appended to `csv_path`, written as
+    Parquet/IPC part files under `csv_path` (see `output_format`), or
+    written as CSV to stdout. Requested `higher_order` greeks are added as
+    extra columns. Positions found in `result_cache` are not repriced.
+
+    With more than one of `workers` (0 for one per CPU) the chunks are
+    priced in parallel by a ShardedRiskRunner and written in portfolio
+    order, so the output is the same as that of a serial run.
+    """
+    from python_quant.mode_handler.parallel_risk import ShardedRiskRunner
+    from python_quant.utils.portfolio import iter_portfolio_chunks
+    from python_quant.utils.result_sink import ResultSink, result_schema
+
+    logger = mode_logger(verbose)
+    analysis_date = datetime.strptime(as_of_date, "%Y%m%d")
+
+    logger.info(f"Starting portfolio RISK mode as of date: {analysis_date}")
+    with get_profiler().stage("market_data"):
+        market_data = cached_json_market_data_loader(
+            analysis_date=analysis_date, logger=logger, json_path=json_path
+        ).get(as_of_date, {})
+
+    profiler = get_profiler()
+    n_positions = 0
+    higher_order = resolve_greek_names(higher_order)
+    sink = ResultSink(
+        csv_path if write_csv else None,
+        output_format,
+        schema=result_schema(higher_order),
+        batch_rows=chunk_size,
+    )
+    runner = ShardedRiskRunner(
+        as_of_date=analysis_date,
+        market_data=market_data,
+        logger=logger,
+        workers=workers,
+        higher_order=higher_order,
+        verbose=verbose,
+        result_cache=result_cache,
+    )
+    with sink, runner:
+        shards = runner.run(iter_portfolio_chunks(portfolio_path, chunk_size))
+        while True:
+            with profiler.stage("pricing"):
+                df = next(shards, None)
+            if df is None:
+                break
+            with profiler.stage("output_write"):
+                sink.write(df)
+            n_positions += df.height
+            logger.info(f"Processed {n_positions} positions.")
 
     if write_csv:
-        output_data = {"instrument_details": instrument_dict, "risk_metrics": risk}
-        write_output_to_csv(data=output_data, csv_path=csv_path)
-        logger.info(f"Risk mode output written to CSV at: {csv_path}")
+        logger.info(f"Risk mode output for {n_positions} positions at: {csv_path}")
+
+
+def history_dates(
+    json_path: Union[str, Path],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    dates: Optional[Sequence[str]] = None,
+    logger: Optional[Logger] = None,
+) -> List[datetime]:
+    """
+    Resolve the as-of dates of a historical run: either an explicit list of
+    YYYYMMDD dates, or every calendar day from start_date to end_date
+    inclusive. Dates without a `<json_path>/<date>.json` market data file are
+    skipped.
+    """
+    if dates:
+        candidates = sorted({datetime.strptime(d, "%Y%m%d") for d in dates})
+    elif start_date and end_date:
+        start = datetime.strptime(start_date, "%Y%m%d")
+        end = datetime.strptime(end_date, "%Y%m%d")
+        candidates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    else:
+        raise ValueError("Either a list of dates or a start and end date is required.")
+
+    available = [
+        date
+        for date in candidates
+        if (Path(json_path) / f"{date.strftime('%Y%m%d')}.json").exists()
+    ]
+    if logger and len(available) < len(candidates):
+        logger.info(
+            f"Skipping {len(candidates) - len(available)} dates with no market data."
+        )
+    return available
+
+
+def risk_mode_history_main(
+    verbose: str,
+    json_path: Union[str, Path],
+    write_csv: bool,
+    csv_path: str,
+    instrument: Optional[Dict[str, Any]] = None,
+    portfolio_path: Optional[Union[str, Path]] = None,
+    chunk_size: int = 10_000,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    dates: Optional[Sequence[str]] = None,
+    output_format: str = "CSV",
+    higher_order: Sequence[str] = (),
+    result_cache: Optional["ResultCache"] = None,
+    memory_rows: int = 1_000_000,
+) -> None:
+    """
+    Run RISK mode for one instrument or a portfolio over several as-of dates
+    (resolved by history_dates()) in one process and write a single time
+    series, keyed by an as_of_date column, to `csv_path` (or to stdout)
+    through a ResultSink.
+
+    The portfolio is parsed once, by a PortfolioChunks that reuses the
+    parsed chunks for every date (spilling them to a temporary file for
+    books of more than `memory_rows` instruments), and the next date's
+    market data is loaded on a background thread while the current date is
+    being priced. Positions that expired before a given date are left out of
+    that date's output, as by Option.is_expired(); options expiring on the
+    date are still priced.
+    Positions found in `result_cache` are not repriced.
+    """
+    import polars as pl
+    from python_quant.utils.portfolio import PortfolioChunks
+    from python_quant.utils.result_sink import ResultSink, result_schema
+
+    logger = mode_logger(verbose)
+    as_of_dates = history_dates(json_path, start_date, end_date, dates, logger)
+    if not portfolio_path and not instrument:
+        raise ValueError("An instrument or a portfolio is required for RISK mode.")
+    logger.info(f"Starting historical RISK mode over {len(as_of_dates)} dates.")
+
+    book = (
+        PortfolioChunks(portfolio_path, chunk_size, memory_rows)
+        if portfolio_path
+        else nullcontext([[instrument]])
+    )
+
+    def load(date: datetime):
+        return cached_json_market_data_loader(
+            analysis_date=date, logger=logger, json_path=json_path
+        )
+
+    n_rows = 0
+    higher_order = resolve_greek_names(higher_order)
+    sink = ResultSink(
+        csv_path if write_csv else None,
+        output_format,
+        schema={"as_of_date": pl.Utf8, **result_schema(higher_order)},
+        batch_rows=chunk_size,
+    )
+    with sink, book as chunks, ThreadPoolExecutor(max_workers=1) as prefetch:
+        pending = prefetch.submit(load, as_of_dates[0]) if as_of_dates else None
+        for i, analysis_date in enumerate(as_of_dates):
+            snapshot = pending.result()  # type: ignore[union-attr]
+            if i + 1 < len(as_of_dates):
+                pending = prefetch.submit(load, as_of_dates[i + 1])
+
+            date_str = analysis_date.strftime("%Y%m%d")
+            market_data = snapshot.get(date_str, {})
+            logger.info(f"Pricing RISK as of date: {analysis_date}")
+            for instruments in chunks:
+                live = [i for i in instruments if str(i["expiry"]) >= date_str]
+                if not live:
+                    continue
+                df = risk_mode_batch(
+                    instruments=live,
+                    as_of_date=analysis_date,
+                    market_data=market_data,
+                    logger=logger,
+                    higher_order=higher_order,
+                    result_cache=result_cache,
+                )
+                sink.write(df.with_columns(pl.lit(date_str).alias("as_of_date")))
+                n_rows += len(live)
+
+    if write_csv:
+        logger.info(f"Historical risk output ({n_rows} rows) written to: {csv_path}")
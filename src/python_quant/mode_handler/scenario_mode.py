@@ -0,0 +1,211 @@
+from collections.abc import Mapping
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+import sys
+import numpy as np
+import polars as pl
+from python_quant.instrument.option import Option
+from python_quant.market_data.cache import cached_json_market_data_loader
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    european_volatility,
+    option_arrays,
+    option_from_instrument,
+)
+from python_quant.mode_handler.risk_mode import mode_logger
+from python_quant.pricers.bsm_batch import BSMBatchPricer
+from python_quant.utils.portfolio import iter_portfolio_chunks
+
+SCENARIO_GREEKS = ("price", "pnl", "delta", "gamma", "theta", "rho", "vega")
+
+
+class ScenarioLadder(NamedTuple):
+    """
+    Spot x volatility scenario grid.
+
+    Attributes:
+        spot_shifts: Spot moves, fractions of spot if relative_spot else
+            absolute price moves.
+        vol_shifts: Volatility moves, absolute vol points unless relative_vol.
+        relative_spot: Apply spot shifts multiplicatively.
+        relative_vol: Apply vol shifts multiplicatively.
+    """
+
+    spot_shifts: np.ndarray
+    vol_shifts: np.ndarray
+    relative_spot: bool = True
+    relative_vol: bool = False
+
+
+def _shift_axis(spec: Any) -> np.ndarray:
+    """A list of shifts or a {"start", "stop", "num"} linspace spec."""
+    if isinstance(spec, Mapping):
+        return np.linspace(float(spec["start"]), float(spec["stop"]), int(spec["num"]))
+    return np.asarray(spec, dtype=np.float64)
+
+
+def ladder_from_spec(spec: Dict[str, Any]) -> ScenarioLadder:
+    """
+    Build a ScenarioLadder from its JSON spec, e.g.
+     {
+        "spot_shifts": {"start": -0.1, "stop": 0.1, "num": 21},
+        "vol_shifts": [-0.05, -0.02, 0.0, 0.02, 0.05],
+        "spot_shift_type": "RELATIVE",
+        "vol_shift_type": "ABSOLUTE"
+     }
+    Shift types default to RELATIVE for spot and ABSOLUTE for vol.
+    """
+    return ScenarioLadder(
+        spot_shifts=_shift_axis(spec.get("spot_shifts", [0.0])),
+        vol_shifts=_shift_axis(spec.get("vol_shifts", [0.0])),
+        relative_spot=str(spec.get("spot_shift_type", "RELATIVE")).upper()
+        == "RELATIVE",
+        relative_vol=str(spec.get("vol_shift_type", "ABSOLUTE")).upper() == "RELATIVE",
+    )
+
+
+def scenario_ladder(
+    instruments: List[Dict[str, Any]],
+    as_of_date: datetime,
+    market_data: Dict[str, Any],
+    ladder: ScenarioLadder,
+    logger: Logger,
+) -> pl.DataFrame:
+    """
+    Revalue a batch of European options on every point of a spot x vol
+    ladder in one broadcasted BSM pass.
+
+    Inputs are laid out as (n_options, n_spot, n_vol) so that one
+    BSMBatchPricer evaluates the whole grid. Quoted options are revalued
+    around their implied volatility.
+
+    Returns:
+        pl.DataFrame: One row per (position, spot shift, vol shift), with the
+        shifted spot/vol, PV, PnL against the unshifted PV and greeks.
+    """
+    options: List[Option] = []
+    for instrument in instruments:
+        style = instrument.get("style") or ""
+        if style.upper() != "EUROPEAN":
+            raise NotImplementedError(
+                f"SCENARIO mode not implemented for option style: {style}"
+            )
+        options.append(option_from_instrument(instrument, market_data))
+
+    arrays = option_arrays(options, as_of_date, market_data)
+    volatility, _ = european_volatility(**arrays, logger=logger)
+
+    spot = arrays["spot"][:, None, None]
+    vol = volatility[:, None, None]
+    spot_shifts = ladder.spot_shifts[None, :, None]
+    vol_shifts = ladder.vol_shifts[None, None, :]
+    shocked_spot = (
+        spot * (1.0 + spot_shifts) if ladder.relative_spot else spot + spot_shifts
+    )
+    shocked_vol = np.maximum(
+        vol * (1.0 + vol_shifts) if ladder.relative_vol else vol + vol_shifts, 0.0
+    )
+
+    def pricer(s, v):
+        return BSMBatchPricer(
+            spot=s,
+            strike=arrays["strike"][:, None, None],
+            time_to_maturity=arrays["time_to_maturity"][:, None, None],
+            risk_free_rate=arrays["risk_free_rate"][:, None, None],
+            dividend_yield=arrays["dividend_yield"][:, None, None],
+            volatility=v,
+            cp_flag=arrays["cp_flag"][:, None, None],
+        )
+
+    grid = pricer(shocked_spot, shocked_vol).greeks()
+    grid["pnl"] = grid["price"] - pricer(spot, vol).price()
+    grid["spot"] = shocked_spot
+    grid["volatility"] = shocked_vol
+
+    n, n_spot, n_vol = len(options), ladder.spot_shifts.size, ladder.vol_shifts.size
+    shape = (n, n_spot, n_vol)
+    columns: Dict[str, Any] = {
+        "position": np.repeat(np.arange(n), n_spot * n_vol),
+        "underlying_ticker": np.repeat(
+            [option.underlying["symbol"] for option in options], n_spot * n_vol
+        ),
+        "strike_price": np.repeat(arrays["strike"], n_spot * n_vol),
+        "expiration_date": np.repeat(
+            [option.expiration_date.strftime("%Y-%m-%d") for option in options],
+            n_spot * n_vol,
+        ),
+        "call_put": np.repeat(
+            [option.call_put.value for option in options], n_spot * n_vol
+        ),
+        "spot_shift": np.broadcast_to(spot_shifts, shape).ravel(),
+        "vol_shift": np.broadcast_to(vol_shifts, shape).ravel(),
+        "spot": np.broadcast_to(grid["spot"], shape).ravel(),
+        "volatility": np.broadcast_to(grid["volatility"], shape).ravel(),
+    }
+    for key in SCENARIO_GREEKS:
+        columns[key] = np.broadcast_to(grid[key], shape).ravel()
+    return pl.DataFrame(columns)
+
+
+def scenario_mode_main(
+    scenario: Dict[str, Any],
+    as_of_date: str,
+    verbose: str,
+    json_path: Union[str, Path],
+    write_csv: bool,
+    csv_path: str,
+    instrument: Optional[Dict[str, Any]] = None,
+    portfolio_path: Optional[Union[str, Path]] = None,
+    chunk_size: int = 10_000,
+) -> None:
+    """
+    Run a spot x vol scenario ladder for one instrument or a portfolio and
+    write the tidy ladder frame to `csv_path` (or to stdout as CSV), one
+    batch of positions at a time.
+    """
+    logger = mode_logger(verbose, name="pyquant.scenario_mode")
+    analysis_date = datetime.strptime(as_of_date, "%Y%m%d")
+    ladder = ladder_from_spec(scenario)
+    logger.info(
+        f"Starting SCENARIO mode with a {ladder.spot_shifts.size} x "
+        f"{ladder.vol_shifts.size} ladder as of date: {analysis_date}"
+    )
+    market_data = cached_json_market_data_loader(
+        analysis_date=analysis_date, logger=logger, json_path=json_path
+    ).get(as_of_date, {})
+
+    if portfolio_path:
+        chunks = iter_portfolio_chunks(portfolio_path, chunk_size)
+    elif instrument:
+        chunks = iter([[instrument]])
+    else:
+        raise ValueError("An instrument or a portfolio is required for SCENARIO mode.")
+
+    if write_csv:
+        csv_file = Path(csv_path)
+        csv_file.parent.mkdir(parents=True, exist_ok=True)
+        output = csv_file.open("wb")
+    else:
+        output = sys.stdout.buffer
+
+    n_positions = 0
+    try:
+        for instruments in chunks:
+            df = scenario_ladder(
+                instruments=instruments,
+                as_of_date=analysis_date,
+                market_data=market_data,
+                ladder=ladder,
+                logger=logger,
+            )
+            df = df.with_columns(pl.col("position") + n_positions)
+            df.write_csv(output, include_header=n_positions == 0)
+            output.flush()
+            n_positions += len(instruments)
+    finally:
+        if write_csv:
+            output.close()
+
+    if write_csv:
+        logger.info(f"Scenario output for {n_positions} positions at: {csv_path}")
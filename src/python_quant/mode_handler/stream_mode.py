@@ -0,0 +1,450 @@
+import asyncio
+import inspect
+import json
+import sys
+from collections import deque
+from contextlib import suppress
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+import numpy as np
+import polars as pl
+from python_quant.market_data.cache import cached_json_market_data_loader, thaw
+from python_quant.mode_handler.risk_mode import mode_logger, risk_mode_batch
+from python_quant.pricers.bsm_batch import resolve_greek_names
+from python_quant.utils.portfolio import iter_portfolio_chunks
+from python_quant.utils.profiling import get_profiler
+from python_quant.utils.result_sink import ResultSink, result_schema
+
+# Prefix of a --stream source that listens on a Unix socket, e.g. unix:/tmp/ticks
+UNIX_SOCKET_PREFIX = "unix:"
+
+
+class MarketUpdate(NamedTuple):
+    """
+    One market data tick for an underlying.
+
+    Attributes:
+        symbol: Underlying symbol, a key of the market data.
+        spot_price: New spot, None to keep the current one.
+        volatility: New flat volatility, None to keep the current one.
+            Underlyings priced off a vol surface keep their surface.
+        received: perf_counter() time at which the tick entered the
+            process, where its tick-to-risk latency starts. 0.0 is stamped
+            with the submission time.
+    """
+
+    symbol: str
+    spot_price: Optional[float] = None
+    volatility: Optional[float] = None
+    received: float = 0.0
+
+    @classmethod
+    def from_json(cls, line: Union[str, bytes]) -> "MarketUpdate":
+        """
+        Parse a JSON tick such as {"symbol": "AAPL", "spot_price": 273.5}.
+
+        Raises:
+            ValueError: If the tick has no symbol, no spot or volatility, or
+            a non-positive spot or negative volatility.
+        """
+        received = perf_counter()
+        data = json.loads(line)
+        if not isinstance(data, dict) or not data.get("symbol"):
+            raise ValueError(f"Market update without a symbol: {data}")
+        spot_price = data.get("spot_price")
+        volatility = data.get("volatility")
+        if spot_price is None and volatility is None:
+            raise ValueError(f"Market update without spot or volatility: {data}")
+        if spot_price is not None and float(spot_price) <= 0.0:
+            raise ValueError(f"Spot price must be positive: {data}")
+        if volatility is not None and float(volatility) < 0.0:
+            raise ValueError(f"Volatility must be non-negative: {data}")
+        return cls(
+            symbol=str(data["symbol"]),
+            spot_price=None if spot_price is None else float(spot_price),
+            volatility=None if volatility is None else float(volatility),
+            received=received,
+        )
+
+    def merge(self, newer: "MarketUpdate") -> "MarketUpdate":
+        """Coalesce a later tick into this one: latest values, first arrival."""
+        spot_price, volatility = newer.spot_price, newer.volatility
+        return MarketUpdate(
+            symbol=self.symbol,
+            spot_price=self.spot_price if spot_price is None else spot_price,
+            volatility=self.volatility if volatility is None else volatility,
+            received=min(self.received, newer.received),
+        )
+
+
+class RiskUpdate(NamedTuple):
+    """
+    Risk published to subscribers after one repricing.
+
+    Attributes:
+        symbols: Underlyings whose ticks triggered the repricing.
+        positions: Indices, into the repricer's instruments, of the rows of
+            `risk`.
+        risk: One row per repriced position, as in RISK mode output.
+        latency: Tick-to-risk latency of the oldest coalesced tick, seconds.
+    """
+
+    symbols: Tuple[str, ...]
+    positions: np.ndarray
+    risk: pl.DataFrame
+    latency: float
+
+
+class LatencyStats:
+    """
+    Tick-to-risk latencies of a stream. Percentiles are taken over the most
+    recent `max_samples` latencies; the count covers the whole stream.
+    """
+
+    def __init__(self, max_samples: int = 100_000) -> None:
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> Dict[str, float]:
+        """Count and mean/p50/p90/p99/max latency in milliseconds."""
+        if not self.samples:
+            return {"count": 0}
+        samples = np.fromiter(self.samples, dtype=float) * 1e3
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+        return {
+            "count": self.count,
+            "mean_ms": float(samples.mean()),
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p99_ms": float(p99),
+            "max_ms": float(samples.max()),
+        }
+
+
+def _parse_line(line: Union[str, bytes], logger: Logger) -> Optional[MarketUpdate]:
+    """Parse one JSON tick; blank and malformed lines are skipped."""
+    if not line.strip():
+        return None
+    try:
+        return MarketUpdate.from_json(line)
+    except (ValueError, TypeError) as error:
+        logger.warning("Skipping market update %r: %s", line, error)
+        return None
+
+
+async def queue_source(
+    queue: "asyncio.Queue[Optional[MarketUpdate]]",
+) -> AsyncIterator[MarketUpdate]:
+    """In-process feed: yields the updates put on `queue` until a None."""
+    while (update := await queue.get()) is not None:
+        yield update
+
+
+async def file_tail_source(
+    path: Union[str, Path],
+    logger: Logger,
+    poll_interval: float = 0.05,
+    idle_timeout: Optional[float] = None,
+    from_start: bool = True,
+) -> AsyncIterator[MarketUpdate]:
+    """
+    Follow a JSON lines file of ticks like `tail -f`, polling for appended
+    lines every `poll_interval` seconds. A line is only parsed once its
+    newline has been written. Ends after `idle_timeout` seconds without a
+    new line, or runs until cancelled if None.
+    """
+    with open(path, "rb") as ticks:
+        if not from_start:
+            ticks.seek(0, 2)
+        partial = b""
+        idle = 0.0
+        while True:
+            line = ticks.readline()
+            if line.endswith(b"\n"):
+                update = _parse_line(partial + line, logger)
+                partial, idle = b"", 0.0
+                if update is not None:
+                    yield update
+                continue
+            partial += line
+            if idle_timeout is not None and idle >= idle_timeout:
+                return
+            await asyncio.sleep(poll_interval)
+            idle += poll_interval
+
+
+async def unix_socket_source(
+    path: Union[str, Path],
+    logger: Logger,
+    idle_timeout: Optional[float] = None,
+) -> AsyncIterator[MarketUpdate]:
+    """
+    Listen on a Unix socket at `path`; every connected client writes JSON
+    lines of ticks. Ends after `idle_timeout` seconds without a tick, or
+    runs until cancelled if None. The socket file is removed on exit.
+    """
+    updates: "asyncio.Queue[MarketUpdate]" = asyncio.Queue()
+
+    async def read_client(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            async for line in reader:
+                update = _parse_line(line, logger)
+                if update is not None:
+                    updates.put_nowait(update)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(read_client, path=str(path))
+    logger.info(f"Listening for market updates on {path}")
+    try:
+        while True:
+            try:
+                yield await asyncio.wait_for(updates.get(), idle_timeout)
+            except TimeoutError:
+                return
+    finally:
+        server.close()
+        with suppress(FileNotFoundError):
+            Path(path).unlink()
+
+
+def open_stream_source(
+    stream: str, logger: Logger, idle_timeout: Optional[float] = None
+) -> AsyncIterator[MarketUpdate]:
+    """Tick source of a --stream argument: `unix:<path>` or a file to tail."""
+    if stream.startswith(UNIX_SOCKET_PREFIX):
+        return unix_socket_source(
+            stream[len(UNIX_SOCKET_PREFIX) :], logger, idle_timeout=idle_timeout
+        )
+    return file_tail_source(stream, logger, idle_timeout=idle_timeout)
+
+
+class StreamingRepricer:
+    """
+    Keeps the risk of a book current as market updates arrive.
+
+    Ticks are coalesced per underlying: while a repricing runs, further
+    ticks on the same underlying are merged into one pending update (latest
+    values, earliest arrival), so a burst costs one repricing however many
+    ticks it holds. Each cycle applies the pending updates to the
+    repricer's own copy of the market data and reprices only the positions
+    on the updated underlyings, in one risk_mode_batch() on a worker thread
+    so that the event loop keeps reading ticks meanwhile. The result is
+    published to every subscriber as a RiskUpdate, and its tick-to-risk
+    latency is recorded in `latency`.
+
+    Args:
+        instruments: Option instruments of the book.
+        market_data: Market data snapshot to start from; it is copied.
+        higher_order: Extra greeks, as in RISK mode.
+    """
+
+    def __init__(
+        self,
+        instruments: Sequence[Dict[str, Any]],
+        as_of_date: datetime,
+        market_data: Mapping[str, Any],
+        logger: Logger,
+        higher_order: Sequence[str] = (),
+    ) -> None:
+        self.instruments = list(instruments)
+        self.as_of_date = as_of_date
+        self.market_data: Dict[str, Any] = thaw(market_data)
+        self.logger = logger
+        self.higher_order = resolve_greek_names(higher_order)
+        symbols = np.array([i["underlying"]["symbol"] for i in self.instruments])
+        self.positions: Dict[str, np.ndarray] = {
+            str(symbol): np.flatnonzero(symbols == symbol)
+            for symbol in np.unique(symbols)
+        }
+        self.subscribers: List[Callable[[RiskUpdate], Any]] = []
+        self.latency = LatencyStats()
+        self.ticks = 0
+        self.repricings = 0
+        self._pending: Dict[str, MarketUpdate] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def subscribe(self, callback: Callable[[RiskUpdate], Any]) -> None:
+        """Publish every RiskUpdate to `callback`, which may be a coroutine."""
+        self.subscribers.append(callback)
+
+    def submit(self, update: MarketUpdate) -> None:
+        """Queue a tick, coalescing it with any pending one on its underlying."""
+        self.ticks += 1
+        get_profiler().count("stream_ticks")
+        if update.symbol not in self.positions:
+            self.logger.debug("No positions on %s, tick ignored.", update.symbol)
+            return
+        if not update.received:
+            update = update._replace(received=perf_counter())
+        pending = self._pending.get(update.symbol)
+        self._pending[update.symbol] = (
+            update if pending is None else pending.merge(update)
+        )
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def reprice(self, symbols: Sequence[str]) -> Tuple[np.ndarray, pl.DataFrame]:
+        """
+        Risk of the positions on `symbols` at the current market data.
+
+        Returns:
+            tuple: Position indices, and one RISK mode output row per
+            position.
+        """
+        positions = np.concatenate([self.positions[symbol] for symbol in symbols])
+        with get_profiler().stage("stream_reprice"):
+            risk = risk_mode_batch(
+                instruments=[self.instruments[i] for i in positions],
+                as_of_date=self.as_of_date,
+                market_data=self.market_data,
+                logger=self.logger,
+                higher_order=self.higher_order,
+            )
+        return positions, risk
+
+    def _apply(self, update: MarketUpdate) -> None:
+        ticker_data = dict(self.market_data[update.symbol])
+        if update.spot_price is not None:
+            ticker_data["spot_price"] = update.spot_price
+        if update.volatility is not None:
+            ticker_data["volatility"] = update.volatility
+        self.market_data[update.symbol] = ticker_data
+
+    async def _publish(self, updates: Dict[str, MarketUpdate]) -> None:
+        for update in updates.values():
+            self._apply(update)
+        symbols = tuple(updates)
+        try:
+            positions, risk = await asyncio.to_thread(self.reprice, symbols)
+        except Exception:
+            self.logger.exception("Repricing after ticks on %s failed.", symbols)
+            return
+        self.repricings += 1
+        latency = perf_counter() - min(u.received for u in updates.values())
+        self.latency.record(latency)
+        risk_update = RiskUpdate(symbols, positions, risk, latency)
+        for callback in self.subscribers:
+            result = callback(risk_update)
+            if inspect.isawaitable(result):
+                await result
+
+    async def run(self, source: AsyncIterator[MarketUpdate]) -> None:
+        """
+        Consume `source` until it ends, publishing coalesced repricings;
+        ticks still pending when it ends are repriced before returning.
+        """
+        self._wakeup = asyncio.Event()
+        source_done = False
+
+        async def ingest() -> None:
+            nonlocal source_done
+            try:
+                async for update in source:
+                    self.submit(update)
+            finally:
+                source_done = True
+                self._wakeup.set()  # type: ignore[union-attr]
+
+        task = asyncio.create_task(ingest())
+        try:
+            while self._pending or not source_done:
+                if not self._pending:
+                    await self._wakeup.wait()
+                    self._wakeup.clear()
+                    continue
+                updates, self._pending = self._pending, {}
+                await self._publish(updates)
+        finally:
+            if not task.done():
+                task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+            self._wakeup = None
+
+
+def stream_mode_main(
+    as_of_date: str,
+    verbose: str,
+    json_path: Union[str, Path],
+    write_csv: bool,
+    csv_path: str,
+    stream: str,
+    instrument: Optional[Dict[str, Any]] = None,
+    portfolio_path: Optional[Union[str, Path]] = None,
+    chunk_size: int = 10_000,
+    idle_timeout: Optional[float] = None,
+    output_format: str = "CSV",
+    higher_order: Sequence[str] = (),
+) -> None:
+    """
+    Stream RISK mode output for one instrument or a portfolio as ticks
+    arrive from `stream` (see open_stream_source()). The risk of the whole
+    book is written first, then the repriced rows after every coalesced
+    update, through a ResultSink that flushes on every write. Runs until
+    the source ends (see `idle_timeout`) or is interrupted, then reports the
+    tick-to-risk latency on stderr.
+    """
+    logger = mode_logger(verbose, name="pyquant.stream_mode")
+    analysis_date = datetime.strptime(as_of_date, "%Y%m%d")
+    with get_profiler().stage("market_data"):
+        market_data = cached_json_market_data_loader(
+            analysis_date=analysis_date, logger=logger, json_path=json_path
+        ).get(as_of_date, {})
+
+    if portfolio_path:
+        instruments = [
+            i
+            for chunk in iter_portfolio_chunks(portfolio_path, chunk_size)
+            for i in chunk
+        ]
+    elif instrument:
+        instruments = [instrument]
+    else:
+        raise ValueError("An instrument or a portfolio is required for STREAM mode.")
+
+    repricer = StreamingRepricer(
+        instruments, analysis_date, market_data, logger, higher_order
+    )
+    sink = ResultSink(
+        csv_path if write_csv else None,
+        output_format,
+        schema=result_schema(repricer.higher_order),
+        batch_rows=1,
+    )
+    with sink:
+        sink.write(repricer.reprice(list(repricer.positions))[1])
+        repricer.subscribe(lambda update: sink.write(update.risk))
+        source = open_stream_source(stream, logger, idle_timeout)
+        with suppress(KeyboardInterrupt):
+            asyncio.run(repricer.run(source))
+
+    summary = repricer.latency.summary()
+    print(
+        f"\t{repricer.ticks} ticks, {repricer.repricings} repricings, "
+        "tick-to-risk latency (ms): "
+        + ", ".join(f"{k}={v:.3f}" for k, v in summary.items() if k != "count"),
+        file=sys.stderr,
+    )
@@ -0,0 +1,418 @@
+from collections.abc import Mapping
+from datetime import datetime
+from logging import Logger, INFO
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from python_quant.instrument.option import Option
+from python_quant.market_data.curves import rates_to_maturity
+from python_quant.pricers.implied_vol import (
+    ImpliedVolResult,
+    model_implied_volatility,
+)
+
+VOL_BUMP = 1e-4
+RATE_BUMP = 1e-4
+
+
+def _peizer_pratt(z: NDArray[np.float64], n: int) -> NDArray[np.float64]:
+    """Peizer-Pratt method 2 inversion used by the Leisen-Reimer tree."""
+    x = z / (n + 1.0 / 3.0 + 0.1 / (n + 1.0))
+    return 0.5 + np.sign(z) * 0.5 * np.sqrt(1.0 - np.exp(-x * x * (n + 1.0 / 6.0)))
+
+
+def _tree_parameters(
+    spot: float,
+    strike: NDArray[np.float64],
+    t: float,
+    r: float,
+    d: float,
+    vol: NDArray[np.float64],
+    steps: int,
+    method: str,
+) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """Up factor, down factor and up probability for every strike."""
+    dt = t / steps
+    growth = np.exp((r - d) * dt)
+    match method.upper():
+        case "CRR":
+            u = np.exp(vol * np.sqrt(dt))
+            dn = 1.0 / u
+            p = (growth - dn) / (u - dn)
+        case "LR":
+            sigma_sqrt_t = vol * np.sqrt(t)
+            d1 = (
+                np.log(spot / strike) + (r - d) * t
+            ) / sigma_sqrt_t + 0.5 * sigma_sqrt_t
+            d2 = d1 - sigma_sqrt_t
+            p = _peizer_pratt(d2, steps)
+            u = growth * _peizer_pratt(d1, steps) / p
+            dn = (growth - p * u) / (1.0 - p)
+        case _:
+            raise ValueError(f"Unsupported binomial tree method: {method}")
+    return u, dn, p
+
+
+def _exercise_schedule(
+    steps: int, t: float, exercise: str, exercise_times: Optional[Sequence[float]]
+) -> NDArray[np.bool_]:
+    """Boolean mask over tree steps 0..steps-1 where early exercise is allowed."""
+    schedule = np.zeros(steps, dtype=bool)
+    match exercise.upper():
+        case "AMERICAN":
+            schedule[:] = True
+        case "BERMUDAN":
+            if exercise_times:
+                idx = np.rint(np.asarray(exercise_times) / t * steps).astype(int)
+                schedule[idx[(idx >= 0) & (idx < steps)]] = True
+        case "EUROPEAN":
+            pass
+        case _:
+            raise ValueError(f"Unsupported exercise style: {exercise}")
+    return schedule
+
+
+def binomial_tree(
+    spot: float,
+    strike: ArrayLike,
+    time_to_maturity: float,
+    risk_free_rate: float,
+    dividend_yield: float,
+    volatility: ArrayLike,
+    cp_flag: ArrayLike,
+    steps: int = 201,
+    method: str = "LR",
+    exercise: str = "AMERICAN",
+    exercise_times: Optional[Sequence[float]] = None,
+) -> Dict[str, NDArray[np.float64]]:
+    """
+    Price a vector of options sharing one underlying and expiry on a
+    recombining binomial tree.
+
+    Every strike is a row of a single (n_strikes, steps + 1) value array that
+    is rolled back in place, one vectorized update per time step, so memory is
+    O(steps) per strike. Calls and puts, and per-strike volatilities, can be
+    mixed in one build. Delta, gamma and theta are read off the first two
+    levels of the tree.
+
+    Args:
+        spot: Spot price of the underlying.
+        strike: Strike prices.
+        time_to_maturity: Year fraction to the shared expiry.
+        risk_free_rate: Continuously compounded risk-free rate.
+        dividend_yield: Continuously compounded dividend yield.
+        volatility: Volatilities, scalar or one per strike.
+        cp_flag: 1.0 for calls, -1.0 for puts, scalar or one per strike.
+        steps: Number of time steps (rounded up to odd for Leisen-Reimer).
+        method: "CRR" (Cox-Ross-Rubinstein) or "LR" (Leisen-Reimer).
+        exercise: "AMERICAN", "BERMUDAN" or "EUROPEAN".
+        exercise_times: Year fractions of the Bermudan exercise dates.
+
+    Returns:
+        Dict[str, NDArray[np.float64]]: price, delta, gamma and theta per strike.
+    """
+    K, vol, cp = (
+        np.asarray(x, dtype=np.float64)
+        for x in np.broadcast_arrays(
+            np.atleast_1d(strike), np.atleast_1d(volatility), np.atleast_1d(cp_flag)
+        )
+    )
+    t = float(time_to_maturity)
+    r = float(risk_free_rate)
+    if method.upper() == "LR" and steps % 2 == 0:
+        steps += 1
+    if steps < 3:
+        raise ValueError("Binomial tree requires at least 3 steps.")
+
+    u, dn, p = _tree_parameters(spot, K, t, r, dividend_yield, vol, steps, method)
+    disc = np.exp(-r * t / steps)
+    q_up = (disc * p)[:, None]
+    q_down = (disc * (1.0 - p))[:, None]
+    schedule = _exercise_schedule(steps, t, exercise, exercise_times)
+
+    # Spot at node j of step i is spot * dn**i * (u / dn)**j
+    ratio = np.exp(np.log(u / dn)[:, None] * np.arange(steps + 1))
+    K_col = K[:, None]
+    cp_col = cp[:, None]
+
+    values = spot * dn[:, None] ** steps * ratio
+    values -= K_col
+    values *= cp_col
+    np.maximum(values, 0.0, out=values)
+    scratch = np.empty_like(values)
+
+    levels: Dict[int, NDArray[np.float64]] = {}
+    for i in range(steps - 1, -1, -1):
+        v = values[:, : i + 1]
+        s = scratch[:, : i + 1]
+        np.multiply(values[:, 1 : i + 2], q_up, out=s)
+        v *= q_down
+        v += s
+        if schedule[i]:
+            np.multiply(ratio[:, : i + 1], (spot * dn**i)[:, None], out=s)
+            s -= K_col
+            s *= cp_col
+            np.maximum(v, s, out=v)
+        if i <= 2:
+            levels[i] = v.copy()
+
+    s1 = spot * np.stack([dn, u], axis=1)
+    s2 = spot * np.stack([dn * dn, u * dn, u * u], axis=1)
+    v0, v1, v2 = levels[0][:, 0], levels[1], levels[2]
+
+    delta = (v1[:, 1] - v1[:, 0]) / (s1[:, 1] - s1[:, 0])
+    delta_up = (v2[:, 2] - v2[:, 1]) / (s2[:, 2] - s2[:, 1])
+    delta_down = (v2[:, 1] - v2[:, 0]) / (s2[:, 1] - s2[:, 0])
+    gamma = (delta_up - delta_down) / (0.5 * (s2[:, 2] - s2[:, 0]))
+    # The middle node of step 2 is only at spot for CRR; correct for the
+    # spot offset with the tree delta/gamma before differencing in time.
+    ds = s2[:, 1] - spot
+    theta = (v2[:, 1] - delta * ds - 0.5 * gamma * ds * ds - v0) / (2.0 * t / steps)
+
+    return {"price": v0, "delta": delta, "gamma": gamma, "theta": theta}
+
+
+def binomial_implied_volatility(
+    market_price: ArrayLike,
+    spot: float,
+    strike: ArrayLike,
+    time_to_maturity: float,
+    risk_free_rate: float,
+    dividend_yield: float,
+    cp_flag: ArrayLike,
+    steps: int = 201,
+    method: str = "LR",
+    exercise: str = "AMERICAN",
+    exercise_times: Optional[Sequence[float]] = None,
+    tol: float = 1e-8,
+    max_iterations: int = 50,
+) -> ImpliedVolResult:
+    """
+    Solve tree implied volatilities for a strike vector sharing one expiry.
+
+    Starts from the European implied volatility and takes Newton steps with
+    a central-difference tree vega, safeguarded by a per-strike bracket as in
+    implied_volatility(). Each iteration prices the base and both bumped
+    volatilities for all unconverged strikes in a single tree build.
+    """
+    return model_implied_volatility(
+        market_price,
+        spot,
+        strike,
+        time_to_maturity,
+        risk_free_rate,
+        dividend_yield,
+        cp_flag,
+        pricer=lambda K, vol, cp: binomial_tree(
+            spot,
+            K,
+            time_to_maturity,
+            risk_free_rate,
+            dividend_yield,
+            vol,
+            cp,
+            steps=steps,
+            method=method,
+            exercise=exercise,
+            exercise_times=exercise_times,
+        )["price"],
+        exercise=exercise,
+        vol_bump=VOL_BUMP,
+        tol=tol,
+        max_iterations=max_iterations,
+    )
+
+
+def binomial_tree_risk(
+    spot: float,
+    strike: ArrayLike,
+    time_to_maturity: float,
+    risk_free_rate: float,
+    dividend_yield: float,
+    volatility: ArrayLike,
+    cp_flag: ArrayLike,
+    steps: int = 201,
+    method: str = "LR",
+    exercise: str = "AMERICAN",
+    exercise_times: Optional[Sequence[float]] = None,
+) -> Dict[str, NDArray[np.float64]]:
+    """
+    Full risk for a strike vector in the same shape as BSMPricer.greeks().
+
+    Price, delta, gamma and theta come from one tree build; vega and rho are
+    not available from the tree itself and are taken from central bumps, all
+    bumped scenarios being stacked into a second single build.
+    """
+    K, vol, cp = (
+        np.asarray(x, dtype=np.float64)
+        for x in np.broadcast_arrays(
+            np.atleast_1d(strike), np.atleast_1d(volatility), np.atleast_1d(cp_flag)
+        )
+    )
+    kwargs = dict(
+        steps=steps, method=method, exercise=exercise, exercise_times=exercise_times
+    )
+    base = binomial_tree(
+        spot, K, time_to_maturity, risk_free_rate, dividend_yield, vol, cp, **kwargs
+    )
+
+    m = K.size
+    vol_bumped = binomial_tree(
+        spot,
+        np.tile(K, 2),
+        time_to_maturity,
+        risk_free_rate,
+        dividend_yield,
+        np.concatenate([vol + VOL_BUMP, vol - VOL_BUMP]),
+        np.tile(cp, 2),
+        **kwargs,
+    )["price"]
+    rate_up, rate_down = (
+        binomial_tree(
+            spot,
+            K,
+            time_to_maturity,
+            risk_free_rate + bump,
+            dividend_yield,
+            vol,
+            cp,
+            **kwargs,
+        )["price"]
+        for bump in (RATE_BUMP, -RATE_BUMP)
+    )
+
+    return {
+        "price": base["price"],
+        "implied_volatility": vol,
+        "delta": base["delta"],
+        "gamma": base["gamma"],
+        "theta": base["theta"],
+        "rho": (rate_up - rate_down) / (2.0 * RATE_BUMP),
+        "vega": (vol_bumped[:m] - vol_bumped[m:]) / (2.0 * VOL_BUMP),
+    }
+
+
+class BinomialTreePricer:
+    """
+    Binomial tree pricer for American, Bermudan and European options, with
+    the same interface as BSMPricer.
+    """
+
+    def __init__(
+        self,
+        instrument: Option,
+        as_of_date: datetime,
+        market_data: Dict[str, float],
+        logger: Logger,
+        steps: int = 201,
+        method: str = "LR",
+    ):
+        self.logger = logger
+        self.instrument = instrument
+        self.as_of_date = as_of_date
+        self.steps = steps
+        self.method = method
+
+        ticker_data = market_data[self.instrument.underlying["symbol"]]
+        if isinstance(ticker_data, Mapping):
+            self.spot_price = ticker_data["spot_price"]
+        else:
+            self.spot_price = ticker_data
+
+        self.volatility = instrument.volatility
+        # Zero rates to expiry, from flat rates or curves
+        self.risk_free_rate, self.dividend_yield = rates_to_maturity(
+            market_data, instrument.time_to_maturity(as_of_date)
+        )
+        self.market_price = self.instrument.market_price
+
+        self._input_data_check()
+
+    def _input_data_check(self):
+        if self.spot_price is None:
+            raise ValueError("Spot price is required for binomial tree pricing.")
+        elif self.volatility == 0.0 and self.market_price is None:
+            raise ValueError(
+                "Either volatility or market price is required for binomial "
+                "tree pricing."
+            )
+        elif self.instrument.is_expired(self.as_of_date):
+            raise ValueError("Cannot price an expired option.")
+
+        self.time_to_maturity = self.instrument.time_to_maturity(self.as_of_date)
+        self.cp_flag = 1.0 if self.instrument.call_put == Option.CallPut.CALL else -1.0
+        self.exercise = self.instrument.option_type.name
+        self.exercise_times = [
+            self.instrument.day_count_convention.year_fraction(self.as_of_date, date)
+            for date in self.instrument.exercise_dates or []
+        ]
+
+        self.logger.info(
+            f"Initializing {self.method} binomial tree with {self.steps} steps "
+            f"for {self.exercise} option, time to maturity {self.time_to_maturity}"
+        )
+
+        if self.market_price is not None:
+            self.logger.info("Calculating tree implied volatility from market price.")
+            result = binomial_implied_volatility(
+                market_price=self.market_price,
+                spot=self.spot_price,
+                strike=self.instrument.strike_price,
+                time_to_maturity=self.time_to_maturity,
+                risk_free_rate=self.risk_free_rate,
+                dividend_yield=self.dividend_yield,
+                cp_flag=self.cp_flag,
+                **self._tree_kwargs(),
+            )
+            if result.arbitrage_violation[0]:
+                raise ValueError(
+                    f"Market price {self.market_price} violates no-arbitrage bounds."
+                )
+            if not result.converged[0]:
+                raise ValueError("Tree implied volatility did not converge.")
+            self.volatility = float(result.volatility[0])
+            self.logger.info(f"Tree implied volatility: {self.volatility}")
+
+    def _tree_kwargs(self) -> Dict:
+        return {
+            "steps": self.steps,
+            "method": self.method,
+            "exercise": self.exercise,
+            "exercise_times": self.exercise_times,
+        }
+
+    def price(self) -> float:
+        if self.market_price is not None:
+            return self.market_price
+        return float(
+            binomial_tree(
+                spot=self.spot_price,
+                strike=self.instrument.strike_price,
+                time_to_maturity=self.time_to_maturity,
+                risk_free_rate=self.risk_free_rate,
+                dividend_yield=self.dividend_yield,
+                volatility=self.volatility,
+                cp_flag=self.cp_flag,
+                **self._tree_kwargs(),
+            )["price"][0]
+        )
+
+    def greeks(self) -> Dict[str, float]:
+        risk = binomial_tree_risk(
+            spot=self.spot_price,
+            strike=self.instrument.strike_price,
+            time_to_maturity=self.time_to_maturity,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=self.dividend_yield,
+            volatility=self.volatility,
+            cp_flag=self.cp_flag,
+            **self._tree_kwargs(),
+        )
+        greeks = {key: float(value[0]) for key, value in risk.items()}
+        if self.market_price is not None:
+            greeks["price"] = self.market_price
+
+        if self.logger and self.logger.isEnabledFor(INFO):
+            self.logger.info(f"Calculated Greeks: {greeks}")
+
+        return greeks
@@ -0,0 +1,326 @@
+from typing import Any, Dict, Iterable, Tuple
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+# Greeks beyond the first-order ones, computed only when requested by name
+HIGHER_ORDER_GREEKS = ("vanna", "volga", "charm", "speed", "color", "dividend_rho")
+GREEK_ALIASES = {"vomma": "volga", "phi": "dividend_rho"}
+
+
+def norm_pdf(x: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Standard normal density evaluated elementwise."""
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def norm_cdf(x: ArrayLike) -> NDArray[np.float64]:
+    """
+    Standard normal cdf evaluated elementwise. scipy is imported on the
+    first call, so CLI startup does not pay for it.
+    """
+    from scipy.special import ndtr
+
+    return ndtr(np.asarray(x, dtype=np.float64))
+
+
+def bsm_price(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    time_to_maturity: ArrayLike,
+    risk_free_rate: ArrayLike,
+    dividend_yield: ArrayLike,
+    volatility: ArrayLike,
+    cp_flag: ArrayLike,
+) -> NDArray[np.float64]:
+    """
+    Black-Scholes-Merton prices alone, for price-only runs: no density or
+    greek intermediates are computed. Inputs broadcast as for
+    BSMBatchPricer; options without time value are worth their discounted
+    forward intrinsic value.
+    """
+    S, K, T, r, d, vol, cp = np.broadcast_arrays(
+        *(
+            np.asarray(x, dtype=np.float64)
+            for x in (
+                spot,
+                strike,
+                time_to_maturity,
+                risk_free_rate,
+                dividend_yield,
+                volatility,
+                cp_flag,
+            )
+        )
+    )
+    s_disc_d = S * np.exp(-d * T)
+    k_disc_r = K * np.exp(-r * T)
+    valid = (T > 0) & (vol > 0) & (S > 0)
+    sigma_sqrt_t = np.where(valid, vol * np.sqrt(np.where(valid, T, 1.0)), 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = np.log(s_disc_d / k_disc_r) / sigma_sqrt_t + 0.5 * sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+    price = cp * (
+        s_disc_d * norm_cdf(np.where(valid, cp * d1, 0.0))
+        - k_disc_r * norm_cdf(np.where(valid, cp * d2, 0.0))
+    )
+    return np.where(valid, price, np.maximum(cp * (s_disc_d - k_disc_r), 0.0))
+
+
+def resolve_greek_names(names: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Canonical names of the requested higher-order greeks, in request order
+    and without duplicates (e.g. ["Vomma", "vanna"] -> ("volga", "vanna")).
+    """
+    resolved: list[str] = []
+    for name in names:
+        key = GREEK_ALIASES.get(name.strip().lower(), name.strip().lower())
+        if key not in HIGHER_ORDER_GREEKS:
+            raise ValueError(f"Unsupported greek: {name}")
+        if key not in resolved:
+            resolved.append(key)
+    return tuple(resolved)
+
+
+def higher_order_greeks(
+    names: Tuple[str, ...],
+    spot: Any,
+    time_to_maturity: Any,
+    risk_free_rate: Any,
+    dividend_yield: Any,
+    volatility: Any,
+    cp_flag: Any,
+    d1: Any,
+    d2: Any,
+    pdf_d1: Any,
+    cdf_cp_d1: Any,
+    sqrt_t: Any,
+    discount_d: Any,
+) -> Dict[str, Any]:
+    """
+    Analytic higher-order BSM greeks from the d1/d2, pdf and discount factor
+    of an option that has time value. Only arithmetic is used, so the inputs
+    may be floats or equally shaped arrays.
+
+    Time derivatives (charm, color) are per year of calendar time, like
+    theta: charm = d(delta)/dt, color = d(gamma)/dt.
+
+    Args:
+        names: Canonical greek names, see resolve_greek_names().
+    """
+    S, T, r, q, cp = spot, time_to_maturity, risk_free_rate, dividend_yield, cp_flag
+    sigma_sqrt_t = volatility * sqrt_t
+    greeks: Dict[str, Any] = {}
+    for name in names:
+        match name:
+            case "vanna":
+                value = -discount_d * pdf_d1 * d2 / volatility
+            case "volga":
+                value = S * discount_d * pdf_d1 * sqrt_t * d1 * d2 / volatility
+            case "charm":
+                value = cp * q * discount_d * cdf_cp_d1 - discount_d * pdf_d1 * (
+                    2.0 * (r - q) * T - d2 * sigma_sqrt_t
+                ) / (2.0 * T * sigma_sqrt_t)
+            case "speed":
+                value = (
+                    -discount_d * pdf_d1 * (d1 + sigma_sqrt_t) / (S * sigma_sqrt_t) ** 2
+                )
+            case "color":
+                value = (
+                    discount_d
+                    * pdf_d1
+                    / (2.0 * S * T * sigma_sqrt_t)
+                    * (
+                        2.0 * q * T
+                        + 1.0
+                        + (2.0 * (r - q) * T - d2 * sigma_sqrt_t) * d1 / sigma_sqrt_t
+                    )
+                )
+            case "dividend_rho":
+                value = -cp * T * S * discount_d * cdf_cp_d1
+            case _:
+                raise ValueError(f"Unsupported greek: {name}")
+        greeks[name] = value
+    return greeks
+
+
+class BSMBatchPricer:
+    """
+    Black-Scholes-Merton pricer over arrays of options.
+
+    All inputs are broadcast against each other, so any mix of scalars and
+    equally shaped arrays is accepted. d1/d2, discount factors and normal
+    cdf/pdf values are computed once in the constructor and shared by
+    price() and greeks().
+
+    Args:
+        spot: Spot prices of the underlyings.
+        strike: Strike prices.
+        time_to_maturity: Year fractions to expiry.
+        risk_free_rate: Continuously compounded risk-free rates.
+        dividend_yield: Continuously compounded dividend yields.
+        volatility: Black-Scholes volatilities.
+        cp_flag: 1.0 for calls, -1.0 for puts.
+    """
+
+    def __init__(
+        self,
+        spot: ArrayLike,
+        strike: ArrayLike,
+        time_to_maturity: ArrayLike,
+        risk_free_rate: ArrayLike,
+        dividend_yield: ArrayLike,
+        volatility: ArrayLike,
+        cp_flag: ArrayLike,
+    ):
+        (
+            self.spot,
+            self.strike,
+            self.time_to_maturity,
+            self.risk_free_rate,
+            self.dividend_yield,
+            self.volatility,
+            self.cp_flag,
+        ) = np.broadcast_arrays(
+            *(
+                np.asarray(x, dtype=np.float64)
+                for x in (
+                    spot,
+                    strike,
+                    time_to_maturity,
+                    risk_free_rate,
+                    dividend_yield,
+                    volatility,
+                    cp_flag,
+                )
+            )
+        )
+        self._compute_intermediates()
+
+    def _compute_intermediates(self) -> None:
+        S = self.spot
+        K = self.strike
+        T = self.time_to_maturity
+        vol = self.volatility
+        cp = self.cp_flag
+
+        # Options with no time value (expired or zero vol) are valued at
+        # their discounted forward intrinsic and have zero second-order risk.
+        self.valid = (T > 0) & (vol > 0) & (S > 0)
+        safe_T = np.where(self.valid, T, 1.0)
+        safe_vol = np.where(self.valid, vol, 1.0)
+        safe_S = np.where(self.valid, S, 1.0)
+
+        self.sqrt_t = np.sqrt(safe_T)
+        self.sigma_sqrt_t = safe_vol * self.sqrt_t
+        self.discount_d = np.exp(-self.dividend_yield * T)
+        self.discount_r = np.exp(-self.risk_free_rate * T)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d1 = (
+                np.log(safe_S / K)
+                + (self.risk_free_rate - self.dividend_yield + 0.5 * safe_vol**2)
+                * safe_T
+            ) / self.sigma_sqrt_t
+        d2 = d1 - self.sigma_sqrt_t
+
+        # Intrinsic limit: d1, d2 -> +/- inf depending on forward moneyness
+        itm = cp * (S * self.discount_d - K * self.discount_r) > 0
+        limit = np.where(itm == (cp > 0), np.inf, -np.inf)
+        self.d1 = np.where(self.valid, d1, limit)
+        self.d2 = np.where(self.valid, d2, limit)
+
+        self.pdf_d1 = np.where(self.valid, norm_pdf(self.d1), 0.0)
+        self.cdf_cp_d1 = norm_cdf(cp * self.d1)
+        self.cdf_cp_d2 = norm_cdf(cp * self.d2)
+
+    def price(self) -> NDArray[np.float64]:
+        """Return BSM prices for every option in the batch."""
+        return self.cp_flag * (
+            self.spot * self.discount_d * self.cdf_cp_d1
+            - self.strike * self.discount_r * self.cdf_cp_d2
+        )
+
+    def greeks(
+        self, higher_order: Iterable[str] = ()
+    ) -> Dict[str, NDArray[np.float64]]:
+        """
+        Compute price and the first-order greeks returned by
+        BSMPricer.greeks(), as arrays in the broadcast shape of the inputs.
+
+        Args:
+            higher_order: Names of HIGHER_ORDER_GREEKS (or GREEK_ALIASES) to
+                add to the result; they reuse the shared d1/d2 and pdf.
+        """
+        S = self.spot
+        K = self.strike
+        T = self.time_to_maturity
+        vol = self.volatility
+        cp = self.cp_flag
+        r = self.risk_free_rate
+        d = self.dividend_yield
+        valid = self.valid
+
+        s_disc_d = S * self.discount_d
+        k_disc_r = K * self.discount_r
+
+        delta = cp * self.discount_d * self.cdf_cp_d1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gamma = np.where(
+                valid, self.discount_d * self.pdf_d1 / (S * self.sigma_sqrt_t), 0.0
+            )
+            vega = np.where(valid, s_disc_d * self.pdf_d1 * self.sqrt_t, 0.0)
+            theta = np.where(
+                T > 0,
+                -(s_disc_d * vol * self.pdf_d1) / (2.0 * self.sqrt_t)
+                - cp * r * k_disc_r * self.cdf_cp_d2
+                + cp * d * s_disc_d * self.cdf_cp_d1,
+                0.0,
+            )
+        rho = np.where(T > 0, cp * k_disc_r * T * self.cdf_cp_d2, 0.0)
+
+        greeks = {
+            "price": self.price(),
+            "implied_volatility": vol,
+            "delta": delta,
+            "gamma": gamma,
+            "theta": theta,
+            "rho": rho,
+            "vega": vega,
+        }
+        names = resolve_greek_names(higher_order)
+        if names:
+            greeks.update(self._higher_order_greeks(names))
+        return greeks
+
+    def _higher_order_greeks(
+        self, names: Tuple[str, ...]
+    ) -> Dict[str, NDArray[np.float64]]:
+        # Evaluated at the safe T/vol of _compute_intermediates, then options
+        # without time value get the limits: only charm and dividend rho
+        # keep their intrinsic delta terms.
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            extra = higher_order_greeks(
+                names,
+                spot=np.where(self.valid, self.spot, 1.0),
+                time_to_maturity=self.sqrt_t * self.sqrt_t,
+                risk_free_rate=self.risk_free_rate,
+                dividend_yield=self.dividend_yield,
+                volatility=self.sigma_sqrt_t / self.sqrt_t,
+                cp_flag=self.cp_flag,
+                d1=self.d1,
+                d2=self.d2,
+                pdf_d1=self.pdf_d1,
+                cdf_cp_d1=self.cdf_cp_d1,
+                sqrt_t=self.sqrt_t,
+                discount_d=self.discount_d,
+            )
+        intrinsic_delta = self.cp_flag * self.discount_d * self.cdf_cp_d1
+        limits = {
+            "charm": self.dividend_yield * intrinsic_delta,
+            "dividend_rho": -self.time_to_maturity * self.spot * intrinsic_delta,
+        }
+        return {
+            name: np.where(self.valid, value, limits.get(name, 0.0))
+            for name, value in extra.items()
+        }
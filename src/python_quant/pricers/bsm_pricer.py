@@ -1,10 +1,29 @@
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Dict
-from scipy.stats import norm
+from typing import Dict, Iterable, Optional
 from python_quant.instrument.option import Option
-from logging import Logger, DEBUG, INFO
-from scipy.optimize import brentq
-from math import log, exp, sqrt
+from python_quant.market_data.curves import rates_to_maturity
+from logging import Logger
+from python_quant.pricers.implied_vol import implied_volatility
+from python_quant.pricers.bsm_batch import higher_order_greeks, resolve_greek_names
+from python_quant.market_data.vol_surface import vol_surface_from_market_data
+from python_quant.utils.profiling import get_profiler
+from python_quant.pricers.intermediates import (
+    DEFAULT_INTERMEDIATE_CACHE,
+    IntermediateCache,
+    MaturityTerms,
+)
+from math import erfc, exp, log, pi, sqrt
+
+_INV_SQRT_2PI = 1.0 / sqrt(2.0 * pi)
+
+
+def _norm_cdf(x: float) -> float:
+    return 0.5 * erfc(-x / sqrt(2.0))
+
+
+def _norm_pdf(x: float) -> float:
+    return _INV_SQRT_2PI * exp(-0.5 * x * x)
 
 
 class BSMPricer:
@@ -14,23 +33,49 @@ class BSMPricer:
         as_of_date: datetime,
         market_data: Dict[str, float],
         logger: Logger,
+        cache: Optional[IntermediateCache] = None,
     ):
         self.logger = logger
         self.instrument = instrument
         self.as_of_date = as_of_date
+        self.cache = cache or DEFAULT_INTERMEDIATE_CACHE
 
         # Get inputs for BSM model from market data
         ticker_data = market_data[self.instrument.underlying["symbol"]]
-        if isinstance(ticker_data, dict):
+        if isinstance(ticker_data, Mapping):
             self.spot_price = ticker_data["spot_price"]
         else:
             self.spot_price = ticker_data
 
         self.volatility = instrument.volatility
-        self.risk_free_rate = float(market_data["risk_free_rate"])
-        self.dividend_yield = float(market_data["dividend_yield"])
+        # Zero rates to expiry, from flat rates or curves
+        self.risk_free_rate, self.dividend_yield = rates_to_maturity(
+            market_data, instrument.time_to_maturity(as_of_date)
+        )
         self.market_price = self.instrument.market_price
 
+        # Maturity, discount factors and forward are shared across the chain
+        self.terms: Optional[MaturityTerms] = None
+        if self.spot_price is not None:
+            self.terms = self.cache.terms(
+                self.instrument,
+                as_of_date,
+                self.spot_price,
+                self.risk_free_rate,
+                self.dividend_yield,
+            )
+
+        # A vol surface on the underlying takes precedence over the flat vol
+        self.vol_surface = vol_surface_from_market_data(ticker_data)
+        if self.vol_surface is not None and self.terms is not None:
+            self.volatility = float(
+                self.vol_surface.volatility(
+                    self.instrument.strike_price,
+                    self.terms.time_to_maturity,
+                    self.spot_price,
+                )
+            )
+
         self._input_data_check()
 
     def _input_data_check(self):
@@ -46,22 +91,23 @@ class BSMPricer:
             raise ValueError("Cannot price an expired option.")
 
         # Calculate some important variables first
-        self.time_to_maturity = self.instrument.time_to_maturity(self.as_of_date)
+        self.time_to_maturity = self.terms.time_to_maturity
         self.cp_flag = 1.0 if self.instrument.call_put == Option.CallPut.CALL else -1.0
 
-        self.logger.info(f"""
-                         Initializing BSM Pricer with the following parameters:
-                         Spot Price: {self.spot_price}
-                         Volatility: {self.volatility}
-                         Strike Price: {self.instrument.strike_price}
-                         Risk-Free Rate: {self.risk_free_rate}
-                         Dividend Yield: {self.dividend_yield}
-                         Market Price: {self.market_price}
-                         Time to Maturity: {self.time_to_maturity}   
-                         Call/Put Flag: {
-            "CALL" if self.cp_flag == 1.0 else "PUT"
-        }                        
-                         """)
+        self.logger.info(
+            "Initializing BSM Pricer with the following parameters: "
+            "Spot Price: %s, Volatility: %s, Strike Price: %s, "
+            "Risk-Free Rate: %s, Dividend Yield: %s, Market Price: %s, "
+            "Time to Maturity: %s, Call/Put Flag: %s",
+            self.spot_price,
+            self.volatility,
+            self.instrument.strike_price,
+            self.risk_free_rate,
+            self.dividend_yield,
+            self.market_price,
+            self.time_to_maturity,
+            "CALL" if self.cp_flag == 1.0 else "PUT",
+        )
 
         if self.market_price is not None:
             self.logger.info("Calculating implied volatility from market price.")
@@ -75,7 +121,7 @@ class BSMPricer:
                 cp_flag=self.cp_flag,
             )
         else:
-            self.logger.info(f"Using provided volatility: {self.volatility}")
+            self.logger.info("Using provided volatility: %s", self.volatility)
             self.market_price = self.price()
 
     def _bsm_price_from_vol(
@@ -87,24 +133,31 @@ class BSMPricer:
         t: float,
         sigma: float,
         cp_flag: float,
+        terms: Optional[MaturityTerms] = None,
     ) -> float:
-        sqrt_t = sqrt(t)
+        if terms is not None:
+            # Precomputed for (t, r, d) by the intermediate cache
+            sqrt_t, discount_d, discount_r = (
+                terms.sqrt_t,
+                terms.discount_d,
+                terms.discount_r,
+            )
+        else:
+            sqrt_t, discount_d, discount_r = sqrt(t), exp(-d * t), exp(-r * t)
         sigma_sqrt_t = sigma * sqrt_t
         d1 = (log(S_o / K) + (r - d + 0.5 * sigma * sigma) * t) / sigma_sqrt_t
         d2 = d1 - sigma_sqrt_t
 
-        cdf = norm.cdf
-        discount_d = exp(-d * t)
-        discount_r = exp(-r * t)
+        cdf = _norm_cdf
 
         opt_price = cp_flag * (
             S_o * discount_d * cdf(cp_flag * d1) - K * discount_r * cdf(cp_flag * d2)
         )  # type: ignore
 
-        if self.logger and DEBUG <= self.logger.getEffectiveLevel():
-            self.logger.debug(
-                f"BSM_PRICE_FROM_VOL: D1={d1}, D2={d2}, Price={opt_price}"
-            )
+        get_profiler().count("bsm_price_evaluations")
+        self.logger.debug(
+            "BSM_PRICE_FROM_VOL: D1=%s, D2=%s, Price=%s", d1, d2, opt_price
+        )
 
         self.d1, self.d2 = d1, d2
         return float(opt_price)
@@ -118,27 +171,47 @@ class BSMPricer:
         t: float,
         market_price: float,
         cp_flag: float,
-        tol: float = 1e-6,
-        max_iterations: int = 100,
+        tol: float = 1e-10,
+        max_iterations: int = 50,
     ) -> float:
-        def objective_function(vol):
-            price = self._bsm_price_from_vol(S_o, K, r, d, t, vol, cp_flag)
-            error = price - market_price
-            self.logger.debug(f"Error using vol={vol}: {error}")
-            return error
-
-        implied_vol = brentq(
-            objective_function, 1e-6, 2.0, xtol=tol, maxiter=max_iterations
-        )
+        with get_profiler().stage("implied_volatility"):
+            result = implied_volatility(
+                market_price=market_price,
+                spot=S_o,
+                strike=K,
+                time_to_maturity=t,
+                risk_free_rate=r,
+                dividend_yield=d,
+                cp_flag=cp_flag,
+                tol=tol,
+                max_iterations=max_iterations,
+            )
+        if result.arbitrage_violation:
+            raise ValueError(
+                f"Market price {market_price} violates no-arbitrage bounds."
+            )
+        if not result.converged:
+            raise ValueError(
+                f"Implied volatility did not converge in {result.iterations} "
+                "iterations."
+            )
+        implied_vol = float(result.volatility)
+        if implied_vol <= 0.0:
+            raise ValueError(
+                f"Market price {market_price} is at intrinsic value; "
+                "implied volatility is zero."
+            )
         self.logger.info(
-            f"Implied Volatility calculated from market price: {implied_vol}"
+            "Implied Volatility calculated from market price: %s", implied_vol
         )
-        return float(implied_vol)  # pyright: ignore[reportArgumentType]
+        # Populate d1/d2 at the solved volatility for greeks()
+        self._bsm_price_from_vol(S_o, K, r, d, t, implied_vol, cp_flag, self.terms)
+        return implied_vol
 
     def price(self) -> float:
         if self.market_price is not None:
             self.logger.info(
-                f"Using market price for option pricing: {self.market_price}"
+                "Using market price for option pricing: %s", self.market_price
             )
             return self.market_price
         else:
@@ -150,15 +223,20 @@ class BSMPricer:
                 t=self.time_to_maturity,
                 sigma=self.volatility,
                 cp_flag=self.cp_flag,
+                terms=self.terms,
             )
             return option_price
 
-    def greeks(self) -> Dict[str, float]:
+    def greeks(self, higher_order: Iterable[str] = ()) -> Dict[str, float]:
         """
         Compute option greeks. Uses cached d1/d2 if available; calling price()
         will populate them if necessary. Minimize repeated math calls and guard
         zero/near-zero volatility or maturity.
 
+        Args:
+            higher_order: Names of higher-order greeks to add (vanna, volga,
+                charm, speed, color, dividend_rho); computed from the same
+                d1/d2, pdf and discount factors.
         """
         option_price = self.market_price or self.price()
 
@@ -166,12 +244,12 @@ class BSMPricer:
         d2 = self.d2
 
         T = self.time_to_maturity
-        sqrt_T = sqrt(T) if T > 0 else 0.0
-        discount_d = exp(-self.dividend_yield * T)
-        discount_r = exp(-self.risk_free_rate * T)
-        pdf_d1 = norm.pdf(d1)  # type: ignore
-        cdf_cp_d1 = norm.cdf(self.cp_flag * d1)  # type: ignore
-        cdf_cp_d2 = norm.cdf(self.cp_flag * d2)  # type: ignore
+        sqrt_T = self.terms.sqrt_t
+        discount_d = self.terms.discount_d
+        discount_r = self.terms.discount_r
+        pdf_d1 = _norm_pdf(d1)
+        cdf_cp_d1 = _norm_cdf(self.cp_flag * d1)
+        cdf_cp_d2 = _norm_cdf(self.cp_flag * d2)
 
         vol = self.volatility or 0.0
         if vol <= 0 or T <= 0 or self.spot_price == 0:
@@ -217,8 +295,27 @@ class BSMPricer:
             "rho": float(rho),
             "vega": float(vega),
         }
+        names = resolve_greek_names(higher_order)
+        if names and (vol <= 0 or T <= 0 or self.spot_price == 0):
+            greeks.update(dict.fromkeys(names, 0.0))
+        elif names:
+            extra = higher_order_greeks(
+                names,
+                spot=self.spot_price,
+                time_to_maturity=T,
+                risk_free_rate=self.risk_free_rate,
+                dividend_yield=self.dividend_yield,
+                volatility=vol,
+                cp_flag=self.cp_flag,
+                d1=d1,
+                d2=d2,
+                pdf_d1=pdf_d1,
+                cdf_cp_d1=cdf_cp_d1,
+                sqrt_t=sqrt_T,
+                discount_d=discount_d,
+            )
+            greeks.update({name: float(value) for name, value in extra.items()})
 
-        if self.logger and self.logger.isEnabledFor(INFO):
-            self.logger.info(f"Calculated Greeks: {greeks}")
+        self.logger.info("Calculated Greeks: %s", greeks)
 
         return greeks
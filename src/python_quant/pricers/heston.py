@@ -0,0 +1,446 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime
+from logging import Logger
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from python_quant.instrument.option import Option
+from python_quant.market_data.curves import rates_to_maturity
+from python_quant.pricers.implied_vol import implied_volatility
+from python_quant.utils.profiling import get_profiler
+
+# Carr-Madan grid: 4096 points 0.25 apart put log-strikes 2*pi/1024 apart
+FFT_POINTS = 4096
+FFT_SPACING = 0.25
+DAMPING = 1.5
+VOL_BUMP = 0.01
+TIME_BUMP = 1.0 / 365.0
+
+
+class HestonParameters(NamedTuple):
+    """
+    Heston model parameters.
+
+    Attributes:
+        v0: Initial variance.
+        kappa: Mean reversion speed of the variance.
+        theta: Long-run variance.
+        sigma: Volatility of the variance.
+        rho: Correlation of spot and variance moves.
+    """
+
+    v0: float
+    kappa: float
+    theta: float
+    sigma: float
+    rho: float
+
+    @classmethod
+    def from_market_data(cls, ticker_data: Any) -> "HestonParameters":
+        """Parameters from the `heston` entry of an underlying's market data."""
+        spec = ticker_data.get("heston") if isinstance(ticker_data, Mapping) else None
+        if not spec:
+            raise ValueError("Heston parameters are required for Heston pricing.")
+        params = cls(*(float(spec[name]) for name in cls._fields))
+        if params.v0 < 0 or params.theta < 0 or params.kappa <= 0:
+            raise ValueError(f"Invalid Heston parameters: {params}")
+        if params.sigma <= 0 or not -1.0 < params.rho < 1.0:
+            raise ValueError(f"Invalid Heston parameters: {params}")
+        return params
+
+
+def heston_characteristic_function(
+    u: ArrayLike, time_to_maturity: float, params: HestonParameters
+) -> NDArray[np.complex128]:
+    """
+    Characteristic function E[exp(iu X)] of the log forward moneyness
+    X = log(S_T / F) under Heston, in the formulation of Albrecher et al.
+    that stays on the principal branch of the complex logarithm.
+    """
+    v0, kappa, theta, sigma, rho = params
+    u = np.asarray(u, dtype=np.complex128)
+    xi = kappa - rho * sigma * 1j * u
+    d = np.sqrt(xi * xi + sigma * sigma * (u * u + 1j * u))
+    g = (xi - d) / (xi + d)
+    decay = np.exp(-d * time_to_maturity)
+    D = (xi - d) / (sigma * sigma) * (1.0 - decay) / (1.0 - g * decay)
+    C = (
+        kappa
+        * theta
+        / (sigma * sigma)
+        * ((xi - d) * time_to_maturity - 2.0 * np.log((1.0 - g * decay) / (1.0 - g)))
+    )
+    return np.exp(C + D * v0)
+
+
+class HestonTransform(NamedTuple):
+    """
+    Forward-normalized call prices c(k) = E[(S_T / F - e^k)^+] of one
+    parameter set and expiry, with their first three derivatives in k, on
+    an evenly spaced log-moneyness grid.
+    """
+
+    log_moneyness_start: float
+    spacing: float
+    call: NDArray[np.float64]
+    call_dk: NDArray[np.float64]
+    call_dk2: NDArray[np.float64]
+    call_dk3: NDArray[np.float64]
+
+    def curves(
+        self, log_moneyness: ArrayLike
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+        """
+        c, dc/dk and d2c/dk2 at `log_moneyness`, by cubic Hermite
+        interpolation of each curve with its known derivative.
+        """
+        k = np.asarray(log_moneyness, dtype=np.float64)
+        x = (k - self.log_moneyness_start) / self.spacing
+        i = np.clip(np.floor(x).astype(np.intp), 0, self.call.size - 2)
+        t = x - i
+        h = self.spacing
+        h00 = (1.0 + 2.0 * t) * (1.0 - t) ** 2
+        h10 = t * (1.0 - t) ** 2
+        h01 = t * t * (3.0 - 2.0 * t)
+        h11 = t * t * (t - 1.0)
+
+        def hermite(y, dy):
+            return h00 * y[i] + h10 * h * dy[i] + h01 * y[i + 1] + h11 * h * dy[i + 1]
+
+        call = hermite(self.call, self.call_dk)
+        call_dk = hermite(self.call_dk, self.call_dk2)
+        call_dk2 = hermite(self.call_dk2, self.call_dk3)
+        return call, call_dk, call_dk2
+
+
+def heston_transform(
+    params: HestonParameters,
+    time_to_maturity: float,
+    n_points: int = FFT_POINTS,
+    spacing: float = FFT_SPACING,
+    damping: float = DAMPING,
+) -> HestonTransform:
+    """
+    Carr-Madan FFT of the damped call price: one evaluation of the
+    characteristic function on `n_points` frequencies `spacing` apart
+    prices every log-strike of the expiry at once. The k-derivatives come
+    from the same evaluations weighted by powers of -iv, so all the curves
+    are one (4, n_points) FFT.
+    """
+    v = spacing * np.arange(n_points)
+    k_spacing = 2.0 * np.pi / (n_points * spacing)
+    k_start = -0.5 * n_points * k_spacing
+    alpha = damping
+
+    phi = heston_characteristic_function(
+        v - (alpha + 1.0) * 1j, time_to_maturity, params
+    )
+    psi = phi / (alpha * alpha + alpha - v * v + 1j * (2.0 * alpha + 1.0) * v)
+    # Simpson's rule weights
+    weights = spacing / 3.0 * (3.0 + (-1.0) ** (np.arange(n_points) + 1))
+    weights[0] = spacing / 3.0
+    x = np.exp(-1j * k_start * v) * psi * weights
+    iv = -1j * v
+    integrals = np.fft.fft(np.stack([x, iv * x, iv**2 * x, iv**3 * x]), axis=-1)
+    i0, i1, i2, i3 = integrals.real / np.pi
+
+    k = k_start + k_spacing * np.arange(n_points)
+    damp = np.exp(-alpha * k)
+    return HestonTransform(
+        log_moneyness_start=k_start,
+        spacing=k_spacing,
+        call=damp * i0,
+        call_dk=damp * (i1 - alpha * i0),
+        call_dk2=damp * (i2 - 2.0 * alpha * i1 + alpha**2 * i0),
+        call_dk3=damp * (i3 - 3.0 * alpha * i2 + 3.0 * alpha**2 * i1 - alpha**3 * i0),
+    )
+
+
+class HestonTransformCache:
+    """
+    LRU memo of HestonTransform keyed by (parameters, time to maturity).
+
+    The transform is independent of spot, rates and strikes, so every
+    option of an expiry, and the spot and rate sensitivities, reuse one
+    characteristic function evaluation. Only the vega and theta bumps need
+    transforms of their own, and those are cached too.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        n_points: int = FFT_POINTS,
+        spacing: float = FFT_SPACING,
+        damping: float = DAMPING,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("Heston transform cache size must be at least 1.")
+        self.max_entries = max_entries
+        self.grid = {"n_points": n_points, "spacing": spacing, "damping": damping}
+        self._entries: OrderedDict[Tuple[Hashable, ...], HestonTransform] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def transform(
+        self, params: HestonParameters, time_to_maturity: float
+    ) -> HestonTransform:
+        key = (tuple(params), float(time_to_maturity))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        get_profiler().count("heston_transforms")
+        entry = heston_transform(params, time_to_maturity, **self.grid)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+DEFAULT_HESTON_CACHE = HestonTransformCache()
+
+
+def _heston_values(
+    transform: HestonTransform,
+    spot: float,
+    strike: NDArray[np.float64],
+    time_to_maturity: float,
+    risk_free_rate: float,
+    dividend_yield: float,
+    cp_flag: NDArray[np.float64],
+) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """Prices, deltas and gammas of a strike vector from one transform."""
+    discount_d = np.exp(-dividend_yield * time_to_maturity)
+    forward = spot * np.exp((risk_free_rate - dividend_yield) * time_to_maturity)
+    k = np.log(strike / forward)
+    c, dc, d2c = transform.curves(k)
+    # Puts by parity: p(k) = c(k) - 1 + e^k
+    put = cp_flag < 0
+    ek = np.exp(k)
+    value = c + np.where(put, ek - 1.0, 0.0)
+    dvalue = dc + np.where(put, ek, 0.0)
+    d2value = d2c + np.where(put, ek, 0.0)
+
+    price = np.maximum(spot * discount_d * value, 0.0)
+    delta = discount_d * (value - dvalue)
+    gamma = discount_d * (d2value - dvalue) / spot
+    return price, delta, gamma
+
+
+def heston_price(
+    spot: float,
+    strike: ArrayLike,
+    time_to_maturity: float,
+    risk_free_rate: float,
+    dividend_yield: float,
+    params: HestonParameters,
+    cp_flag: ArrayLike,
+    cache: Optional[HestonTransformCache] = None,
+) -> NDArray[np.float64]:
+    """Heston prices of a vector of European options sharing one expiry."""
+    strike, cp_flag = np.broadcast_arrays(
+        np.asarray(strike, dtype=np.float64), np.asarray(cp_flag, dtype=np.float64)
+    )
+    transform = (cache or DEFAULT_HESTON_CACHE).transform(params, time_to_maturity)
+    price, _, _ = _heston_values(
+        transform,
+        spot,
+        strike,
+        time_to_maturity,
+        risk_free_rate,
+        dividend_yield,
+        cp_flag,
+    )
+    return price
+
+
+def heston_risk(
+    spot: float,
+    strike: ArrayLike,
+    time_to_maturity: float,
+    risk_free_rate: float,
+    dividend_yield: float,
+    params: HestonParameters,
+    cp_flag: ArrayLike,
+    market_price: Optional[ArrayLike] = None,
+    cache: Optional[HestonTransformCache] = None,
+) -> Dict[str, NDArray[np.float64]]:
+    """
+    Full risk for a strike vector of one expiry in the same shape as
+    BSMPricer.greeks().
+
+    Delta and gamma are read off the transform's k-derivatives and rho
+    follows from them (T (S delta - V)), so they cost no extra transform.
+    Vega (to a parallel shift of sqrt(v0) and sqrt(theta), per unit of vol)
+    and theta are central differences on bumped transforms. Quoted options
+    (non-NaN `market_price`) report that price and its implied volatility;
+    greeks are the model's.
+    """
+    cache = cache or DEFAULT_HESTON_CACHE
+    strike, cp_flag = np.broadcast_arrays(
+        np.asarray(strike, dtype=np.float64), np.asarray(cp_flag, dtype=np.float64)
+    )
+    args = (spot, strike, time_to_maturity, risk_free_rate, dividend_yield, cp_flag)
+    price, delta, gamma = _heston_values(
+        cache.transform(params, time_to_maturity), *args
+    )
+
+    def reprice(bumped_params, t):
+        return heston_price(
+            spot,
+            strike,
+            t,
+            risk_free_rate,
+            dividend_yield,
+            bumped_params,
+            cp_flag,
+            cache,
+        )
+
+    # Vega shifts the whole variance curve: sqrt(v0) and sqrt(theta) together,
+    # down by no more than half of either so the bumped variances stay positive
+    vol, long_run_vol = np.sqrt(params.v0), np.sqrt(params.theta)
+    h_down = min(VOL_BUMP, 0.5 * vol, 0.5 * long_run_vol)
+    up = params._replace(v0=(vol + VOL_BUMP) ** 2, theta=(long_run_vol + VOL_BUMP) ** 2)
+    down = params._replace(v0=(vol - h_down) ** 2, theta=(long_run_vol - h_down) ** 2)
+    vega = (reprice(up, time_to_maturity) - reprice(down, time_to_maturity)) / (
+        VOL_BUMP + h_down
+    )
+    dt = min(TIME_BUMP, 0.5 * time_to_maturity)
+    theta = (
+        reprice(params, time_to_maturity - dt) - reprice(params, time_to_maturity + dt)
+    ) / (2.0 * dt)
+    rho = time_to_maturity * (spot * delta - price)
+
+    if market_price is not None:
+        market_price = np.broadcast_to(
+            np.asarray(market_price, dtype=np.float64), price.shape
+        )
+        price = np.where(np.isnan(market_price), price, market_price)
+    implied = implied_volatility(
+        market_price=price,
+        spot=spot,
+        strike=strike,
+        time_to_maturity=time_to_maturity,
+        risk_free_rate=risk_free_rate,
+        dividend_yield=dividend_yield,
+        cp_flag=cp_flag,
+    )
+    return {
+        "price": price,
+        "implied_volatility": np.where(implied.converged, implied.volatility, np.nan),
+        "delta": delta,
+        "gamma": gamma,
+        "theta": theta,
+        "rho": rho,
+        "vega": vega,
+    }
+
+
+class HestonPricer:
+    """
+    Heston stochastic volatility pricer for European options, with the same
+    interface as BSMPricer. Parameters come from the `heston` entry of the
+    underlying's market data:
+
+        "AAPL": {"spot_price": 272.0, "heston": {"v0": 0.04, "kappa": 1.5,
+                 "theta": 0.05, "sigma": 0.6, "rho": -0.7}}
+    """
+
+    def __init__(
+        self,
+        instrument: Option,
+        as_of_date: datetime,
+        market_data: Dict[str, Any],
+        logger: Logger,
+        cache: Optional[HestonTransformCache] = None,
+    ):
+        self.logger = logger
+        self.instrument = instrument
+        self.as_of_date = as_of_date
+        self.cache = cache or DEFAULT_HESTON_CACHE
+
+        ticker_data = market_data[self.instrument.underlying["symbol"]]
+        self.spot_price = (
+            ticker_data["spot_price"]
+            if isinstance(ticker_data, Mapping)
+            else ticker_data
+        )
+        self.params = HestonParameters.from_market_data(ticker_data)
+        # Zero rates to expiry, from flat rates or curves
+        self.risk_free_rate, self.dividend_yield = rates_to_maturity(
+            market_data, instrument.time_to_maturity(as_of_date)
+        )
+        self.market_price = self.instrument.market_price
+
+        self._input_data_check()
+
+    def _input_data_check(self):
+        if self.spot_price is None:
+            raise ValueError("Spot price is required for Heston pricing.")
+        elif self.instrument.option_type != Option.OptionType.EUROPEAN:
+            raise NotImplementedError("Heston pricing supports European exercise only.")
+        elif self.instrument.is_expired(self.as_of_date):
+            raise ValueError("Cannot price an expired option.")
+
+        self.time_to_maturity = self.instrument.time_to_maturity(self.as_of_date)
+        self.cp_flag = 1.0 if self.instrument.call_put == Option.CallPut.CALL else -1.0
+
+        self.logger.info(
+            f"Initializing Heston pricer: {self.params}, "
+            f"time to maturity {self.time_to_maturity}"
+        )
+
+    def price(self) -> float:
+        if self.market_price is not None:
+            self.logger.info(
+                f"Using market price for option pricing: {self.market_price}"
+            )
+            return self.market_price
+        return float(
+            heston_price(
+                spot=self.spot_price,
+                strike=self.instrument.strike_price,
+                time_to_maturity=self.time_to_maturity,
+                risk_free_rate=self.risk_free_rate,
+                dividend_yield=self.dividend_yield,
+                params=self.params,
+                cp_flag=self.cp_flag,
+                cache=self.cache,
+            )
+        )
+
+    def greeks(self) -> Dict[str, float]:
+        risk = heston_risk(
+            spot=self.spot_price,
+            strike=self.instrument.strike_price,
+            time_to_maturity=self.time_to_maturity,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=self.dividend_yield,
+            params=self.params,
+            cp_flag=self.cp_flag,
+            market_price=np.nan if self.market_price is None else self.market_price,
+            cache=self.cache,
+        )
+        greeks = {key: float(value) for key, value in risk.items()}
+        self.logger.info(f"Calculated Greeks: {greeks}")
+        return greeks
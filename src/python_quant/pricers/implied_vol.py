@@ -0,0 +1,281 @@
+from typing import Callable, NamedTuple, Tuple
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from python_quant.pricers.bsm_batch import norm_cdf, norm_pdf
+from python_quant.utils.profiling import get_profiler
+
+
+class ImpliedVolResult(NamedTuple):
+    """
+    Output of implied_volatility().
+
+    Attributes:
+        volatility: Implied volatilities, NaN where no solution exists.
+        converged: True where the solver met the tolerance.
+        iterations: Number of Newton/Halley/bisection steps per option.
+        arbitrage_violation: True where the market price lies outside the
+            no-arbitrage bounds (or the inputs cannot be priced at all).
+    """
+
+    volatility: NDArray[np.float64]
+    converged: NDArray[np.bool_]
+    iterations: NDArray[np.int64]
+    arbitrage_violation: NDArray[np.bool_]
+
+
+def _price_vega_volga(
+    fwd: NDArray[np.float64],
+    K: NDArray[np.float64],
+    t: NDArray[np.float64],
+    cp: NDArray[np.float64],
+    sigma: NDArray[np.float64],
+) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """Undiscounted Black price, vega and volga on the forward."""
+    sqrt_t = np.sqrt(t)
+    sigma_sqrt_t = sigma * sqrt_t
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = np.log(fwd / K) / sigma_sqrt_t + 0.5 * sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+    price = cp * (fwd * norm_cdf(cp * d1) - K * norm_cdf(cp * d2))
+    vega = fwd * norm_pdf(d1) * sqrt_t
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volga = vega * d1 * d2 / sigma
+    return price, vega, volga
+
+
+def _initial_guess(
+    fwd: NDArray[np.float64],
+    K: NDArray[np.float64],
+    t: NDArray[np.float64],
+    cp: NDArray[np.float64],
+    target: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Corrado-Miller approximation, floored by the moneyness heuristic."""
+    call = target + np.where(cp < 0, fwd - K, 0.0)
+    half_gap = 0.5 * (fwd - K)
+    excess = call - half_gap
+    disc = np.maximum(excess * excess - (fwd - K) ** 2 / np.pi, 0.0)
+    guess = np.sqrt(2.0 * np.pi) / (fwd + K) * (excess + np.sqrt(disc))
+    guess = guess / np.sqrt(t)
+    floor = np.sqrt(2.0 * np.abs(np.log(fwd / K)) / t)
+    guess = np.where(np.isfinite(guess) & (guess > 0), guess, floor)
+    return np.maximum(guess, np.maximum(floor, 1e-4))
+
+
+def implied_volatility(
+    market_price: ArrayLike,
+    spot: ArrayLike,
+    strike: ArrayLike,
+    time_to_maturity: ArrayLike,
+    risk_free_rate: ArrayLike,
+    dividend_yield: ArrayLike,
+    cp_flag: ArrayLike,
+    tol: float = 1e-10,
+    max_iterations: int = 50,
+) -> ImpliedVolResult:
+    """
+    Solve for Black-Scholes implied volatilities of whole arrays of prices.
+
+    Each option starts from a Corrado-Miller guess and is refined with Halley
+    steps on vega/volga. Steps are safeguarded by a per-option bracket that
+    starts as (0, inf) and tightens on every evaluation: any step leaving the
+    bracket falls back to bisection (or doubling while the upper end is still
+    unbounded), so no fixed search interval is imposed. Prices outside the
+    no-arbitrage bounds are flagged rather than raising.
+
+    Args:
+        market_price: Observed option prices.
+        spot: Spot prices of the underlyings.
+        strike: Strike prices.
+        time_to_maturity: Year fractions to expiry.
+        risk_free_rate: Continuously compounded risk-free rates.
+        dividend_yield: Continuously compounded dividend yields.
+        cp_flag: 1.0 for calls, -1.0 for puts.
+        tol: Absolute tolerance on the volatility step.
+        max_iterations: Maximum number of refinement steps per option.
+
+    Returns:
+        ImpliedVolResult: Volatilities, convergence mask, iteration counts and
+        no-arbitrage violation mask, in the broadcast shape of the inputs.
+    """
+    price, S, K, t, r, d, cp = np.broadcast_arrays(
+        *(
+            np.asarray(x, dtype=np.float64)
+            for x in (
+                market_price,
+                spot,
+                strike,
+                time_to_maturity,
+                risk_free_rate,
+                dividend_yield,
+                cp_flag,
+            )
+        )
+    )
+    shape = price.shape
+    price, S, K, t, r, d, cp = (x.ravel() for x in (price, S, K, t, r, d, cp))
+
+    volatility = np.full(price.shape, np.nan)
+    converged = np.zeros(price.shape, dtype=bool)
+    iterations = np.zeros(price.shape, dtype=np.int64)
+
+    pricable = (t > 0) & (S > 0) & (K > 0) & np.isfinite(price)
+    safe_t = np.where(pricable, t, 1.0)
+    discount_r = np.exp(-r * safe_t)
+    fwd = S * np.exp((r - d) * safe_t)
+    target = price / discount_r
+
+    lower = np.maximum(cp * (fwd - K), 0.0)
+    upper = np.where(cp > 0, fwd, K)
+    eps = 1e-12 * np.maximum(upper, 1.0)
+    arbitrage = ~pricable | (target < lower - eps) | (target >= upper - eps)
+
+    at_intrinsic = ~arbitrage & (target <= lower + eps)
+    volatility[at_intrinsic] = 0.0
+    converged[at_intrinsic] = True
+
+    idx = np.flatnonzero(~arbitrage & ~at_intrinsic)
+    fwd, K, t, cp, target = (x[idx] for x in (fwd, K, safe_t, cp, target))
+    sigma = _initial_guess(fwd, K, t, cp, target)
+    lo = np.zeros_like(sigma)
+    hi = np.full_like(sigma, np.inf)
+
+    for _ in range(max_iterations):
+        if idx.size == 0:
+            break
+        iterations[idx] += 1
+
+        model, vega, volga = _price_vega_volga(fwd, K, t, cp, sigma)
+        diff = model - target
+        lo = np.where(diff < 0, sigma, lo)
+        hi = np.where(diff > 0, sigma, hi)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = diff / vega
+            denom = 1.0 - 0.5 * newton * volga / vega
+            step = np.where(denom > 0.5, newton / denom, newton)
+        candidate = sigma - step
+
+        bad = ~np.isfinite(candidate) | (candidate <= lo) | (candidate >= hi)
+        fallback = np.where(np.isfinite(hi), 0.5 * (lo + hi), 2.0 * sigma)
+        candidate = np.where(bad, fallback, candidate)
+
+        done = (np.abs(candidate - sigma) < tol) | (diff == 0)
+        done_idx = idx[done]
+        volatility[done_idx] = np.where(diff == 0, sigma, candidate)[done]
+        converged[done_idx] = True
+
+        keep = ~done
+        idx = idx[keep]
+        fwd, K, t, cp, target = (x[keep] for x in (fwd, K, t, cp, target))
+        sigma, lo, hi = candidate[keep], lo[keep], hi[keep]
+
+    # Report the last iterate for options that ran out of iterations
+    volatility[idx] = sigma
+
+    # One price/vega/volga evaluation per option per iteration
+    profiler = get_profiler()
+    profiler.count("iv_solves", price.size)
+    profiler.count("iv_objective_evaluations", int(iterations.sum()))
+    profiler.count("iv_unconverged", int(idx.size))
+
+    return ImpliedVolResult(
+        volatility=volatility.reshape(shape),
+        converged=converged.reshape(shape),
+        iterations=iterations.reshape(shape),
+        arbitrage_violation=arbitrage.reshape(shape),
+    )
+
+
+def model_implied_volatility(
+    market_price: ArrayLike,
+    spot: float,
+    strike: ArrayLike,
+    time_to_maturity: float,
+    risk_free_rate: float,
+    dividend_yield: float,
+    cp_flag: ArrayLike,
+    pricer: Callable[
+        [NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]],
+        NDArray[np.float64],
+    ],
+    exercise: str = "AMERICAN",
+    vol_bump: float = 1e-4,
+    tol: float = 1e-8,
+    max_iterations: int = 50,
+) -> ImpliedVolResult:
+    """
+    Solve implied volatilities of a numerical model (binomial tree, finite
+    differences) for a strike vector sharing one expiry.
+
+    Starts from the European implied volatility and takes Newton steps with
+    a central-difference model vega, safeguarded by a per-strike bracket as
+    in implied_volatility(). `pricer(strike, volatility, cp_flag)` prices
+    arrays of options; each iteration prices the base and both bumped
+    volatilities of all unconverged strikes in a single call.
+    """
+    price, K, cp = (
+        np.asarray(x, dtype=np.float64)
+        for x in np.broadcast_arrays(
+            np.atleast_1d(market_price), np.atleast_1d(strike), np.atleast_1d(cp_flag)
+        )
+    )
+    t = float(time_to_maturity)
+    n = price.size
+    volatility = np.full(n, np.nan)
+    converged = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=np.int64)
+
+    intrinsic = np.maximum(cp * (spot - K), 0.0)
+    if exercise.upper() == "EUROPEAN":
+        fwd_intrinsic = cp * (
+            spot * np.exp(-dividend_yield * t) - K * np.exp(-risk_free_rate * t)
+        )
+        intrinsic = np.maximum(fwd_intrinsic, 0.0)
+    upper = np.where(cp > 0, spot, K)
+    arbitrage = ~np.isfinite(price) | (t <= 0) | (price < intrinsic) | (price >= upper)
+
+    european = implied_volatility(
+        price, spot, K, t, risk_free_rate, dividend_yield, cp
+    ).volatility
+    sigma = np.where(np.isfinite(european) & (european > 0), european, 0.3)
+
+    idx = np.flatnonzero(~arbitrage)
+    sigma = sigma[idx]
+    lo = np.zeros_like(sigma)
+    hi = np.full_like(sigma, np.inf)
+    for _ in range(max_iterations):
+        if idx.size == 0:
+            break
+        iterations[idx] += 1
+        m = idx.size
+        bump = np.minimum(vol_bump, 0.5 * sigma)
+        prices = pricer(
+            np.tile(K[idx], 3),
+            np.concatenate([sigma, sigma + bump, sigma - bump]),
+            np.tile(cp[idx], 3),
+        )
+        diff = prices[:m] - price[idx]
+        vega = (prices[m : 2 * m] - prices[2 * m :]) / (2.0 * bump)
+        lo = np.where(diff < 0, sigma, lo)
+        hi = np.where(diff > 0, sigma, hi)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            candidate = sigma - diff / vega
+        bad = ~np.isfinite(candidate) | (candidate <= lo) | (candidate >= hi)
+        fallback = np.where(np.isfinite(hi), 0.5 * (lo + hi), 2.0 * sigma)
+        candidate = np.where(bad, fallback, candidate)
+
+        done = (np.abs(candidate - sigma) < tol) | (diff == 0)
+        volatility[idx[done]] = np.where(diff == 0, sigma, candidate)[done]
+        converged[idx[done]] = True
+        keep = ~done
+        idx, sigma, lo, hi = idx[keep], candidate[keep], lo[keep], hi[keep]
+
+    volatility[idx] = sigma
+    return ImpliedVolResult(
+        volatility=volatility,
+        converged=converged,
+        iterations=iterations,
+        arbitrage_violation=arbitrage,
+    )
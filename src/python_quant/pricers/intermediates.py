@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from datetime import datetime
+from math import exp, sqrt
+from typing import Dict, Hashable, NamedTuple, Optional, Tuple
+from python_quant.instrument.option import Option
+
+
+class MaturityTerms(NamedTuple):
+    """
+    Pricing quantities shared by every option on one underlying and expiry.
+
+    Attributes:
+        time_to_maturity: Year fraction from the as-of date to expiry.
+        sqrt_t: Square root of time_to_maturity.
+        discount_r: Risk-free discount factor exp(-r * t).
+        discount_d: Dividend discount factor exp(-d * t).
+        forward: Forward price of the underlying at expiry.
+    """
+
+    time_to_maturity: float
+    sqrt_t: float
+    discount_r: float
+    discount_d: float
+    forward: float
+
+
+class IntermediateCache:
+    """
+    LRU memo of MaturityTerms keyed by (underlying, expiry, day count,
+    as-of date, spot, curve).
+
+    Options in a chain share their underlying, expiry and as-of date, so the
+    day count year fraction, square root, discount factors and forward are
+    computed once per chain rather than once per option. `curve` identifies
+    the rates the discount factors come from.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        if max_entries < 1:
+            raise ValueError("Intermediate cache size must be at least 1.")
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Tuple[Hashable, ...], MaturityTerms] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def terms(
+        self,
+        option: Option,
+        as_of_date: datetime,
+        spot: float,
+        risk_free_rate: float,
+        dividend_yield: float,
+        curve: Optional[Hashable] = None,
+    ) -> MaturityTerms:
+        """
+        Return the MaturityTerms of `option` as of `as_of_date`, computing
+        them only on the first request for its underlying and expiry.
+
+        Args:
+            curve: Key of the curve the rates come from; defaults to the
+                (risk_free_rate, dividend_yield) pair itself.
+        """
+        if curve is None:
+            curve = (risk_free_rate, dividend_yield)
+        key = (
+            option.underlying["symbol"],
+            option.expiration_date,
+            option.day_count_convention.convention,
+            as_of_date,
+            spot,
+            curve,
+        )
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        t = option.time_to_maturity(as_of_date)
+        discount_r = exp(-risk_free_rate * t)
+        discount_d = exp(-dividend_yield * t)
+        entry = MaturityTerms(
+            time_to_maturity=t,
+            sqrt_t=sqrt(t),
+            discount_r=discount_r,
+            discount_d=discount_d,
+            forward=spot * discount_d / discount_r,
+        )
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+DEFAULT_INTERMEDIATE_CACHE = IntermediateCache()
@@ -0,0 +1,398 @@
+import multiprocessing
+from collections.abc import Mapping
+from contextlib import ExitStack
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from logging import Logger, INFO
+from math import ceil
+from time import perf_counter
+from typing import Callable, Dict, NamedTuple, Optional
+import numpy as np
+from numpy.typing import NDArray
+from python_quant.instrument.option import Option
+from python_quant.market_data.curves import rates_to_maturity
+
+SPOT_BUMP = 0.01
+VOL_BUMP = 0.01
+RATE_BUMP = 1e-4
+TIME_BUMP = 1.0 / 365.0
+# Default monitoring frequency of path-dependent payoffs: daily
+MONITORING_DATES_PER_YEAR = 252
+
+
+def _vanilla_payoff(
+    paths: NDArray[np.float64], strike: float, cp_flag: float
+) -> NDArray[np.float64]:
+    return np.maximum(cp_flag * (paths[:, -1] - strike), 0.0)
+
+
+def _asian_payoff(
+    paths: NDArray[np.float64], strike: float, cp_flag: float
+) -> NDArray[np.float64]:
+    """Arithmetic average price over the monitoring dates."""
+    return np.maximum(cp_flag * (paths.mean(axis=1) - strike), 0.0)
+
+
+def _lookback_payoff(
+    paths: NDArray[np.float64], strike: float, cp_flag: float
+) -> NDArray[np.float64]:
+    """Fixed-strike lookback on the path maximum (calls) or minimum (puts)."""
+    extreme = paths.max(axis=1) if cp_flag > 0 else paths.min(axis=1)
+    return np.maximum(cp_flag * (extreme - strike), 0.0)
+
+
+PAYOFFS: Dict[
+    str, Callable[[NDArray[np.float64], float, float], NDArray[np.float64]]
+] = {
+    "VANILLA": _vanilla_payoff,
+    "ASIAN": _asian_payoff,
+    "LOOKBACK": _lookback_payoff,
+}
+
+
+def monitoring_steps(payoff: str, time_to_maturity: float, steps: Optional[int]) -> int:
+    """
+    Number of monitoring dates to simulate: `steps` if given, else one for
+    vanilla payoffs and daily for path-dependent ones. Path-dependent
+    payoffs need at least two dates, or they collapse to the vanilla payoff.
+    """
+    payoff = payoff.upper()
+    if steps is None:
+        if payoff == "VANILLA":
+            return 1
+        return max(2, ceil(time_to_maturity * MONITORING_DATES_PER_YEAR))
+    if payoff != "VANILLA" and steps < 2:
+        raise ValueError(f"{payoff} payoffs need at least two monitoring steps.")
+    return steps
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Pool of `workers` processes to simulate chunks on."""
+    # forkserver: forking a process that runs polars/BLAS threads can deadlock
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("forkserver")
+    )
+
+
+class MonteCarloResult(NamedTuple):
+    """
+    Output of monte_carlo_price().
+
+    Attributes:
+        price: Monte Carlo estimate of the option price.
+        std_error: Standard error of the estimate.
+        n_paths: Number of simulated paths (antithetic pairs count twice).
+        paths_per_second: Simulation throughput.
+    """
+
+    price: float
+    std_error: float
+    n_paths: int
+    paths_per_second: float
+
+
+def _simulate_chunk(
+    seed: np.random.SeedSequence,
+    n_paths: int,
+    spot: float,
+    strike: float,
+    t: float,
+    r: float,
+    d: float,
+    vol: float,
+    cp_flag: float,
+    steps: int,
+    payoff: str,
+    antithetic: bool,
+) -> NDArray[np.float64]:
+    """
+    Simulate one chunk of GBM paths and return its sufficient statistics
+    [n, sum(y), sum(y^2), sum(x), sum(x^2), sum(xy)], where y is the
+    discounted payoff and x the discounted terminal spot (control variate).
+    """
+    rng = np.random.default_rng(seed)
+    dt = t / steps
+    n_draws = (n_paths + 1) // 2 if antithetic else n_paths
+    z = rng.standard_normal((n_draws, steps))
+    if antithetic:
+        z = np.concatenate([z, -z])
+
+    log_paths = np.cumsum((r - d - 0.5 * vol * vol) * dt + vol * np.sqrt(dt) * z, 1)
+    paths = spot * np.exp(log_paths)
+    discount = np.exp(-r * t)
+    y = discount * PAYOFFS[payoff](paths, strike, cp_flag)
+    x = discount * paths[:, -1]
+    if antithetic:
+        # Each antithetic pair is one independent sample
+        y = 0.5 * (y[:n_draws] + y[n_draws:])
+        x = 0.5 * (x[:n_draws] + x[n_draws:])
+
+    return np.array([y.size, y.sum(), y @ y, x.sum(), x @ x, x @ y], dtype=np.float64)
+
+
+def monte_carlo_price(
+    spot: float,
+    strike: float,
+    time_to_maturity: float,
+    risk_free_rate: float,
+    dividend_yield: float,
+    volatility: float,
+    cp_flag: float,
+    payoff: str = "VANILLA",
+    n_paths: int = 100_000,
+    steps: Optional[int] = None,
+    chunk_size: int = 10_000,
+    antithetic: bool = True,
+    control_variate: bool = True,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    executor: Optional[Executor] = None,
+) -> MonteCarloResult:
+    """
+    Price an option by Monte Carlo simulation of GBM paths.
+
+    Paths are generated in chunks of at most `chunk_size`, so memory is
+    bounded by chunk_size * steps regardless of n_paths. Every chunk draws
+    from its own stream spawned from numpy.random.SeedSequence(seed), and
+    chunk statistics are combined in chunk order, so for a fixed seed the
+    result is bit-identical whatever the number of workers.
+
+    Args:
+        spot: Spot price of the underlying.
+        strike: Strike price.
+        time_to_maturity: Year fraction to expiry.
+        risk_free_rate: Continuously compounded risk-free rate.
+        dividend_yield: Continuously compounded dividend yield.
+        volatility: Black-Scholes volatility.
+        cp_flag: 1.0 for calls, -1.0 for puts.
+        payoff: One of PAYOFFS ("VANILLA", "ASIAN", "LOOKBACK").
+        n_paths: Total number of paths to simulate.
+        steps: Number of equally spaced monitoring dates per path; by
+            default as in monitoring_steps().
+        chunk_size: Maximum number of paths simulated at once.
+        antithetic: Use antithetic variates.
+        control_variate: Use the discounted terminal spot as control variate.
+        seed: Root seed; None draws fresh entropy.
+        workers: Number of worker processes (1 runs in-process).
+        executor: Pool to simulate on when workers > 1, e.g. one shared by
+            bumped runs; a new process_pool() if None.
+
+    Returns:
+        MonteCarloResult: Price, standard error, path count and throughput.
+    """
+    payoff = payoff.upper()
+    if payoff not in PAYOFFS:
+        raise ValueError(f"Unsupported Monte Carlo payoff: {payoff}")
+    steps = monitoring_steps(payoff, time_to_maturity, steps)
+    if antithetic:
+        n_paths += n_paths % 2
+        chunk_size += chunk_size % 2
+
+    chunks = [chunk_size] * (n_paths // chunk_size)
+    if n_paths % chunk_size:
+        chunks.append(n_paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    args = (
+        spot,
+        strike,
+        time_to_maturity,
+        risk_free_rate,
+        dividend_yield,
+        volatility,
+        cp_flag,
+        steps,
+        payoff,
+        antithetic,
+    )
+
+    start = perf_counter()
+    if workers > 1:
+        with ExitStack() as stack:
+            if executor is None:
+                executor = stack.enter_context(process_pool(workers))
+            futures = [
+                executor.submit(_simulate_chunk, s, n, *args)
+                for s, n in zip(seeds, chunks, strict=True)
+            ]
+            stats = [future.result() for future in futures]
+    else:
+        stats = [
+            _simulate_chunk(s, n, *args) for s, n in zip(seeds, chunks, strict=True)
+        ]
+    elapsed = perf_counter() - start
+
+    total = np.zeros(6)
+    for chunk_stats in stats:
+        total += chunk_stats
+    n, sum_y, sum_yy, sum_x, sum_xx, sum_xy = total
+
+    mean_y = sum_y / n
+    var_y = (sum_yy - n * mean_y * mean_y) / (n - 1)
+    if control_variate:
+        mean_x = sum_x / n
+        var_x = (sum_xx - n * mean_x * mean_x) / (n - 1)
+        cov_xy = (sum_xy - n * mean_x * mean_y) / (n - 1)
+        beta = cov_xy / var_x if var_x > 0 else 0.0
+        expected_x = spot * np.exp(-dividend_yield * time_to_maturity)
+        price = mean_y - beta * (mean_x - expected_x)
+        variance = max(var_y - beta * cov_xy, 0.0)
+    else:
+        price = mean_y
+        variance = var_y
+
+    return MonteCarloResult(
+        price=float(price),
+        std_error=float(np.sqrt(variance / n)),
+        n_paths=n_paths,
+        paths_per_second=n_paths / elapsed if elapsed > 0 else float("inf"),
+    )
+
+
+class MonteCarloPricer:
+    """
+    Monte Carlo pricer for European-exercise, possibly path-dependent,
+    options, with the same interface as BSMPricer. Greeks are bump-and-reprice
+    estimates sharing the seed of the base run (common random numbers).
+    """
+
+    def __init__(
+        self,
+        instrument: Option,
+        as_of_date: datetime,
+        market_data: Dict[str, float],
+        logger: Logger,
+        payoff: str = "VANILLA",
+        n_paths: int = 100_000,
+        steps: Optional[int] = None,
+        chunk_size: int = 10_000,
+        antithetic: bool = True,
+        control_variate: bool = True,
+        seed: Optional[int] = None,
+        workers: int = 1,
+    ):
+        self.logger = logger
+        self.instrument = instrument
+        self.as_of_date = as_of_date
+
+        ticker_data = market_data[self.instrument.underlying["symbol"]]
+        if isinstance(ticker_data, Mapping):
+            self.spot_price = ticker_data["spot_price"]
+        else:
+            self.spot_price = ticker_data
+
+        self.volatility = instrument.volatility
+        # Zero rates to expiry, from flat rates or curves
+        self.risk_free_rate, self.dividend_yield = rates_to_maturity(
+            market_data, instrument.time_to_maturity(as_of_date)
+        )
+        self.market_price = self.instrument.market_price
+
+        # A fixed seed keeps bumped runs on the same random numbers
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+        # Bumped runs keep the monitoring dates of the base run
+        self.simulation = {
+            "payoff": payoff,
+            "n_paths": n_paths,
+            "steps": monitoring_steps(
+                payoff, instrument.time_to_maturity(as_of_date), steps
+            ),
+            "chunk_size": chunk_size,
+            "antithetic": antithetic,
+            "control_variate": control_variate,
+            "seed": seed,
+            "workers": workers,
+        }
+
+        self._input_data_check()
+
+    def _input_data_check(self):
+        if self.spot_price is None:
+            raise ValueError("Spot price is required for Monte Carlo pricing.")
+        elif not self.volatility:
+            raise ValueError("Volatility is required for Monte Carlo pricing.")
+        elif self.instrument.option_type != Option.OptionType.EUROPEAN:
+            raise NotImplementedError(
+                "Monte Carlo pricing supports European exercise only."
+            )
+        elif self.instrument.is_expired(self.as_of_date):
+            raise ValueError("Cannot price an expired option.")
+
+        self.time_to_maturity = self.instrument.time_to_maturity(self.as_of_date)
+        self.cp_flag = 1.0 if self.instrument.call_put == Option.CallPut.CALL else -1.0
+
+        self.logger.info(
+            f"Initializing Monte Carlo pricer: {self.simulation}, "
+            f"time to maturity {self.time_to_maturity}"
+        )
+
+    def _run(
+        self,
+        spot: Optional[float] = None,
+        t: Optional[float] = None,
+        r: Optional[float] = None,
+        vol: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ) -> MonteCarloResult:
+        return monte_carlo_price(
+            spot=self.spot_price if spot is None else spot,
+            strike=self.instrument.strike_price,
+            time_to_maturity=self.time_to_maturity if t is None else t,
+            risk_free_rate=self.risk_free_rate if r is None else r,
+            dividend_yield=self.dividend_yield,
+            volatility=self.volatility if vol is None else vol,
+            cp_flag=self.cp_flag,
+            executor=executor,
+            **self.simulation,
+        )
+
+    def price(self) -> float:
+        if self.market_price is not None:
+            self.logger.info(
+                f"Using market price for option pricing: {self.market_price}"
+            )
+            return self.market_price
+        return self._run().price
+
+    def greeks(self) -> Dict[str, float]:
+        """
+        Bump-and-reprice greeks. With several workers, the base and bumped
+        runs share one process pool.
+        """
+        if self.simulation["workers"] > 1:
+            with process_pool(self.simulation["workers"]) as executor:
+                return self._greeks(executor)
+        return self._greeks(None)
+
+    def _greeks(self, executor: Optional[Executor]) -> Dict[str, float]:
+        def run(**bumps: float) -> MonteCarloResult:
+            return self._run(executor=executor, **bumps)
+
+        base = run()
+        self.logger.info(
+            f"Monte Carlo price {base.price} +/- {base.std_error} "
+            f"({base.paths_per_second:.0f} paths/s)"
+        )
+
+        h = SPOT_BUMP * self.spot_price
+        up = run(spot=self.spot_price + h).price
+        down = run(spot=self.spot_price - h).price
+        vega = (run(vol=self.volatility + VOL_BUMP).price - base.price) / VOL_BUMP
+        rho = (run(r=self.risk_free_rate + RATE_BUMP).price - base.price) / RATE_BUMP
+        dt = min(TIME_BUMP, 0.5 * self.time_to_maturity)
+        theta = (run(t=self.time_to_maturity - dt).price - base.price) / dt
+
+        greeks = {
+            "price": self.market_price or base.price,
+            "implied_volatility": self.volatility,
+            "delta": (up - down) / (2.0 * h),
+            "gamma": (up - 2.0 * base.price + down) / (h * h),
+            "theta": theta,
+            "rho": rho,
+            "vega": vega,
+        }
+
+        if self.logger and self.logger.isEnabledFor(INFO):
+            self.logger.info(f"Calculated Greeks: {greeks}")
+
+        return greeks
@@ -1,6 +1,8 @@
-import polars as pl
 from pathlib import Path
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
+
+if TYPE_CHECKING:
+    import polars as pl
 
 
 def write_output_to_csv(data: Dict[str, Any], csv_path: str) -> None:
@@ -16,6 +18,8 @@ def write_output_to_csv(data: Dict[str, Any], csv_path: str) -> None:
         data (Dict[str, Any]): The data to write to CSV.
         csv_path (str): The path to the CSV file.
     """
+    import polars as pl
+
     instrument_details = data.get("instrument_details") or {}
     risk_metrics = data.get("risk_metrics") or {}
     # Combine both dictionaries for CSV output
@@ -26,7 +30,7 @@ def write_output_to_csv(data: Dict[str, Any], csv_path: str) -> None:
     df.write_csv(csv_file)
 
 
-def read_csv_to_df(csv_path: str) -> pl.DataFrame:
+def read_csv_to_df(csv_path: str) -> "pl.DataFrame":
     """
     Read a CSV file into a Polars DataFrame.
 
@@ -36,6 +40,8 @@ def read_csv_to_df(csv_path: str) -> pl.DataFrame:
     Returns:
         pl.DataFrame: The DataFrame containing the CSV data.
     """
+    import polars as pl
+
     csv_file = Path(csv_path)
     if not csv_file.exists():
         raise FileNotFoundError(f"CSV file not found at path: {csv_path}")
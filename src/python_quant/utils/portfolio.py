@@ -0,0 +1,187 @@
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Union
+import json
+import pickle
+import tempfile
+import polars as pl
+
+# Flat (CSV/Parquet) portfolio columns that map onto the nested instrument dict
+FLAT_UNDERLYING_COLUMNS = {"underlying_symbol": "symbol", "underlying_type": "type"}
+FLAT_STRING_COLUMNS = {"expiry": pl.Utf8, "type": pl.Utf8, "option_type": pl.Utf8}
+
+
+def instrument_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a flat portfolio row into the instrument dict shape used by the
+    single-instrument JSON input, i.e. nest the underlying_* columns under
+    "underlying" and drop null cells.
+
+    Args:
+        row (Dict[str, Any]): One row of a CSV/Parquet portfolio.
+
+    Returns:
+        Dict[str, Any]: Instrument dict.
+    """
+    instrument: Dict[str, Any] = {}
+    underlying: Dict[str, Any] = {}
+    for key, value in row.items():
+        if value is None:
+            continue
+        if key in FLAT_UNDERLYING_COLUMNS:
+            underlying[FLAT_UNDERLYING_COLUMNS[key]] = value
+        else:
+            instrument[key] = value
+    if underlying:
+        instrument["underlying"] = underlying
+    if "expiry" in instrument:
+        instrument["expiry"] = str(instrument["expiry"])
+    return instrument
+
+
+def _iter_jsonl_chunks(path: Path, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            chunk.append(json.loads(line))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_csv_chunks(path: Path, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    reader = pl.read_csv_batched(
+        path, batch_size=chunk_size, schema_overrides=FLAT_STRING_COLUMNS
+    )
+    while batches := reader.next_batches(1):
+        # batch_size is only a hint to the reader, so re-slice to chunk_size
+        for df in batches:
+            for offset in range(0, df.height, chunk_size):
+                yield [
+                    instrument_from_row(row)
+                    for row in df.slice(offset, chunk_size).iter_rows(named=True)
+                ]
+
+
+def _iter_parquet_chunks(path: Path, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    lf = pl.scan_parquet(path)
+    n_rows = lf.select(pl.len()).collect().item()
+    for offset in range(0, n_rows, chunk_size):
+        df = lf.slice(offset, chunk_size).collect()
+        yield [instrument_from_row(row) for row in df.iter_rows(named=True)]
+
+
+def iter_portfolio_chunks(
+    path: Union[str, Path], chunk_size: int = 10_000
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream a portfolio file as lists of at most `chunk_size` instrument dicts.
+
+    Supported formats, selected by file suffix:
+      .jsonl/.ndjson: one instrument JSON object per line
+      .csv/.parquet: one instrument per row, with the underlying given by
+        underlying_symbol/underlying_type columns
+
+    Args:
+        path (Union[str, Path]): Path to the portfolio file.
+        chunk_size (int): Maximum number of instruments held in memory.
+
+    Raises:
+        FileNotFoundError: if the file doesn't exist
+        ValueError: if the file format is not supported
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"Portfolio file not found at path: {path}")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be a positive integer.")
+
+    match p.suffix.lower():
+        case ".jsonl" | ".ndjson":
+            yield from _iter_jsonl_chunks(p, chunk_size)
+        case ".csv":
+            yield from _iter_csv_chunks(p, chunk_size)
+        case ".parquet" | ".pq":
+            yield from _iter_parquet_chunks(p, chunk_size)
+        case _:
+            raise ValueError(f"Unsupported portfolio file format: {p.suffix}")
+
+
+class PortfolioChunks:
+    """
+    Chunks of a portfolio file that are parsed once and can be iterated any
+    number of times, e.g. once per as-of date of a history run.
+
+    The first pass streams iter_portfolio_chunks() and keeps the parsed
+    chunks. Up to `memory_rows` instruments are kept as lists; once the book
+    is larger, all its chunks are pickled to an anonymous temporary file
+    instead and later passes unpickle them one at a time, so memory stays
+    bounded by one chunk. Call close() (or use it as a context manager) to
+    release the temporary file.
+
+    Args:
+        path (Union[str, Path]): Path to the portfolio file.
+        chunk_size (int): Maximum number of instruments per chunk.
+        memory_rows (int): Maximum number of instruments kept in memory.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        chunk_size: int = 10_000,
+        memory_rows: int = 1_000_000,
+    ) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self.memory_rows = memory_rows
+        self.n_rows = 0
+        self._chunks: List[List[Dict[str, Any]]] = []
+        self._n_chunks = 0
+        self._spill: Optional[IO[bytes]] = None
+        self._parsed = False
+
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        if not self._parsed:
+            yield from self._parse()
+        elif self._spill is None:
+            yield from self._chunks
+        else:
+            self._spill.seek(0)
+            for _ in range(self._n_chunks):
+                yield pickle.load(self._spill)
+
+    def _parse(self) -> Iterator[List[Dict[str, Any]]]:
+        # A pass abandoned half way through leaves nothing behind
+        self.close()
+        self.n_rows = self._n_chunks = 0
+        for chunk in iter_portfolio_chunks(self.path, self.chunk_size):
+            self.n_rows += len(chunk)
+            self._n_chunks += 1
+            if self._spill is None and self.n_rows > self.memory_rows:
+                self._spill = tempfile.TemporaryFile()
+                for kept in self._chunks:
+                    pickle.dump(kept, self._spill, pickle.HIGHEST_PROTOCOL)
+                self._chunks = []
+            if self._spill is None:
+                self._chunks.append(chunk)
+            else:
+                pickle.dump(chunk, self._spill, pickle.HIGHEST_PROTOCOL)
+            yield chunk
+        self._parsed = True
+
+    def close(self) -> None:
+        if self._spill is not None:
+            self._spill.close()
+        self._spill = None
+        self._chunks = []
+        self._parsed = False
+
+    def __enter__(self) -> "PortfolioChunks":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,134 @@
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from time import perf_counter
+from typing import Any, ContextManager, Dict, Iterator, List, Union
+import json
+import tracemalloc
+
+_NULL_CONTEXT = nullcontext()
+
+
+class NullProfiler:
+    """Profiler used when profiling is off: every hook is a no-op."""
+
+    enabled = False
+
+    def stage(self, name: str) -> ContextManager[Any]:
+        return _NULL_CONTEXT
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+
+class Profiler:
+    """
+    Per-stage wall clock timers and named counters for a run.
+
+    Stages may nest; each stage's time is inclusive of the stages inside it.
+    With `trace_memory` every stage also records the bytes it allocated and
+    its tracemalloc peak, which slows the run down noticeably. Tracing that
+    the profiler started is stopped by finish(), which set_profiler() calls
+    when the profiler is replaced.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self._memory_stack: List[List[int]] = []
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if self.trace_memory:
+            self._enter_memory_stage()
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            stats = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+            stats["calls"] += 1
+            stats["seconds"] += elapsed
+            if self.trace_memory:
+                allocated, peak = self._exit_memory_stage()
+                stats["allocated_bytes"] = stats.get("allocated_bytes", 0) + allocated
+                stats["peak_bytes"] = max(stats.get("peak_bytes", 0), peak)
+
+    def _enter_memory_stage(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if self._memory_stack:
+            # Keep the enclosing stage's peak before the reset below
+            self._memory_stack[-1][1] = max(self._memory_stack[-1][1], peak)
+        self._memory_stack.append([current, current])
+        tracemalloc.reset_peak()
+
+    def _exit_memory_stage(self) -> tuple[int, int]:
+        current, peak = tracemalloc.get_traced_memory()
+        start, stage_peak = self._memory_stack.pop()
+        stage_peak = max(stage_peak, peak)
+        if self._memory_stack:
+            self._memory_stack[-1][1] = max(self._memory_stack[-1][1], stage_peak)
+        return current - start, stage_peak - start
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self) -> None:
+        """Stop memory tracing if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"stages": self.stages, "counters": self.counters}
+
+    def write_json(self, path: Union[str, Path]) -> None:
+        json_file = Path(path)
+        json_file.parent.mkdir(parents=True, exist_ok=True)
+        json_file.write_text(json.dumps(self.to_dict(), indent=2))
+
+    def summary_table(self) -> str:
+        """Stage timings followed by the counters, as aligned text."""
+        lines = [f"\t{'Stage':<28}{'Calls':>8}{'Seconds':>12}{'ms/call':>10}"]
+        for name, stats in self.stages.items():
+            line = (
+                f"\t{name:<28}{stats['calls']:>8}{stats['seconds']:>12.6f}"
+                f"{1e3 * stats['seconds'] / stats['calls']:>10.3f}"
+            )
+            if "peak_bytes" in stats:
+                line += (
+                    f"  alloc {stats['allocated_bytes'] / 1024:,.1f} KiB"
+                    f"  peak {stats['peak_bytes'] / 1024:,.1f} KiB"
+                )
+            lines.append(line)
+        if self.counters:
+            lines.append(f"\t{'Counter':<28}{'Count':>8}")
+            for name, value in self.counters.items():
+                lines.append(f"\t{name:<28}{value:>8}")
+        return "\n".join(lines)
+
+
+NULL_PROFILER = NullProfiler()
+_ACTIVE_PROFILER: Union[Profiler, NullProfiler] = NULL_PROFILER
+
+
+def get_profiler() -> Union[Profiler, NullProfiler]:
+    """Return the active profiler (a NullProfiler unless profiling is on)."""
+    return _ACTIVE_PROFILER
+
+
+def set_profiler(profiler: Union[Profiler, NullProfiler, None]) -> None:
+    """
+    Install `profiler` as the active profiler; None turns profiling off. The
+    profiler it replaces is finished.
+    """
+    global _ACTIVE_PROFILER
+    if isinstance(_ACTIVE_PROFILER, Profiler) and _ACTIVE_PROFILER is not profiler:
+        _ACTIVE_PROFILER.finish()
+    _ACTIVE_PROFILER = profiler or NULL_PROFILER
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+from time import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+from python_quant.market_data.cache import thaw
+
+# Keys per SQL statement, well below SQLite's bound parameter limit
+_SQL_BATCH = 500
+# An over-full cache is evicted down to this fraction of max_bytes
+_EVICT_TO = 0.9
+# Layout of the stored values, part of every key: {"instrument": ..., "risk": ...}
+CACHE_FORMAT = 2
+
+
+def library_version() -> str:
+    """Installed python-quant version, part of every result cache key."""
+    try:
+        return metadata.version("python-quant")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _batches(items: Sequence[Any]) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(items), _SQL_BATCH):
+        yield items[start : start + _SQL_BATCH]
+
+
+class ResultCache:
+    """
+    Persistent, content-addressed cache of RISK output rows in a SQLite file.
+    Each value holds the instrument details and the risk metrics of a row as
+    separate dicts, {"instrument": {...}, "risk": {...}}.
+
+    A row is stored under result_key(), a hash of everything its value
+    depends on, so a rerun after a market data correction reprices only the
+    positions on the corrected underlyings: every other key is unchanged
+    and served from disk. Entries are never stale, only unused; once the
+    stored rows exceed `max_bytes` the least recently used ones are evicted.
+    invalidate() drops entries explicitly, e.g. after a pricing fix that
+    does not change the library version.
+
+    Args:
+        path: SQLite database file, created if missing.
+        max_bytes: Size budget of the stored rows.
+        version: Library version mixed into the keys; the installed one by
+            default.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = 256 * 2**20,
+        version: Optional[str] = None,
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError("Result cache size must be a positive number of bytes.")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.version = version or library_version()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+                "symbol TEXT, as_of_date TEXT, size INTEGER, last_used REAL, "
+                "value TEXT)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS results_lru ON results (last_used)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS results_symbol "
+                "ON results (symbol, as_of_date)"
+            )
+
+    def result_key(
+        self,
+        instrument: Mapping[str, Any],
+        as_of_date: datetime,
+        market_data: Mapping[str, Any],
+        higher_order: Sequence[str] = (),
+    ) -> str:
+        """
+        SHA-256 of the instrument, the market data it is priced from (its
+        underlying's entry and the rates), the as-of date, the pricer, the
+        requested greeks, the library version and the CACHE_FORMAT.
+        """
+        symbol = instrument["underlying"]["symbol"]
+        content = {
+            "instrument": thaw(instrument),
+            "market_data": {
+                symbol: thaw(market_data.get(symbol)),
+                "risk_free_rate": thaw(market_data.get("risk_free_rate")),
+                "dividend_yield": thaw(market_data.get("dividend_yield")),
+            },
+            "as_of_date": as_of_date.strftime("%Y%m%d"),
+            "pricer": (instrument.get("pricer") or "").upper(),
+            "higher_order": list(higher_order),
+            "version": self.version,
+            "format": CACHE_FORMAT,
+        }
+        encoded = json.dumps(
+            content, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached rows of the `keys` found, marking them as recently used."""
+        found: Dict[str, Dict[str, Any]] = {}
+        unique = list(dict.fromkeys(keys))
+        for batch in _batches(unique):
+            marks = ",".join("?" * len(batch))
+            rows = self._db.execute(
+                f"SELECT key, value FROM results WHERE key IN ({marks})", batch
+            )
+            found.update((key, json.loads(value)) for key, value in rows)
+        if found:
+            now = time()
+            with self._db:
+                self._db.executemany(
+                    "UPDATE results SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+        self.hits += sum(key in found for key in keys)
+        self.misses += sum(key not in found for key in keys)
+        return found
+
+    def put_many(
+        self,
+        keys: Sequence[str],
+        instruments: Sequence[Mapping[str, Any]],
+        as_of_date: datetime,
+        rows: Sequence[Mapping[str, Any]],
+    ) -> None:
+        """
+        Store output `rows` ({"instrument": ..., "risk": ...}) of
+        `instruments` under their `keys`.
+        """
+        now = time()
+        date_str = as_of_date.strftime("%Y%m%d")
+        entries = []
+        for key, instrument, row in zip(keys, instruments, rows, strict=True):
+            value = json.dumps(dict(row), default=str)
+            symbol = instrument["underlying"]["symbol"]
+            entries.append((key, symbol, date_str, len(value), now, value))
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", entries
+            )
+        self._evict()
+
+    def _evict(self) -> None:
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * _EVICT_TO)
+        stale: List[str] = []
+        for key, size in self._db.execute(
+            "SELECT key, size FROM results ORDER BY last_used, rowid"
+        ):
+            stale.append(key)
+            excess -= size
+            if excess <= 0:
+                break
+        with self._db:
+            for batch in _batches(stale):
+                marks = ",".join("?" * len(batch))
+                self._db.execute(f"DELETE FROM results WHERE key IN ({marks})", batch)
+        self.evictions += len(stale)
+
+    def invalidate(
+        self,
+        symbols: Optional[Sequence[str]] = None,
+        as_of_date: Optional[datetime] = None,
+    ) -> int:
+        """
+        Drop the cached rows of the underlyings in `symbols` (all of them if
+        None) as of `as_of_date` (every date if None).
+
+        Returns:
+            int: Number of rows dropped.
+        """
+        clauses, params = [], []
+        if symbols is not None:
+            clauses.append(f"symbol IN ({','.join('?' * len(symbols))})")
+            params.extend(symbols)
+        if as_of_date is not None:
+            clauses.append("as_of_date = ?")
+            params.append(as_of_date.strftime("%Y%m%d"))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._db:
+            return self._db.execute(f"DELETE FROM results{where}", params).rowcount
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def stats(self) -> Dict[str, int]:
+        entries, size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
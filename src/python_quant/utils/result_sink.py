@@ -0,0 +1,156 @@
+from pathlib import Path
+from typing import IO, Any, Dict, List, Mapping, Optional, Sequence, Union
+import sys
+import polars as pl
+
+# Option.to_dict() columns followed by the greeks of the RISK handlers
+OPTION_SCHEMA: Dict[str, Any] = {
+    "strike_price": pl.Float64,
+    "expiration_date": pl.Utf8,
+    "option_type": pl.Utf8,
+    "call_put": pl.Utf8,
+    "underlying_ticker": pl.Utf8,
+    "underlying_type": pl.Utf8,
+    "market_price": pl.Float64,
+    "volatility": pl.Float64,
+    "day_count_convention": pl.Utf8,
+}
+GREEK_SCHEMA: Dict[str, Any] = {
+    key: pl.Float64
+    for key in ("price", "implied_volatility", "delta", "gamma", "theta", "rho", "vega")
+}
+RESULT_SCHEMA: Dict[str, Any] = {**OPTION_SCHEMA, **GREEK_SCHEMA}
+# PRICE mode output: the option fields followed by the price only
+PRICE_SCHEMA: Dict[str, Any] = {**OPTION_SCHEMA, "price": pl.Float64}
+
+
+def result_schema(higher_order: Sequence[str] = ()) -> Dict[str, Any]:
+    """RESULT_SCHEMA followed by a Float64 column per requested greek."""
+    return {**RESULT_SCHEMA, **dict.fromkeys(higher_order, pl.Float64)}
+
+
+OUTPUT_FORMATS = {"CSV": "csv", "PARQUET": "parquet", "IPC": "arrow"}
+
+
+class ResultSink:
+    """
+    Buffered, appending writer of result rows with a fixed schema.
+
+    Batches passed to write() are cast to `schema` (missing columns become
+    nulls, extra columns are dropped) and buffered; once `batch_rows` rows
+    are buffered they are flushed as one unit:
+
+      CSV: appended to a single file (header written once), or to stdout
+        when no path is given.
+      PARQUET / IPC: written as the next part file (part-00000.parquet,
+        part-00001.parquet, ...) of the directory at `path`. Every part has
+        the same schema, so the directory reads as one dataset, e.g.
+        pl.scan_parquet("out/*.parquet") or, memory-mapped without parsing,
+        pl.read_ipc("out/part-00000.arrow", memory_map=True). Part files
+        already in the directory are deleted when the sink is opened.
+
+    Use it as a context manager, or call close() to flush the last batch.
+
+    Args:
+        path: Output CSV file or part file directory; None writes CSV to
+            stdout.
+        output_format: One of OUTPUT_FORMATS ("CSV", "PARQUET", "IPC").
+        schema: Ordered column names and polars dtypes of the output.
+        batch_rows: Number of buffered rows that triggers a flush.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        output_format: str = "CSV",
+        schema: Optional[Mapping[str, Any]] = None,
+        batch_rows: int = 65_536,
+    ) -> None:
+        self.output_format = output_format.upper()
+        if self.output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        if batch_rows < 1:
+            raise ValueError("Result sink batch size must be a positive integer.")
+        if path is None and self.output_format != "CSV":
+            raise ValueError(f"{self.output_format} output requires an output path.")
+
+        self.path = Path(path) if path is not None else None
+        self.schema = dict(schema or RESULT_SCHEMA)
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self.parts_written = 0
+        self._buffer: List[pl.DataFrame] = []
+        self._buffered_rows = 0
+        self._output: Optional[IO[bytes]] = None
+
+        if self.output_format == "CSV":
+            if self.path is None:
+                self._output = sys.stdout.buffer
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._output = self.path.open("wb")
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)  # type: ignore[union-attr]
+            # Like the CSV file, the dataset is replaced: part files left by
+            # an earlier run would otherwise be read back as part of this one
+            for extension in OUTPUT_FORMATS.values():
+                for stale in self.path.glob(f"part-*.{extension}"):  # type: ignore[union-attr]
+                    stale.unlink()
+
+    def write(self, batch: Union[pl.DataFrame, Mapping[str, Sequence[Any]]]) -> None:
+        """Buffer a frame (or dict of columns) and flush if the buffer is full."""
+        df = batch if isinstance(batch, pl.DataFrame) else pl.DataFrame(dict(batch))
+        self._buffer.append(self._conform(df))
+        self._buffered_rows += df.height
+        if self._buffered_rows >= self.batch_rows:
+            self.flush()
+
+    def write_rows(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Buffer row dicts, e.g. {**option.to_dict(), **greeks}."""
+        self.write(pl.DataFrame(list(rows)))
+
+    def _conform(self, df: pl.DataFrame) -> pl.DataFrame:
+        return df.select(
+            pl.col(name).cast(dtype)
+            if name in df.columns
+            else pl.lit(None, dtype=dtype).alias(name)
+            for name, dtype in self.schema.items()
+        )
+
+    def flush(self) -> None:
+        """Write the buffered rows as one CSV append or one part file."""
+        if not self._buffer:
+            return
+        df = pl.concat(self._buffer, how="vertical")
+        self._buffer, self._buffered_rows = [], 0
+
+        if self.output_format == "CSV":
+            df.write_csv(self._output, include_header=self.rows_written == 0)
+            self._output.flush()  # type: ignore[union-attr]
+        else:
+            part = self.path / (  # type: ignore[operator]
+                f"part-{self.parts_written:05d}.{OUTPUT_FORMATS[self.output_format]}"
+            )
+            if self.output_format == "PARQUET":
+                df.write_parquet(part)
+            else:
+                df.write_ipc(part)
+        self.parts_written += 1
+        self.rows_written += df.height
+
+    def close(self) -> None:
+        if self._output is None and self.output_format == "CSV":
+            return
+        self.flush()
+        if self.output_format == "CSV" and self.rows_written == 0:
+            # Header only, so that an empty run still yields a readable file
+            pl.DataFrame(schema=self.schema).write_csv(self._output)
+        if self._output is not None and self._output is not sys.stdout.buffer:
+            self._output.close()
+        self._output = None
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
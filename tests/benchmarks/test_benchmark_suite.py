@@ -0,0 +1,119 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import pytest
+from python_quant.benchmarks.suite import (
+    BENCHMARKS,
+    compare_to_baseline,
+    main,
+    results_to_dict,
+    run_scaling,
+    run_suite,
+)
+
+# Small books by default; e.g. PYQUANT_BENCH_SIZES=1,1000,100000 for more
+SIZES = [int(s) for s in os.environ.get("PYQUANT_BENCH_SIZES", "1,50").split(",")]
+# Reference results, refreshed with pyquant-bench when performance changes
+BASELINE = Path(__file__).parents[2] / "benchmarks" / "benchmarks.json"
+# Throughputs vary with the host and from run to run, so the comparison with
+# the baseline only runs with PYQUANT_BENCH_BASELINE=1, and by default only
+# slowdowns beyond 3x fail; set e.g. PYQUANT_BENCH_TOLERANCE=0.25 on the
+# host the baseline was recorded on
+RUN_BASELINE = os.environ.get("PYQUANT_BENCH_BASELINE", "") == "1"
+TOLERANCE = float(os.environ.get("PYQUANT_BENCH_TOLERANCE", "2.0"))
+
+
+def test_suite_records_every_benchmark():
+    """Every benchmark reports throughput, latency percentiles and memory."""
+    results = run_suite(sizes=SIZES)
+
+    assert [(r.name, r.size) for r in results] == [
+        (name, size) for name in BENCHMARKS for size in SIZES
+    ]
+    for result in results:
+        assert result.throughput > 0
+        assert result.latency_us["p50"] <= result.latency_us["p99"]
+        assert result.peak_memory_bytes > 0
+
+
+def test_baseline_comparison_flags_slowdowns():
+    """Throughput drops beyond the tolerance are reported as regressions."""
+    results = run_suite(sizes=[1], names=["bsm_price"], measure_memory=False)
+    baseline = results_to_dict(results)
+    assert compare_to_baseline(results, baseline) == []
+
+    baseline["results"][0]["throughput"] = 10.0 * results[0].throughput
+    regressions = compare_to_baseline(results, baseline, tolerance=0.25)
+    assert [r["name"] for r in regressions] == ["bsm_price"]
+
+
+@pytest.mark.skipif(
+    not RUN_BASELINE, reason="host dependent, set PYQUANT_BENCH_BASELINE=1 to run"
+)
+def test_no_regression_against_committed_baseline():
+    """The suite is not slower than the committed reference results."""
+    baseline = json.loads(BASELINE.read_text())
+    sizes = sorted({entry["size"] for entry in baseline["results"]})
+    names = list(dict.fromkeys(entry["name"] for entry in baseline["results"]))
+
+    # Timed in a child process: the coverage tracer of the test run slows the
+    # scalar pricing benchmarks down several times
+    with TemporaryDirectory() as directory:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "python_quant.benchmarks.suite",
+                "--sizes",
+                ",".join(str(size) for size in sizes),
+                "--benchmarks",
+                ",".join(names),
+                "--no_memory",
+                "--output",
+                str(Path(directory) / "benchmarks.json"),
+                "--baseline",
+                str(BASELINE),
+                "--tolerance",
+                str(TOLERANCE),
+            ],
+            capture_output=True,
+            text=True,
+        )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def test_entry_point_writes_json_and_fails_on_regression(capsys):
+    """
+    The CLI writes its results and exits non-zero against a faster baseline,
+    noting where the baseline's host differs.
+    """
+    with TemporaryDirectory() as tmpdirname:
+        output = Path(tmpdirname) / "bench.json"
+        args = ["--sizes", "1", "--benchmarks", "bsm_greeks", "--no_memory"]
+        assert main([*args, "--output", str(output)]) == 0
+
+        baseline = json.loads(output.read_text())
+        baseline["results"][0]["throughput"] *= 100.0
+        baseline["cpu_count"] = 128
+        baseline_path = Path(tmpdirname) / "baseline.json"
+        baseline_path.write_text(json.dumps(baseline))
+        assert (
+            main([*args, "--output", str(output), "--baseline", str(baseline_path)])
+            == 1
+        )
+    out = capsys.readouterr().out
+    assert f"Baseline cpu_count 128 differs from {os.cpu_count()}" in out
+    assert "REGRESSION bsm_greeks size 1" in out
+
+
+def test_sharded_risk_scaling_records_every_worker_count():
+    results = run_scaling(sizes=[20], workers=[1, 2], calls=1)
+
+    assert [(r.name, r.size) for r in results] == [
+        ("sharded_risk_1w", 20),
+        ("sharded_risk_2w", 20),
+    ]
+    assert all(r.throughput > 0 and r.peak_memory_bytes is None for r in results)
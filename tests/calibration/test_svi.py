@@ -0,0 +1,190 @@
+from datetime import datetime
+import json
+import numpy as np
+import polars as pl
+import pytest
+from python_quant.calibration.svi import (
+    SVIParameters,
+    SVISliceQuotes,
+    fit_svi_slice,
+    fit_svi_slices,
+    has_butterfly_arbitrage,
+    svi_jacobian,
+)
+from python_quant.market_data.vol_surface import (
+    SVISurface,
+    svi_total_variance,
+    vol_surface_from_market_data,
+)
+from python_quant.mode_handler import calibrate_mode
+from python_quant.mode_handler.calibrate_mode import calibrate_mode_main
+from python_quant.pricers.bsm_batch import BSMBatchPricer
+
+SPOT, RATE, DIVIDEND = 272.0, 0.05, 0.02
+TRUE_SLICES = {
+    "20260320": SVIParameters(a=0.01, b=0.08, rho=-0.5, m=0.02, sigma=0.15),
+    "20261218": SVIParameters(a=0.03, b=0.10, rho=-0.4, m=0.03, sigma=0.25),
+}
+
+
+def _quotes(params, tenor=0.75, initial=None):
+    k = np.linspace(-0.4, 0.3, 15)
+    return SVISliceQuotes(
+        "AAPL",
+        "20260707",
+        tenor,
+        SPOT,
+        k,
+        svi_total_variance(k, *params),
+        initial,
+    )
+
+
+def test_svi_jacobian_matches_finite_differences():
+    params = np.array(TRUE_SLICES["20261218"])
+    k = np.linspace(-0.5, 0.5, 11)
+    numeric = np.column_stack(
+        [
+            (
+                svi_total_variance(k, *(params + 1e-7 * e))
+                - svi_total_variance(k, *(params - 1e-7 * e))
+            )
+            / 2e-7
+            for e in np.eye(5)
+        ]
+    )
+    np.testing.assert_allclose(svi_jacobian(k, params), numeric, rtol=1e-6, atol=1e-9)
+
+
+def test_fit_recovers_slice_and_warm_start_saves_evaluations():
+    true = TRUE_SLICES["20261218"]
+    cold = fit_svi_slice(_quotes(true))
+    warm = fit_svi_slice(_quotes(true, initial=cold.params))
+
+    assert cold.success and not cold.butterfly_arbitrage
+    assert np.asarray(cold.params) == pytest.approx(np.asarray(true), abs=1e-4)
+    assert cold.rmse < 1e-6
+    assert warm.evaluations < cold.evaluations
+
+
+def test_fit_removes_butterfly_arbitrage():
+    """Quotes from an arbitrageable slice get an arbitrage-free fit."""
+    # Axel Vogt's example of a raw SVI slice with negative density
+    arbitrage = SVIParameters(a=-0.041, b=0.1331, rho=0.306, m=0.3586, sigma=0.4153)
+    quotes = _quotes(arbitrage, tenor=0.9)
+    assert has_butterfly_arbitrage(arbitrage, quotes.log_moneyness)
+
+    fitted = fit_svi_slice(quotes)
+    assert fitted.success and not fitted.butterfly_arbitrage
+    assert fitted.rmse < 0.005
+
+
+def test_parallel_fits_keep_input_order():
+    quotes = [
+        _quotes(params, tenor)
+        for params, tenor in zip(TRUE_SLICES.values(), (0.4, 1.2), strict=True)
+    ]
+    serial = fit_svi_slices(quotes, workers=1)
+    parallel = fit_svi_slices(quotes, workers=2)
+
+    assert [s.tenor for s in parallel] == [0.4, 1.2]
+    for a, b in zip(serial, parallel, strict=True):
+        assert np.asarray(a.params) == pytest.approx(np.asarray(b.params))
+
+
+def _chain(as_of):
+    """Quoted calls and puts priced at the TRUE_SLICES vols."""
+    rows = []
+    for expiry, params in TRUE_SLICES.items():
+        t = (datetime.strptime(expiry, "%Y%m%d") - as_of).days / 365.0
+        forward = SPOT * np.exp((RATE - DIVIDEND) * t)
+        strikes = np.linspace(200.0, 340.0, 15)
+        vols = np.sqrt(svi_total_variance(np.log(strikes / forward), *params) / t)
+        cp = np.where(strikes >= forward, 1.0, -1.0)
+        prices = BSMBatchPricer(SPOT, strikes, t, RATE, DIVIDEND, vols, cp).price()
+        for strike, flag, price in zip(strikes, cp, prices, strict=True):
+            rows.append(
+                {
+                    "type": "OPTION",
+                    "underlying_symbol": "AAPL",
+                    "underlying_type": "EQUITY",
+                    "option_type": "CALL" if flag > 0 else "PUT",
+                    "strike": float(strike),
+                    "expiry": expiry,
+                    "style": "EUROPEAN",
+                    "market_price": float(price),
+                }
+            )
+    return pl.DataFrame(rows)
+
+
+def _write_inputs(tmp_path, dates):
+    market_dir = tmp_path / "market_data"
+    market_dir.mkdir()
+    market_data = {
+        "risk_free_rate": RATE,
+        "dividend_yield": DIVIDEND,
+        "AAPL": {"spot_price": SPOT, "volatility": 0.35},
+    }
+    for date in dates:
+        (market_dir / f"{date}.json").write_text(json.dumps({date: market_data}))
+    _chain(datetime.strptime(dates[0], "%Y%m%d")).write_csv(tmp_path / "chain.csv")
+    return market_dir
+
+
+def test_calibrate_mode_writes_market_data_the_loader_reads(tmp_path):
+    """Fitted slices round-trip through the market data vol_surface."""
+    as_of = datetime(2025, 10, 10)
+    market_dir = _write_inputs(tmp_path, ["20251010"])
+
+    calibrate_mode_main(
+        calibrate={"output_path": str(tmp_path / "calibrated"), "workers": 2},
+        as_of_date="20251010",
+        verbose=None,
+        json_path=market_dir,
+        write_csv=True,
+        csv_path=str(tmp_path / "svi.csv"),
+        portfolio_path=tmp_path / "chain.csv",
+    )
+
+    params = pl.read_csv(tmp_path / "svi.csv", schema_overrides={"expiry": pl.Utf8})
+    assert params["expiry"].to_list() == list(TRUE_SLICES)
+    assert (params["rmse"] < 1e-5).all()
+    snapshot = json.loads((tmp_path / "calibrated" / "20251010.json").read_text())
+    surface = vol_surface_from_market_data(snapshot["20251010"]["AAPL"])
+    assert isinstance(surface, SVISurface)
+
+    t = (datetime(2026, 12, 18) - as_of).days / 365.0
+    forward = SPOT * np.exp((RATE - DIVIDEND) * t)
+    expected = np.sqrt(
+        svi_total_variance(np.log(250.0 / forward), *TRUE_SLICES["20261218"]) / t
+    )
+    assert surface.volatility(250.0, t) == pytest.approx(expected, rel=1e-5)
+
+
+def test_calibrate_mode_starts_one_pool_for_all_dates(tmp_path, monkeypatch):
+    """Every date's slices are fitted on the same process pool."""
+    pools = []
+    process_pool = calibrate_mode.process_pool
+
+    def counting_pool(workers):
+        pools.append(workers)
+        return process_pool(workers)
+
+    monkeypatch.setattr(calibrate_mode, "process_pool", counting_pool)
+    market_dir = _write_inputs(tmp_path, ["20251009", "20251010"])
+
+    calibrate_mode_main(
+        calibrate={"output_path": str(tmp_path / "calibrated"), "workers": 2},
+        as_of_date=None,
+        verbose=None,
+        json_path=market_dir,
+        write_csv=True,
+        csv_path=str(tmp_path / "svi.csv"),
+        portfolio_path=tmp_path / "chain.csv",
+        start_date="20251009",
+        end_date="20251010",
+    )
+
+    assert pools == [2]
+    assert len(list((tmp_path / "calibrated").glob("*.json"))) == 2
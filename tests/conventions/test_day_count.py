@@ -0,0 +1,90 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from python_quant.conventions.calendar import HolidayCalendar
+from python_quant.conventions.day_count import CONVENTIONS, DayCount
+from python_quant.instrument.option import Option
+from python_quant.instrument.option_book import OptionBook
+
+RNG = np.random.default_rng(7)
+STARTS = np.datetime64("2023-01-01") + RNG.integers(0, 1500, 200)
+ENDS = STARTS + RNG.integers(-400, 2000, 200)
+
+
+def _datetime(day: np.datetime64) -> datetime:
+    return datetime.fromisoformat(str(day))
+
+
+@pytest.mark.parametrize("convention", CONVENTIONS)
+def test_array_year_fractions_match_scalar(convention):
+    """year_fractions() agrees with year_fraction() pair by pair."""
+    day_count = DayCount(convention)
+    expected = [
+        day_count.year_fraction(_datetime(start), _datetime(end))
+        for start, end in zip(STARTS, ENDS, strict=True)
+    ]
+
+    assert day_count.year_fractions(STARTS, ENDS) == pytest.approx(expected)
+
+
+def test_act_act_isda_splits_leap_and_regular_years():
+    day_count = DayCount("act/act isda")
+    start, end = datetime(2023, 7, 1), datetime(2024, 7, 1)
+
+    assert day_count.year_fraction(start, end) == pytest.approx(184 / 365 + 182 / 366)
+    assert day_count.year_fraction(end, start) == pytest.approx(-184 / 365 - 182 / 366)
+
+
+def test_business_days_match_numpy_busday_count():
+    """Index lookups agree with numpy.busday_count, also past the index range."""
+    holidays = ["2024-12-25", "2025-01-01", "2025-07-04"]
+    calendar = HolidayCalendar(holidays, index_range=("2024-01-01", "2025-12-31"))
+    starts, ends = np.minimum(STARTS, ENDS), np.maximum(STARTS, ENDS)
+
+    assert calendar.business_days(starts, ends).tolist() == (
+        np.busday_count(starts, ends, holidays=holidays).tolist()
+    )
+    assert DayCount("BUS/252", calendar).year_fraction(
+        datetime(2024, 12, 23), datetime(2025, 1, 6)
+    ) == pytest.approx(8 / 252)
+
+
+def test_unsupported_convention_raises():
+    with pytest.raises(ValueError, match="Unsupported day count convention"):
+        DayCount("ACT/364").year_fractions(STARTS, ENDS)
+
+
+def test_times_to_maturity_of_many_options():
+    """Batch times to maturity match per-option ones, 0 once expired."""
+    as_of = datetime(2025, 10, 10)
+    options = [
+        Option(
+            100.0,
+            _datetime(expiry),
+            "AAPL",
+            "EQUITY",
+            None,
+            0.2,
+            conventions={"day_count_convention": convention},
+        )
+        for expiry, convention in zip(
+            ENDS[:20], ["ACT/365", "BUS/252", "ACT/ACT ISDA", "30/360"] * 5, strict=True
+        )
+    ]
+    expected = [option.time_to_maturity(as_of) for option in options]
+
+    assert Option.times_to_maturity(options, as_of) == pytest.approx(expected)
+    book = OptionBook.from_instruments(
+        [
+            {
+                "underlying": {"symbol": "AAPL", "type": "EQUITY"},
+                "option_type": "CALL",
+                "strike": 100.0,
+                "expiry": str(expiry).replace("-", ""),
+            }
+            for expiry in ENDS[:20]
+        ]
+    )
+    assert book.time_to_maturity(as_of) == pytest.approx(
+        Option.times_to_maturity(book.options(), as_of)
+    )
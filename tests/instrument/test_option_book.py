@@ -0,0 +1,88 @@
+from datetime import datetime
+import numpy as np
+import polars as pl
+import pytest
+from python_quant.instrument.option import Option
+from python_quant.instrument.option_book import OptionBook
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    option_from_instrument,
+)
+
+FRAME = pl.DataFrame(
+    {
+        "type": ["OPTION"] * 6,
+        "underlying_symbol": ["MSFT", "AAPL", "AAPL", "MSFT", "AAPL", "AAPL"],
+        "underlying_type": ["EQUITY"] * 6,
+        "option_type": ["CALL", "PUT", "CALL", "PUT", "CALL", "PUT"],
+        "strike": [400.0, 280.0, 300.0, 410.0, 250.0, 260.0],
+        "expiry": [
+            "20261220",
+            "20261220",
+            "20260620",
+            "20261220",
+            "20261220",
+            "20260620",
+        ],
+        "style": ["EUROPEAN", "EUROPEAN", "AMERICAN", None, "EUROPEAN", "EUROPEAN"],
+        "market_price": [None, 15.7, None, None, None, 9.5],
+    }
+)
+
+
+def test_book_is_built_from_a_frame():
+    """Columns are stored as typed contiguous arrays."""
+    book = OptionBook.from_frame(FRAME)
+
+    assert len(book) == 6
+    assert book.expiry.dtype == np.dtype("datetime64[D]")
+    assert book.expiry[0] == np.datetime64("2026-12-20")
+    assert book.cp_flag.tolist() == [1, -1, 1, -1, 1, -1]
+    assert book.underlyings == (("AAPL", "EQUITY"), ("MSFT", "EQUITY"))
+    assert book.underlying_id.tolist() == [1, 0, 0, 1, 0, 0]
+    assert np.isnan(book.market_price[0]) and book.market_price[1] == 15.7
+
+
+def test_sorted_book_slices_without_copying():
+    """Underlying and chain slices of a sorted book are views."""
+    book = OptionBook.from_frame(FRAME).sorted()
+    aapl = book.by_underlying("AAPL")
+    chain = book.chain("AAPL", "20261220")
+
+    assert np.shares_memory(aapl.strike, book.strike)
+    assert np.shares_memory(chain.strike, book.strike)
+    assert sorted(chain.strike.tolist()) == [250.0, 280.0]
+    assert sorted(aapl.index.tolist()) == [1, 2, 4, 5]
+    assert [(s, str(e), len(c)) for s, e, c in book.groups()] == [
+        ("AAPL", "2026-06-20", 2),
+        ("AAPL", "2026-12-20", 2),
+        ("MSFT", "2026-12-20", 2),
+    ]
+
+
+@pytest.mark.parametrize("row", range(6))
+def test_option_views_match_instrument_options(row):
+    """Views carry the same fields as Options built from instrument dicts."""
+    record = FRAME.row(row, named=True)
+    instrument = {
+        **record,
+        "underlying": {"symbol": record["underlying_symbol"], "type": "EQUITY"},
+    }
+    market_data = {record["underlying_symbol"]: {"volatility": 0.3}}
+    expected = option_from_instrument(instrument, market_data)
+    view = OptionBook.from_frame(FRAME).option(row, volatility=0.3)
+
+    assert view.to_dict() == expected.to_dict()
+    assert view.time_to_maturity(datetime(2025, 10, 10)) == pytest.approx(
+        expected.time_to_maturity(datetime(2025, 10, 10))
+    )
+
+
+def test_views_share_underlying_and_day_count():
+    """Views of one underlying share their dict and DayCount; no __dict__."""
+    book = OptionBook.from_frame(FRAME)
+    first, second = book.option(1), book.option(2)
+
+    assert first.underlying is second.underlying
+    assert first.day_count_convention is second.day_count_convention
+    assert not hasattr(first, "__dict__")
+    assert isinstance(first, Option)
@@ -0,0 +1,64 @@
+import json
+import os
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import pytest
+from python_quant.market_data.cache import MarketDataCache
+
+LOGGER = getLogger("test")
+
+
+def _write_snapshot(path: Path, date: str, spot: float) -> None:
+    data = {date: {"risk_free_rate": 0.05, "AAPL": {"spot_price": spot}}}
+    path.joinpath(f"{date}.json").write_text(json.dumps(data))
+
+
+def test_cache_hits_and_returns_read_only_views():
+    """Repeated loads are served from the cache and cannot be mutated."""
+    with TemporaryDirectory() as tmpdirname:
+        _write_snapshot(Path(tmpdirname), "20251010", 272.0)
+        cache = MarketDataCache()
+        first = cache.load(datetime(2025, 10, 10), LOGGER, tmpdirname)
+        second = cache.load(datetime(2025, 10, 10), LOGGER, tmpdirname)
+
+    assert first is second
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "evictions": 0}
+    with pytest.raises(TypeError):
+        first["20251010"]["AAPL"]["spot_price"] = 0.0  # type: ignore
+
+
+def test_cache_reloads_modified_file():
+    """A snapshot edited on disk is parsed again."""
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname)
+        cache = MarketDataCache()
+        _write_snapshot(path, "20251010", 272.0)
+        cache.load(datetime(2025, 10, 10), LOGGER, tmpdirname)
+
+        _write_snapshot(path, "20251010", 275.5)
+        stat = path.joinpath("20251010.json").stat()
+        os.utime(
+            path / "20251010.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+        )
+        reloaded = cache.load(datetime(2025, 10, 10), LOGGER, tmpdirname)
+
+    assert reloaded["20251010"]["AAPL"]["spot_price"] == 275.5
+    assert cache.misses == 2
+
+
+def test_cache_evicts_least_recently_used():
+    """The oldest snapshot is evicted once the size limit is reached."""
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname)
+        for day in ("20251008", "20251009", "20251010"):
+            _write_snapshot(path, day, 272.0)
+        cache = MarketDataCache(max_entries=2)
+        cache.load(datetime(2025, 10, 8), LOGGER, tmpdirname)
+        cache.load(datetime(2025, 10, 9), LOGGER, tmpdirname)
+        cache.load(datetime(2025, 10, 8), LOGGER, tmpdirname)
+        cache.load(datetime(2025, 10, 10), LOGGER, tmpdirname)
+        cache.load(datetime(2025, 10, 8), LOGGER, tmpdirname)
+
+    assert cache.stats() == {"entries": 2, "hits": 2, "misses": 3, "evictions": 1}
@@ -0,0 +1,125 @@
+from datetime import datetime
+from logging import getLogger
+import numpy as np
+from python_quant.market_data.curves import (
+    Curve,
+    curve_from_market_data,
+    rates_to_maturity,
+)
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    risk_mode_option_batch_handler,
+    risk_mode_option_handler,
+)
+
+YIELD_CURVE = {
+    "tenors": [0.25, 0.5, 1.0, 2.0, 5.0],
+    "rates": [0.043, 0.042, 0.040, 0.038, 0.039],
+    "interpolation": "LOG_LINEAR",
+}
+DIVIDEND_CURVE = {
+    "tenors": [0.5, 1.0, 3.0],
+    "rates": [0.010, 0.015, 0.020],
+    "interpolation": "MONOTONE_CUBIC",
+}
+
+
+def test_log_linear_curve_has_flat_forwards_between_pillars():
+    curve = Curve.from_dict(YIELD_CURVE)
+    np.testing.assert_allclose(curve.zero_rate(curve.tenors), curve.rates, rtol=1e-14)
+
+    # Forward between the 1y and 2y pillars, flat past the last pillar
+    forward = (0.038 * 2.0 - 0.040 * 1.0) / 1.0
+    np.testing.assert_allclose(curve.forward_rate([1.2, 1.9]), forward, rtol=1e-12)
+    np.testing.assert_allclose(
+        curve.forward_rate([6.0, 30.0]), (0.039 * 5.0 - 0.038 * 2.0) / 3.0
+    )
+    np.testing.assert_allclose(
+        curve.discount([1.5]), np.exp(-(0.040 + 0.5 * forward)), rtol=1e-14
+    )
+    assert curve.zero_rate(0.0) == curve.forward_rate(0.1) == 0.043
+
+
+def test_monotone_cubic_matches_pchip():
+    from scipy.interpolate import PchipInterpolator
+
+    curve = Curve.from_dict(DIVIDEND_CURVE)
+    pchip = PchipInterpolator(
+        np.r_[0.0, curve.tenors], np.r_[0.0, curve.tenors * curve.rates]
+    )
+    t = np.linspace(0.0, 3.0, 301)
+    np.testing.assert_allclose(-np.log(curve.discount(t)), pchip(t), atol=1e-15)
+    np.testing.assert_allclose(curve.forward_rate(t), pchip.derivative()(t), atol=1e-15)
+
+
+def test_repeat_maturities_match_scalar_lookups():
+    curve = Curve.from_dict(DIVIDEND_CURVE)
+    t = np.array([[1.19, 0.3, 1.19], [0.3, 1.19, 4.0]])
+    rates = curve.zero_rate(t)
+    assert rates.shape == t.shape
+    for value, rate in zip(t.ravel(), rates.ravel(), strict=True):
+        assert curve.zero_rate(value) == rate
+    np.testing.assert_allclose(Curve.flat(0.05).zero_rate(t), 0.05, rtol=1e-15)
+
+
+def test_curves_are_built_once_per_snapshot():
+    market_data = {"risk_free_rate": YIELD_CURVE, "dividend_yield": 0.02}
+    curve = curve_from_market_data(market_data["risk_free_rate"])
+    assert curve is curve_from_market_data(market_data["risk_free_rate"])
+    assert curve_from_market_data(0.02) is None
+
+    r, d = rates_to_maturity(market_data, 1.5)
+    assert (r, d) == (float(curve.zero_rate(1.5)), 0.02)
+    r, d = rates_to_maturity(market_data, np.array([0.5, 1.5]))
+    np.testing.assert_array_equal(d, [0.02, 0.02])
+
+
+def test_handlers_discount_off_the_curves():
+    """Single and batch handlers price at the zero rates to each expiry."""
+    market_data = {
+        "risk_free_rate": YIELD_CURVE,
+        "dividend_yield": DIVIDEND_CURVE,
+        "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+    }
+    instruments = [
+        {
+            "type": "OPTION",
+            "underlying": {"type": "EQUITY", "symbol": "AAPL"},
+            "option_type": option_type,
+            "strike": 270.0,
+            "expiry": expiry,
+            "style": style,
+        }
+        for expiry in ("20260320", "20271217")
+        for option_type, style in [
+            ("CALL", "EUROPEAN"),
+            ("PUT", "EUROPEAN"),
+            ("PUT", "AMERICAN"),
+        ]
+    ]
+    as_of = datetime(2025, 10, 10)
+    logger = getLogger("test")
+    options, risk = risk_mode_option_batch_handler(
+        instruments, as_of, market_data, logger
+    )
+
+    for i, instrument in enumerate(instruments):
+        option_dict, single = risk_mode_option_handler(
+            instrument, as_of, market_data, logger
+        )
+        assert options.row(i, named=True) == option_dict
+        np.testing.assert_allclose(risk["price"][i], single["price"], rtol=1e-10)
+        np.testing.assert_allclose(risk["rho"][i], single["rho"], rtol=1e-6)
+
+    # Put-call parity with the curves' discount factors
+    T = np.array(
+        [
+            (datetime(*expiry) - as_of).days / 365
+            for expiry in [(2026, 3, 20), (2027, 12, 17)]
+        ]
+    )
+    parity = 272.0 * Curve.from_dict(DIVIDEND_CURVE).discount(T) - 270.0 * (
+        Curve.from_dict(YIELD_CURVE).discount(T)
+    )
+    np.testing.assert_allclose(
+        risk["price"][[0, 3]] - risk["price"][[1, 4]], parity, rtol=1e-10
+    )
@@ -0,0 +1,104 @@
+from datetime import datetime
+from logging import getLogger
+import numpy as np
+from python_quant.market_data.vol_surface import (
+    VolSurface,
+    vol_surface_from_market_data,
+)
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    risk_mode_option_batch_handler,
+    risk_mode_option_handler,
+)
+
+SURFACE = {
+    "axis": "STRIKE",
+    "tenors": [0.25, 0.5, 1.0, 2.0],
+    "strikes": [200.0, 250.0, 300.0, 350.0],
+    "vols": [
+        [0.42, 0.36, 0.33, 0.34],
+        [0.40, 0.35, 0.32, 0.33],
+        [0.38, 0.34, 0.31, 0.32],
+        [0.36, 0.33, 0.30, 0.31],
+    ],
+}
+
+
+def test_surface_recovers_grid_nodes():
+    """Lookups on grid nodes return the quoted vols."""
+    surface = VolSurface.from_dict(SURFACE)
+    K, T = np.meshgrid(SURFACE["strikes"], SURFACE["tenors"])
+    np.testing.assert_allclose(surface.volatility(K, T), SURFACE["vols"])
+
+
+def test_surface_extrapolates_flat_and_broadcasts():
+    """Off-grid strikes and tenors take the edge vols; inputs broadcast."""
+    surface = VolSurface.from_dict(SURFACE)
+    assert surface.volatility(100.0, 0.25) == 0.42
+    assert surface.volatility(400.0, 5.0) == 0.31
+    assert surface.volatility(np.full((3, 2), 275.0), 0.75).shape == (3, 2)
+
+
+def test_surface_interpolates_total_variance_in_time():
+    """Between tenors the total variance is linear in time."""
+    surface = VolSurface.from_dict(SURFACE)
+    vol = surface.volatility(250.0, 0.75)
+    expected = 0.5 * (0.35**2 * 0.5 + 0.34**2 * 1.0)
+    np.testing.assert_allclose(vol**2 * 0.75, expected)
+
+
+def test_moneyness_surface_scales_by_spot():
+    """A moneyness surface is looked up at K / S."""
+    surface = VolSurface(
+        tenors=[1.0],
+        axis_values=[0.8, 1.0, 1.2],
+        vols=[[0.3, 0.2, 0.25]],
+        axis="MONEYNESS",
+    )
+    np.testing.assert_allclose(
+        surface.volatility([80.0, 100.0], 1.0, spot=100.0), [0.3, 0.2]
+    )
+
+
+def test_surface_is_built_once_per_snapshot():
+    """The same market data spec returns the same surface object."""
+    ticker_data = {"spot_price": 272.0, "vol_surface": SURFACE}
+    assert vol_surface_from_market_data(ticker_data) is vol_surface_from_market_data(
+        ticker_data
+    )
+    assert vol_surface_from_market_data({"spot_price": 272.0}) is None
+
+
+def test_handlers_price_off_the_surface():
+    """Single and batch handlers use the surface vol instead of the flat vol."""
+    market_data = {
+        "risk_free_rate": 0.05,
+        "dividend_yield": 0.02,
+        "AAPL": {"spot_price": 272.0, "volatility": 0.9, "vol_surface": SURFACE},
+    }
+    instruments = [
+        {
+            "type": "OPTION",
+            "underlying": {"type": "EQUITY", "symbol": "AAPL"},
+            "option_type": option_type,
+            "strike": strike,
+            "expiry": "20261220",
+            "style": "EUROPEAN",
+        }
+        for option_type, strike in [("CALL", 260.0), ("PUT", 310.0)]
+    ]
+    as_of = datetime(2025, 10, 10)
+    logger = getLogger("test")
+    options, risk = risk_mode_option_batch_handler(
+        instruments, as_of, market_data, logger
+    )
+
+    for i, instrument in enumerate(instruments):
+        option_dict, single = risk_mode_option_handler(
+            instrument, as_of, market_data, logger
+        )
+        assert options.row(i, named=True) == option_dict
+        assert single["implied_volatility"] < 0.5
+        np.testing.assert_allclose(risk["price"][i], single["price"], rtol=1e-10)
+        np.testing.assert_allclose(
+            risk["implied_volatility"][i], single["implied_volatility"], rtol=1e-12
+        )
@@ -0,0 +1,101 @@
+import json
+from datetime import datetime
+from logging import getLogger
+import polars as pl
+import pytest
+from python_quant.mode_handler.parallel_risk import (
+    ShardedRiskRunner,
+    load_market_data,
+    publish_market_data,
+)
+from python_quant.mode_handler.risk_mode import (
+    risk_mode_batch,
+    risk_mode_portfolio_main,
+)
+from python_quant.utils.result_cache import ResultCache
+
+AS_OF = datetime(2025, 10, 10)
+LOGGER = getLogger("test")
+MARKET_DATA = {
+    "risk_free_rate": 0.05,
+    "dividend_yield": 0.02,
+    "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+    "MSFT": {"spot_price": 510.0, "volatility": 0.25},
+}
+
+
+def _instrument(symbol, strike, style, **fields):
+    return {
+        "type": "OPTION",
+        "underlying": {"type": "EQUITY", "symbol": symbol},
+        "option_type": "PUT" if strike % 20 else "CALL",
+        "strike": strike,
+        "expiry": "20261220",
+        "style": style,
+        **fields,
+    }
+
+
+INSTRUMENTS = [
+    _instrument(symbol, strike, style)
+    for symbol, spot in (("AAPL", 272.0), ("MSFT", 510.0))
+    for strike in (0.8 * spot, 0.9 * spot, spot, 1.1 * spot)
+    for style in ("EUROPEAN", "AMERICAN")
+] + [_instrument("AAPL", 300.0, "AMERICAN", pricer="PDE", market_price=40.0)]
+SHARDS = [INSTRUMENTS[i : i + 3] for i in range(0, len(INSTRUMENTS), 3)]
+
+
+def test_market_data_round_trips_through_shared_memory():
+    block, snapshot = publish_market_data(MARKET_DATA)
+    try:
+        assert load_market_data(snapshot) == MARKET_DATA
+    finally:
+        block.close()
+        block.unlink()
+    with pytest.raises(FileNotFoundError):
+        load_market_data(snapshot)
+
+
+def test_sharded_run_matches_serial_batches(tmp_path):
+    serial = [risk_mode_batch(shard, AS_OF, MARKET_DATA, LOGGER) for shard in SHARDS]
+
+    with (
+        ResultCache(tmp_path / "cache.sqlite") as cache,
+        ShardedRiskRunner(
+            AS_OF, MARKET_DATA, LOGGER, workers=2, result_cache=cache
+        ) as runner,
+    ):
+        parallel = list(runner.run(SHARDS))
+        cached = list(runner.run(SHARDS))
+        assert cache.stats()["hits"] == len(INSTRUMENTS)
+
+    assert len(parallel) == len(serial)
+    for parallel_df, cached_df, serial_df in zip(parallel, cached, serial, strict=True):
+        assert parallel_df.equals(serial_df)
+        assert cached_df.select(serial_df.columns).equals(serial_df)
+
+
+def test_portfolio_output_does_not_depend_on_workers(tmp_path):
+    portfolio = tmp_path / "book.jsonl"
+    portfolio.write_text("\n".join(json.dumps(i) for i in INSTRUMENTS))
+    market_data = tmp_path / "market_data"
+    market_data.mkdir()
+    (market_data / "20251010.json").write_text(json.dumps({"20251010": MARKET_DATA}))
+
+    outputs = []
+    for workers in (1, 3):
+        csv_path = tmp_path / f"risk_{workers}.csv"
+        risk_mode_portfolio_main(
+            portfolio_path=portfolio,
+            as_of_date="20251010",
+            verbose=None,
+            json_path=market_data,
+            write_csv=True,
+            csv_path=str(csv_path),
+            chunk_size=4,
+            workers=workers,
+        )
+        outputs.append(csv_path.read_bytes())
+
+    assert outputs[0] == outputs[1]
+    assert pl.read_csv(tmp_path / "risk_3.csv").height == len(INSTRUMENTS)
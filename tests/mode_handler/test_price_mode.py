@@ -0,0 +1,107 @@
+import json
+from datetime import datetime
+from logging import getLogger
+import numpy as np
+import polars as pl
+import pytest
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    risk_mode_option_batch_handler,
+)
+from python_quant.mode_handler.price_mode import price_mode_main, price_option_batch
+from python_quant.pricers.bsm_batch import BSMBatchPricer, bsm_price
+
+AS_OF = datetime(2025, 10, 10)
+MARKET_DATA = {
+    "risk_free_rate": 0.05,
+    "dividend_yield": 0.02,
+    "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+    "MSFT": {"spot_price": 510.0, "volatility": 0.25},
+}
+
+
+def _instrument(symbol, option_type, strike, style="EUROPEAN", **fields):
+    return {
+        "type": "OPTION",
+        "underlying": {"type": "EQUITY", "symbol": symbol},
+        "option_type": option_type,
+        "strike": strike,
+        "expiry": "20261220",
+        "style": style,
+        **fields,
+    }
+
+
+INSTRUMENTS = [
+    _instrument("AAPL", "PUT", 280.0, market_price=15.7),
+    _instrument("AAPL", "CALL", 300.0),
+    _instrument("MSFT", "CALL", 500.0),
+    _instrument("AAPL", "PUT", 280.0, style="AMERICAN"),
+    _instrument("AAPL", "PUT", 260.0, style="AMERICAN"),
+    _instrument(
+        "MSFT",
+        "PUT",
+        520.0,
+        style="BERMUDAN",
+        exercise_dates=["20260320", "20260619", "20260918"],
+    ),
+]
+
+
+def test_bsm_price_matches_batch_pricer():
+    inputs = {
+        "spot": 272.0,
+        "strike": np.array([200.0, 272.0, 350.0, 90.0, 300.0]),
+        "time_to_maturity": np.array([0.1, 1.0, 2.0, 0.0, 0.5]),
+        "risk_free_rate": 0.05,
+        "dividend_yield": 0.02,
+        "volatility": np.array([0.2, 0.35, 0.5, 0.3, 0.0]),
+        "cp_flag": np.array([1.0, -1.0, 1.0, 1.0, -1.0]),
+    }
+
+    np.testing.assert_allclose(
+        bsm_price(**inputs), BSMBatchPricer(**inputs).price(), rtol=1e-12
+    )
+
+
+def test_prices_match_risk_mode():
+    """Quoted, European, tree priced and expired positions agree with RISK mode."""
+    expired = [
+        _instrument("AAPL", "PUT", 280.0, expiry="20251009", market_price=8.5),
+        _instrument("MSFT", "PUT", 520.0, style="AMERICAN", expiry="20251009"),
+    ]
+    logger = getLogger("test")
+    df = price_option_batch(INSTRUMENTS + expired, AS_OF, MARKET_DATA, logger)
+    options, risk = risk_mode_option_batch_handler(
+        INSTRUMENTS + expired, AS_OF, MARKET_DATA, logger
+    )
+
+    assert df.drop("price").equals(options)
+    assert df["price"].to_numpy() == pytest.approx(
+        risk["price"], rel=1e-10, nan_ok=True
+    )
+    assert df["price"][0] == 15.7
+    assert np.isnan(df["price"].to_numpy()[-2:]).all()
+
+
+def test_price_mode_writes_prices_only(tmp_path):
+    market_dir = tmp_path / "market_data"
+    market_dir.mkdir()
+    (market_dir / "20251010.json").write_text(json.dumps({"20251010": MARKET_DATA}))
+    portfolio = tmp_path / "book.jsonl"
+    portfolio.write_text("\n".join(json.dumps(i) for i in INSTRUMENTS))
+
+    price_mode_main(
+        as_of_date="20251010",
+        verbose=None,
+        json_path=market_dir,
+        write_csv=True,
+        csv_path=str(tmp_path / "prices.csv"),
+        portfolio_path=portfolio,
+        chunk_size=4,
+    )
+    df = pl.read_csv(tmp_path / "prices.csv")
+
+    assert df.columns[-1] == "price"
+    assert "delta" not in df.columns
+    assert df.height == len(INSTRUMENTS)
+    assert df["price"].is_finite().all()
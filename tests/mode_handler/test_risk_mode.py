@@ -0,0 +1,82 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import polars as pl
+from python_quant.mode_handler.risk_mode import history_dates, risk_mode_history_main
+
+INSTRUMENT = {
+    "type": "OPTION",
+    "underlying": {"type": "EQUITY", "symbol": "AAPL"},
+    "option_type": "PUT",
+    "strike": 280.0,
+    "expiry": "20251009",
+    "style": "EUROPEAN",
+}
+
+
+def _write_market_data(path: Path, dates):
+    for i, date in enumerate(dates):
+        data = {
+            date: {
+                "risk_free_rate": 0.05,
+                "dividend_yield": 0.02,
+                "AAPL": {"spot_price": 270.0 + i, "volatility": 0.3},
+            }
+        }
+        path.joinpath(f"{date}.json").write_text(json.dumps(data))
+
+
+def test_history_dates_skips_missing_market_data():
+    """Only dates with a market data file are kept."""
+    with TemporaryDirectory() as tmpdirname:
+        _write_market_data(Path(tmpdirname), ["20251006", "20251008"])
+        from_range = history_dates(tmpdirname, "20251005", "20251009")
+        from_list = history_dates(tmpdirname, dates=["20251008", "20251007"])
+
+    assert from_range == [datetime(2025, 10, 6), datetime(2025, 10, 8)]
+    assert from_list == [datetime(2025, 10, 8)]
+
+
+def test_risk_mode_history_writes_one_time_series():
+    """
+    Every date lands in one output; options are priced on their expiry date
+    and drop out after it.
+    """
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname)
+        _write_market_data(path, ["20251006", "20251007", "20251009", "20251010"])
+        portfolio = path / "book.jsonl"
+        portfolio.write_text(
+            "\n".join(
+                json.dumps(i)
+                for i in (INSTRUMENT, {**INSTRUMENT, "expiry": "20261220"})
+            )
+        )
+        csv_path = path / "history.csv"
+        risk_mode_history_main(
+            verbose="",
+            json_path=tmpdirname,
+            write_csv=True,
+            csv_path=str(csv_path),
+            portfolio_path=portfolio,
+            start_date="20251006",
+            end_date="20251010",
+        )
+        df = pl.read_csv(csv_path)
+
+    assert df.columns[0] == "as_of_date"
+    assert df["as_of_date"].to_list() == [
+        20251006,
+        20251006,
+        20251007,
+        20251007,
+        20251009,
+        20251009,
+        20251010,
+    ]
+    # The put expiring on 20251009 is worth its intrinsic value that day
+    expiring = df.filter(
+        (pl.col("as_of_date") == 20251009) & (pl.col("expiration_date") == "2025-10-09")
+    )
+    assert expiring["price"].to_list() == [280.0 - 272.0]
@@ -0,0 +1,160 @@
+from datetime import datetime
+from logging import getLogger
+import numpy as np
+import pytest
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    risk_mode_option_batch_handler,
+    risk_mode_option_handler,
+)
+
+AS_OF = datetime(2025, 10, 10)
+MARKET_DATA = {
+    "risk_free_rate": 0.05,
+    "dividend_yield": 0.02,
+    "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+}
+
+
+def _instrument(option_type, strike, market_price=None):
+    instrument = {
+        "type": "OPTION",
+        "underlying": {"type": "EQUITY", "symbol": "AAPL"},
+        "option_type": option_type,
+        "strike": strike,
+        "expiry": "20261220",
+        "style": "EUROPEAN",
+    }
+    if market_price is not None:
+        instrument["market_price"] = market_price
+    return instrument
+
+
+def test_batch_handler_matches_single_handler():
+    """Batch handler reproduces the single-instrument handler."""
+    instruments = [
+        _instrument("PUT", 280.0, market_price=15.7),
+        _instrument("CALL", 300.0),
+        _instrument("CALL", 250.0, market_price=60.0),
+    ]
+    logger = getLogger("test")
+    options, risk = risk_mode_option_batch_handler(
+        instruments, AS_OF, MARKET_DATA, logger
+    )
+
+    for i, instrument in enumerate(instruments):
+        expected_dict, expected_risk = risk_mode_option_handler(
+            instrument, AS_OF, MARKET_DATA, logger
+        )
+        assert options.row(i, named=True) == expected_dict
+        for key, value in expected_risk.items():
+            assert risk[key][i] == pytest.approx(value, rel=1e-6)
+
+
+def test_batch_handler_flags_arbitrage_violation():
+    """A price below intrinsic value gets NaN greeks without failing."""
+    instruments = [
+        _instrument("CALL", 100.0, market_price=1.0),
+        _instrument("PUT", 280.0),
+    ]
+    _, risk = risk_mode_option_batch_handler(
+        instruments, AS_OF, MARKET_DATA, getLogger("test")
+    )
+    assert risk["price"][0] == 1.0
+    assert np.isnan(risk["delta"][0])
+    assert np.isfinite(risk["delta"][1])
+
+
+def test_batch_handler_flags_expired_options(caplog):
+    """Expired positions get NaN greeks and a warning, not a failed batch."""
+    expired = {**_instrument("CALL", 250.0, market_price=30.0), "expiry": "20251009"}
+    american = {**expired, "style": "AMERICAN"}
+    expiring = {**_instrument("PUT", 280.0), "expiry": "20251010"}
+    instruments = [expired, _instrument("PUT", 280.0), american, expiring]
+    with caplog.at_level("WARNING"):
+        _, risk = risk_mode_option_batch_handler(
+            instruments, AS_OF, MARKET_DATA, getLogger("test")
+        )
+
+    assert "2 options have expired" in caplog.text
+    for key in risk:
+        assert np.isnan(risk[key][[0, 2]]).all()
+    assert np.isfinite(risk["delta"][1])
+    # Options expiring on the as-of date are still priced
+    assert risk["price"][3] == pytest.approx(280.0 - 272.0)
+
+
+def test_batch_handler_prices_american_and_bermudan_on_trees():
+    """Early-exercise styles go through the tree and match the single path."""
+    american = {**_instrument("PUT", 280.0), "style": "AMERICAN"}
+    bermudan = {
+        **_instrument("PUT", 300.0, market_price=45.0),
+        "style": "BERMUDAN",
+        "exercise_dates": ["20260320", "20260619", "20260918"],
+    }
+    instruments = [american, _instrument("PUT", 280.0), bermudan]
+    logger = getLogger("test")
+    _, risk = risk_mode_option_batch_handler(instruments, AS_OF, MARKET_DATA, logger)
+
+    for i, instrument in enumerate(instruments):
+        _, expected_risk = risk_mode_option_handler(
+            instrument, AS_OF, MARKET_DATA, logger
+        )
+        for key, value in expected_risk.items():
+            assert risk[key][i] == pytest.approx(value, rel=1e-6)
+    assert risk["price"][0] > risk["price"][1]
+
+
+def test_tree_batch_leaves_options_without_implied_vol_out(caplog):
+    """
+    An American put quoted below intrinsic value keeps its market price and
+    NaN greeks, is named in the warning, and does not change its group.
+    """
+    quoted = {**_instrument("PUT", 300.0, market_price=1.0), "style": "AMERICAN"}
+    american = {**_instrument("PUT", 280.0), "style": "AMERICAN"}
+    logger = getLogger("test")
+    with caplog.at_level("WARNING"):
+        _, risk = risk_mode_option_batch_handler(
+            [quoted, american], AS_OF, MARKET_DATA, logger
+        )
+    _, alone = risk_mode_option_batch_handler([american], AS_OF, MARKET_DATA, logger)
+
+    assert "have no tree implied volatility" in caplog.text
+    assert "PUT 300.0" in caplog.text
+    assert risk["price"][0] == 1.0
+    for key in risk.keys() - {"price"}:
+        assert np.isnan(risk[key][0])
+        assert risk[key][1] == alone[key][0]
+
+
+@pytest.mark.parametrize(
+    "payoff, expected",
+    # Daily-monitored 272 calls: Levy's lognormal approximation of the
+    # arithmetic Asian, Broadie-Glasserman-Kou corrected closed form of the
+    # fixed-strike lookback
+    [("ASIAN", 25.436), ("LOOKBACK", 90.025)],
+)
+def test_path_dependent_payoffs_are_monitored_daily(payoff, expected):
+    """Single and batch paths simulate daily monitoring dates by default."""
+    instrument = {
+        **_instrument("CALL", 272.0),
+        "payoff": payoff,
+        "monte_carlo": {"n_paths": 20_000, "seed": 11},
+    }
+    logger = getLogger("test")
+    _, single = risk_mode_option_handler(instrument, AS_OF, MARKET_DATA, logger)
+    _, risk = risk_mode_option_batch_handler([instrument], AS_OF, MARKET_DATA, logger)
+
+    assert single["price"] == pytest.approx(expected, rel=0.02)
+    assert single.keys() == risk.keys()
+    for key, value in single.items():
+        assert risk[key][0] == value
+
+
+def test_path_dependent_payoffs_need_two_monitoring_dates():
+    instrument = {
+        **_instrument("CALL", 272.0),
+        "payoff": "ASIAN",
+        "monte_carlo": {"steps": 1},
+    }
+    with pytest.raises(ValueError):
+        risk_mode_option_handler(instrument, AS_OF, MARKET_DATA, getLogger("test"))
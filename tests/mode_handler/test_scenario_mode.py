@@ -0,0 +1,59 @@
+from datetime import datetime
+from logging import getLogger
+import numpy as np
+import pytest
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    risk_mode_option_handler,
+)
+from python_quant.mode_handler.scenario_mode import ladder_from_spec, scenario_ladder
+
+AS_OF = datetime(2025, 10, 10)
+MARKET_DATA = {
+    "risk_free_rate": 0.05,
+    "dividend_yield": 0.02,
+    "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+}
+INSTRUMENTS = [
+    {
+        "type": "OPTION",
+        "underlying": {"type": "EQUITY", "symbol": "AAPL"},
+        "option_type": option_type,
+        "strike": 280.0,
+        "expiry": "20261220",
+        "style": "EUROPEAN",
+        **extra,
+    }
+    for option_type, extra in (("PUT", {"market_price": 15.7}), ("CALL", {}))
+]
+
+
+def test_ladder_from_spec():
+    """Linspace and list specs both build the grid axes."""
+    ladder = ladder_from_spec(
+        {"spot_shifts": {"start": -0.1, "stop": 0.1, "num": 21}, "vol_shifts": [0.0]}
+    )
+    assert ladder.spot_shifts.size == 21
+    assert ladder.relative_spot and not ladder.relative_vol
+
+
+def test_scenario_ladder_grid():
+    """The unshifted grid point reproduces RISK mode with zero PnL."""
+    ladder = ladder_from_spec(
+        {
+            "spot_shifts": [-0.1, 0.0, 0.1],
+            "vol_shifts": {"start": -0.05, "stop": 0.05, "num": 3},
+        }
+    )
+    logger = getLogger("test")
+    df = scenario_ladder(INSTRUMENTS, AS_OF, MARKET_DATA, ladder, logger)
+
+    assert df.height == 2 * 3 * 3
+    base = df.filter((df["spot_shift"] == 0.0) & (df["vol_shift"] == 0.0))
+    np.testing.assert_allclose(base["pnl"].to_numpy(), 0.0, atol=1e-10)
+    for i, instrument in enumerate(INSTRUMENTS):
+        _, risk = risk_mode_option_handler(instrument, AS_OF, MARKET_DATA, logger)
+        for key in ("price", "delta", "gamma", "vega"):
+            assert base[key][i] == pytest.approx(risk[key], rel=1e-6)
+
+    calls = df.filter(df["call_put"] == "call").sort("spot_shift", "vol_shift")
+    assert (np.diff(calls["price"].to_numpy()[::3]) > 0).all()
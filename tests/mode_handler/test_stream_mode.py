@@ -0,0 +1,150 @@
+import asyncio
+import socket
+from datetime import datetime
+from logging import getLogger
+import pytest
+from python_quant.mode_handler.risk_mode import risk_mode_batch
+from python_quant.mode_handler.stream_mode import (
+    MarketUpdate,
+    StreamingRepricer,
+    file_tail_source,
+    queue_source,
+    unix_socket_source,
+)
+
+AS_OF = datetime(2025, 10, 10)
+LOGGER = getLogger("test")
+MARKET_DATA = {
+    "risk_free_rate": 0.05,
+    "dividend_yield": 0.02,
+    "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+    "MSFT": {"spot_price": 510.0, "volatility": 0.25},
+}
+
+
+def _instrument(symbol, strike, style="EUROPEAN", **fields):
+    return {
+        "type": "OPTION",
+        "underlying": {"type": "EQUITY", "symbol": symbol},
+        "option_type": "PUT",
+        "strike": strike,
+        "expiry": "20261220",
+        "style": style,
+        **fields,
+    }
+
+
+INSTRUMENTS = [
+    _instrument("AAPL", 280.0),
+    _instrument("MSFT", 500.0),
+    _instrument("AAPL", 260.0, style="AMERICAN"),
+    _instrument("MSFT", 520.0, market_price=45.0),
+]
+
+
+def _run(repricer, source):
+    published = []
+    repricer.subscribe(published.append)
+    asyncio.run(repricer.run(source))
+    return published
+
+
+def test_burst_is_coalesced_into_one_repricing():
+    repricer = StreamingRepricer(INSTRUMENTS, AS_OF, MARKET_DATA, LOGGER)
+    queue = asyncio.Queue()
+    for spot in range(270, 280):
+        queue.put_nowait(MarketUpdate("AAPL", spot_price=float(spot)))
+    queue.put_nowait(MarketUpdate("AAPL", volatility=0.4))
+    queue.put_nowait(MarketUpdate("TSLA", spot_price=430.0))
+    queue.put_nowait(None)
+
+    (update,) = _run(repricer, queue_source(queue))
+
+    assert (repricer.ticks, repricer.repricings) == (12, 1)
+    assert update.symbols == ("AAPL",)
+    assert update.positions.tolist() == [0, 2]
+    market_data = {**MARKET_DATA, "AAPL": {"spot_price": 279.0, "volatility": 0.4}}
+    expected = risk_mode_batch(
+        [INSTRUMENTS[0], INSTRUMENTS[2]], AS_OF, market_data, LOGGER
+    )
+    assert update.risk.equals(expected)
+    assert MARKET_DATA["AAPL"]["spot_price"] == 272.0
+    assert repricer.latency.summary()["count"] == 1
+    assert update.latency > 0
+
+
+def test_only_changed_underlyings_are_repriced():
+    """Ticks arriving during a repricing are published by the next cycle."""
+    repricer = StreamingRepricer(INSTRUMENTS, AS_OF, MARKET_DATA, LOGGER)
+    queue = asyncio.Queue()
+
+    async def feed(update):
+        if update.symbols == ("MSFT",):
+            await queue.put(MarketUpdate("AAPL", spot_price=265.0))
+            await queue.put(None)
+
+    repricer.subscribe(feed)
+    queue.put_nowait(MarketUpdate("MSFT", spot_price=505.0))
+    published = _run(repricer, queue_source(queue))
+
+    assert [u.symbols for u in published] == [("MSFT",), ("AAPL",)]
+    assert published[0].positions.tolist() == [1, 3]
+    assert published[1].risk["delta"].to_list() == pytest.approx(
+        repricer.reprice(["AAPL"])[1]["delta"].to_list()
+    )
+    # A quoted option keeps its price and moves its implied volatility
+    assert published[0].risk["price"][1] == 45.0
+
+
+def test_file_tail_follows_appended_ticks(tmp_path):
+    ticks = tmp_path / "ticks.jsonl"
+    ticks.write_text('{"symbol": "AAPL", "spot_price": 275.0}\nnot json\n')
+    repricer = StreamingRepricer(INSTRUMENTS, AS_OF, MARKET_DATA, LOGGER)
+
+    async def main():
+        published = []
+        repricer.subscribe(published.append)
+        source = file_tail_source(ticks, LOGGER, poll_interval=0.01, idle_timeout=0.5)
+        task = asyncio.create_task(repricer.run(source))
+        while not published:
+            await asyncio.sleep(0.01)
+        with ticks.open("a") as f:
+            f.write('{"symbol": "MSFT", "volatility": ')
+            f.flush()
+            await asyncio.sleep(0.05)
+            f.write('0.3}\n{"symbol": "AAPL", "spot_price": -1.0}\n')
+        await task
+        return published
+
+    published = asyncio.run(main())
+
+    assert [u.symbols for u in published] == [("AAPL",), ("MSFT",)]
+    assert repricer.ticks == 2
+    assert repricer.market_data["AAPL"]["spot_price"] == 275.0
+    assert repricer.market_data["MSFT"]["volatility"] == 0.3
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_unix_socket_source(tmp_path):
+    path = tmp_path / "ticks.sock"
+    repricer = StreamingRepricer(INSTRUMENTS, AS_OF, MARKET_DATA, LOGGER)
+
+    async def main():
+        published = []
+        repricer.subscribe(published.append)
+        source = unix_socket_source(path, LOGGER, idle_timeout=0.5)
+        task = asyncio.create_task(repricer.run(source))
+        while not path.exists():
+            await asyncio.sleep(0.01)
+        _, writer = await asyncio.open_unix_connection(str(path))
+        writer.write(b'{"symbol": "MSFT", "spot_price": 515.0}\n')
+        await writer.drain()
+        writer.close()
+        await task
+        return published
+
+    published = asyncio.run(main())
+
+    assert [u.symbols for u in published] == [("MSFT",)]
+    assert repricer.market_data["MSFT"]["spot_price"] == 515.0
+    assert not path.exists()
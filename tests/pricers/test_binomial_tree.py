@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from python_quant.pricers.binomial_tree import (
+    binomial_implied_volatility,
+    binomial_tree,
+)
+from python_quant.pricers.bsm_batch import BSMBatchPricer
+
+STRIKES = np.array([80.0, 100.0, 120.0])
+
+
+@pytest.mark.parametrize("method", ["CRR", "LR"])
+def test_european_tree_converges_to_bsm(method):
+    """European exercise on the tree reproduces BSM price and greeks."""
+    tree = binomial_tree(
+        100.0,
+        STRIKES,
+        1.0,
+        0.05,
+        0.02,
+        0.25,
+        -1.0,
+        steps=801,
+        method=method,
+        exercise="EUROPEAN",
+    )
+    bsm = BSMBatchPricer(100.0, STRIKES, 1.0, 0.05, 0.02, 0.25, -1.0).greeks()
+    np.testing.assert_allclose(tree["price"], bsm["price"], atol=5e-3)
+    np.testing.assert_allclose(tree["delta"], bsm["delta"], atol=1e-3)
+    np.testing.assert_allclose(tree["gamma"], bsm["gamma"], atol=1e-4)
+    np.testing.assert_allclose(tree["theta"], bsm["theta"], rtol=1e-2)
+
+
+def test_american_put_reference_value():
+    """American put matches the standard benchmark value."""
+    price = binomial_tree(100.0, 100.0, 1.0, 0.05, 0.0, 0.2, -1.0, steps=1001)
+    assert price["price"][0] == pytest.approx(6.0903, abs=1e-3)
+
+
+def test_strike_vector_matches_single_strike_trees():
+    """One multi-strike build gives the same numbers as one tree per strike."""
+    cp = np.array([-1.0, 1.0, -1.0])
+    batch = binomial_tree(100.0, STRIKES, 0.5, 0.03, 0.01, 0.3, cp)
+    for i, strike in enumerate(STRIKES):
+        single = binomial_tree(100.0, strike, 0.5, 0.03, 0.01, 0.3, cp[i])
+        for key, value in single.items():
+            assert batch[key][i] == pytest.approx(value[0], rel=1e-12)
+
+
+def test_bermudan_lies_between_european_and_american():
+    """Adding exercise dates can only add value."""
+    args = (100.0, STRIKES, 1.0, 0.05, 0.0, 0.2, -1.0)
+    european = binomial_tree(*args, exercise="EUROPEAN")["price"]
+    bermudan = binomial_tree(
+        *args, exercise="BERMUDAN", exercise_times=[0.25, 0.5, 0.75]
+    )["price"]
+    american = binomial_tree(*args)["price"]
+    assert (european <= bermudan + 1e-12).all()
+    assert (bermudan <= american + 1e-12).all()
+
+
+def test_binomial_implied_volatility_round_trip():
+    """Tree implied volatility recovers the volatility used to price."""
+    vol = np.array([0.15, 0.3, 0.6])
+    price = binomial_tree(100.0, STRIKES, 1.0, 0.05, 0.02, vol, -1.0)["price"]
+    result = binomial_implied_volatility(price, 100.0, STRIKES, 1.0, 0.05, 0.02, -1.0)
+    assert result.converged.all()
+    np.testing.assert_allclose(result.volatility, vol, rtol=1e-6)
@@ -0,0 +1,76 @@
+from datetime import datetime
+from logging import getLogger
+import numpy as np
+import pytest
+from python_quant.instrument.option import Option
+from python_quant.pricers.bsm_batch import BSMBatchPricer
+from python_quant.pricers.bsm_pricer import BSMPricer
+
+AS_OF = datetime(2025, 10, 10)
+MARKET_DATA = {
+    "risk_free_rate": 0.05,
+    "dividend_yield": 0.02,
+    "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+}
+CASES = [
+    (280.0, datetime(2026, 12, 20), Option.CallPut.PUT),
+    (280.0, datetime(2026, 12, 20), Option.CallPut.CALL),
+    (200.0, datetime(2025, 11, 21), Option.CallPut.CALL),
+    (350.0, datetime(2027, 6, 18), Option.CallPut.PUT),
+]
+
+
+def _scalar_greeks(strike, expiry, call_put):
+    option = Option(
+        strike_price=strike,
+        expiration_date=expiry,
+        underlying_ticker="AAPL",
+        underlying_type="EQUITY",
+        market_price=None,
+        volatility=0.35,
+        call_put=call_put,
+    )
+    pricer = BSMPricer(
+        instrument=option,
+        as_of_date=AS_OF,
+        market_data=MARKET_DATA,
+        logger=getLogger("test"),
+    )
+    return option.time_to_maturity(AS_OF), pricer.greeks()
+
+
+def test_batch_greeks_match_scalar_pricer():
+    """Batch pricer reproduces BSMPricer.greeks() for every option."""
+    scalar = [_scalar_greeks(*case) for case in CASES]
+    batch = BSMBatchPricer(
+        spot=272.0,
+        strike=[case[0] for case in CASES],
+        time_to_maturity=[t for t, _ in scalar],
+        risk_free_rate=0.05,
+        dividend_yield=0.02,
+        volatility=0.35,
+        cp_flag=[1.0 if c[2] == Option.CallPut.CALL else -1.0 for c in CASES],
+    ).greeks()
+
+    for i, (_, expected) in enumerate(scalar):
+        for key, value in expected.items():
+            assert batch[key][i] == pytest.approx(value, rel=1e-10, abs=1e-12)
+
+
+def test_batch_broadcasts_and_handles_expired():
+    """Zero maturity collapses to intrinsic value with zero gamma and vega."""
+    pricer = BSMBatchPricer(
+        spot=np.array([[100.0], [120.0]]),
+        strike=np.array([110.0, 90.0]),
+        time_to_maturity=0.0,
+        risk_free_rate=0.05,
+        dividend_yield=0.0,
+        volatility=0.2,
+        cp_flag=1.0,
+    )
+    greeks = pricer.greeks()
+    assert greeks["price"].shape == (2, 2)
+    np.testing.assert_allclose(greeks["price"], [[0.0, 10.0], [10.0, 30.0]])
+    np.testing.assert_allclose(greeks["delta"], [[0.0, 1.0], [1.0, 1.0]])
+    assert not greeks["gamma"].any()
+    assert not greeks["vega"].any()
@@ -0,0 +1,117 @@
+from datetime import datetime
+from logging import getLogger
+import numpy as np
+import pytest
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    risk_mode_option_batch_handler,
+    risk_mode_option_handler,
+)
+from python_quant.mode_handler.price_mode import price_option_batch
+from python_quant.pricers.bsm_batch import BSMBatchPricer
+from python_quant.pricers.finite_difference import (
+    crank_nicolson,
+    finite_difference_implied_volatility,
+    finite_difference_risk,
+)
+
+STRIKES = np.array([80.0, 100.0, 120.0])
+
+
+def test_european_grid_converges_to_bsm():
+    """European exercise on the grid reproduces BSM price and greeks."""
+    cp = np.array([-1.0, 1.0, -1.0])
+    grid = crank_nicolson(
+        100.0, STRIKES, 1.0, 0.05, 0.02, 0.25, cp, exercise="EUROPEAN"
+    )
+    bsm = BSMBatchPricer(100.0, STRIKES, 1.0, 0.05, 0.02, 0.25, cp).greeks()
+    np.testing.assert_allclose(grid["price"], bsm["price"], atol=2e-3)
+    np.testing.assert_allclose(grid["delta"], bsm["delta"], atol=1e-4)
+    np.testing.assert_allclose(grid["gamma"], bsm["gamma"], atol=1e-5)
+    np.testing.assert_allclose(grid["theta"], bsm["theta"], rtol=1e-3)
+
+
+def test_american_put_reference_value():
+    """American put matches the standard benchmark value."""
+    price = crank_nicolson(100.0, 100.0, 1.0, 0.05, 0.0, 0.2, -1.0)
+    assert price["price"][0] == pytest.approx(6.0903, abs=2e-3)
+
+
+def test_strike_vector_matches_single_strike_grids():
+    """Stacked strikes solve independently of each other."""
+    cp = np.array([-1.0, 1.0, -1.0])
+    vol = np.array([0.2, 0.3, 0.4])
+    batch = crank_nicolson(100.0, STRIKES, 0.5, 0.03, 0.01, vol, cp)
+    for i, strike in enumerate(STRIKES):
+        single = crank_nicolson(100.0, strike, 0.5, 0.03, 0.01, vol[i], cp[i])
+        for key, value in single.items():
+            assert batch[key][i] == pytest.approx(value[0], rel=1e-12)
+
+
+def test_price_does_not_depend_on_batch_composition():
+    """Far strikes or a high volatility elsewhere in the vector leave the
+    grid of an at-the-money put unchanged."""
+    args = (100.0, 1.0, 0.05, 0.0)
+    alone = crank_nicolson(args[0], 100.0, *args[1:], 0.2, -1.0)
+    wide = crank_nicolson(args[0], [20.0, 100.0, 500.0], *args[1:], 0.2, -1.0)
+    volatile = crank_nicolson(args[0], [100.0, 100.0], *args[1:], [1.5, 0.2], -1.0)
+    for key, value in alone.items():
+        assert wide[key][1] == pytest.approx(value[0], rel=1e-12)
+        assert volatile[key][1] == pytest.approx(value[0], rel=1e-12)
+
+
+def test_bermudan_lies_between_european_and_american():
+    args = (100.0, STRIKES, 1.0, 0.05, 0.0, 0.2, -1.0)
+    european = crank_nicolson(*args, exercise="EUROPEAN")["price"]
+    bermudan = crank_nicolson(
+        *args, exercise="BERMUDAN", exercise_times=[0.25, 0.5, 0.75]
+    )["price"]
+    american = crank_nicolson(*args)["price"]
+    assert (european < bermudan).all()
+    assert (bermudan < american).all()
+
+
+def test_risk_and_implied_volatility_round_trip():
+    vol = np.array([0.15, 0.3, 0.6])
+    risk = finite_difference_risk(100.0, STRIKES, 1.0, 0.05, 0.02, vol, -1.0)
+    result = finite_difference_implied_volatility(
+        risk["price"], 100.0, STRIKES, 1.0, 0.05, 0.02, -1.0
+    )
+    assert result.converged.all()
+    np.testing.assert_allclose(result.volatility, vol, atol=1e-6)
+    assert (risk["vega"] > 0).all() and (risk["rho"] < 0).all()
+
+
+def test_pde_instruments_in_risk_and_price_mode():
+    """PDE positions agree across the single, batch and PRICE handlers."""
+    as_of = datetime(2025, 10, 10)
+    market_data = {
+        "risk_free_rate": 0.05,
+        "dividend_yield": 0.02,
+        "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+    }
+    instrument = {
+        "type": "OPTION",
+        "underlying": {"type": "EQUITY", "symbol": "AAPL"},
+        "option_type": "PUT",
+        "expiry": "20261220",
+        "style": "AMERICAN",
+        "pricer": "PDE",
+    }
+    instruments = [
+        {**instrument, "strike": 280.0},
+        {**instrument, "strike": 300.0, "market_price": 45.0},
+        {**instrument, "strike": 280.0, "pricer": None},
+    ]
+    logger = getLogger("test")
+    _, risk = risk_mode_option_batch_handler(instruments, as_of, market_data, logger)
+    prices = price_option_batch(instruments, as_of, market_data, logger)["price"]
+
+    # A batch grid spans every strike of the expiry, so it is slightly coarser
+    for i, position in enumerate(instruments):
+        _, expected = risk_mode_option_handler(position, as_of, market_data, logger)
+        for key, value in expected.items():
+            assert risk[key][i] == pytest.approx(value, rel=1e-3), key
+    # PRICE mode skips the bumped scenarios and solves on a slightly finer grid
+    assert prices.to_numpy() == pytest.approx(risk["price"], abs=2e-4)
+    # Grid and tree agree on the same position
+    assert risk["price"][0] == pytest.approx(risk["price"][2], abs=2e-2)
@@ -0,0 +1,117 @@
+from datetime import datetime
+from logging import getLogger
+import numpy as np
+import pytest
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    RISK_KEYS,
+    risk_mode_option_batch_handler,
+    risk_mode_option_handler,
+)
+from python_quant.pricers.bsm_batch import BSMBatchPricer
+from python_quant.pricers.heston import (
+    VOL_BUMP,
+    HestonParameters,
+    HestonTransformCache,
+    heston_characteristic_function,
+    heston_price,
+    heston_risk,
+)
+
+STRIKES = np.array([60.0, 80.0, 100.0, 120.0, 150.0])
+CP_FLAGS = np.array([1.0, -1.0, 1.0, -1.0, 1.0])
+
+
+def test_matches_reference_price():
+    """Fang & Oosterlee (2008) Heston test case, reference 5.785155450."""
+    params = HestonParameters(
+        v0=0.0175, kappa=1.5768, theta=0.0398, sigma=0.5751, rho=-0.5711
+    )
+
+    price = heston_price(100.0, 100.0, 1.0, 0.0, 0.0, params, 1.0)
+
+    assert float(price) == pytest.approx(5.785155450, abs=1e-6)
+    assert heston_characteristic_function(-1j, 1.0, params) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("time_to_maturity", [0.05, 0.5, 3.0])
+def test_constant_variance_limit_matches_bsm(time_to_maturity):
+    """With v0 = theta and no vol of vol, price and greeks are Black-Scholes."""
+    params = HestonParameters(v0=0.04, kappa=2.0, theta=0.04, sigma=1e-3, rho=0.0)
+    inputs = {
+        "spot": 100.0,
+        "strike": STRIKES,
+        "time_to_maturity": time_to_maturity,
+        "risk_free_rate": 0.05,
+        "dividend_yield": 0.02,
+        "cp_flag": CP_FLAGS,
+    }
+    risk = heston_risk(params=params, cache=HestonTransformCache(), **inputs)
+    expected = BSMBatchPricer(volatility=0.2, **inputs).greeks()
+    # Vega is a central difference of the same size
+    expected["vega"] = (
+        BSMBatchPricer(volatility=0.2 + VOL_BUMP, **inputs).price()
+        - BSMBatchPricer(volatility=0.2 - VOL_BUMP, **inputs).price()
+    ) / (2 * VOL_BUMP)
+
+    for key in RISK_KEYS:
+        if key == "implied_volatility":
+            continue
+        assert risk[key] == pytest.approx(expected[key], rel=1e-3, abs=1e-4), key
+    assert risk["implied_volatility"][2] == pytest.approx(0.2, abs=1e-5)
+
+
+def test_one_transform_per_expiry_is_cached():
+    cache = HestonTransformCache()
+    params = HestonParameters(v0=0.04, kappa=1.5, theta=0.05, sigma=0.6, rho=-0.7)
+
+    heston_price(100.0, STRIKES, 1.0, 0.05, 0.02, params, CP_FLAGS, cache)
+    assert cache.stats()["misses"] == 1
+    heston_risk(100.0, STRIKES, 1.0, 0.05, 0.02, params, CP_FLAGS, cache=cache)
+    # Vega and theta bumps add four transforms, the base one is reused
+    assert cache.stats() == {"entries": 5, "hits": 1, "misses": 5, "evictions": 0}
+    heston_risk(105.0, STRIKES, 1.0, 0.04, 0.02, params, CP_FLAGS, cache=cache)
+    assert cache.stats()["misses"] == 5
+
+
+def test_heston_instruments_in_risk_mode():
+    """Single and batch handlers agree and return the BSM output shape."""
+    as_of = datetime(2025, 10, 10)
+    market_data = {
+        "risk_free_rate": 0.05,
+        "dividend_yield": 0.02,
+        "AAPL": {
+            "spot_price": 272.0,
+            "volatility": 0.35,
+            "heston": {
+                "v0": 0.09,
+                "kappa": 1.5,
+                "theta": 0.1,
+                "sigma": 0.6,
+                "rho": -0.7,
+            },
+        },
+    }
+    instrument = {
+        "type": "OPTION",
+        "underlying": {"type": "EQUITY", "symbol": "AAPL"},
+        "expiry": "20261220",
+        "style": "EUROPEAN",
+        "pricer": "HESTON",
+    }
+    instruments = [
+        {**instrument, "option_type": "PUT", "strike": 240.0},
+        {**instrument, "option_type": "CALL", "strike": 300.0, "market_price": 30.0},
+        {**instrument, "option_type": "PUT", "strike": 240.0, "pricer": None},
+        {**instrument, "option_type": "CALL", "strike": 300.0},
+    ]
+    logger = getLogger("test")
+    _, risk = risk_mode_option_batch_handler(instruments, as_of, market_data, logger)
+
+    for i, position in enumerate(instruments):
+        _, expected = risk_mode_option_handler(position, as_of, market_data, logger)
+        assert set(expected) == set(RISK_KEYS)
+        for key in RISK_KEYS:
+            assert risk[key][i] == pytest.approx(expected[key], rel=1e-8), key
+    assert risk["price"][1] == 30.0
+    # Negative spot/vol correlation skews the smile: OTM puts carry more vol
+    assert risk["implied_volatility"][0] > risk["implied_volatility"][3]
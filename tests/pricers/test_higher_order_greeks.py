@@ -0,0 +1,144 @@
+from datetime import datetime
+from logging import getLogger
+import numpy as np
+import pytest
+from python_quant.instrument.option import Option
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    risk_mode_option_batch_handler,
+)
+from python_quant.pricers.bsm_batch import (
+    HIGHER_ORDER_GREEKS,
+    BSMBatchPricer,
+    resolve_greek_names,
+)
+from python_quant.pricers.bsm_pricer import BSMPricer
+
+INPUTS = {
+    "spot": 272.0,
+    "strike": np.array([200.0, 260.0, 280.0, 350.0]),
+    "time_to_maturity": np.array([0.1, 0.5, 1.2, 2.0]),
+    "risk_free_rate": 0.05,
+    "dividend_yield": 0.02,
+    "volatility": 0.35,
+    "cp_flag": np.array([1.0, -1.0, 1.0, -1.0]),
+}
+H = 1e-5
+
+
+def _greek(key, **bumps):
+    inputs = dict(INPUTS)
+    for name, bump in bumps.items():
+        inputs[name] = inputs[name] + bump
+    return BSMBatchPricer(**inputs).greeks()[key]
+
+
+FINITE_DIFFERENCES = {
+    "vanna": lambda: (_greek("delta", volatility=H) - _greek("delta", volatility=-H)),
+    "volga": lambda: (_greek("vega", volatility=H) - _greek("vega", volatility=-H)),
+    "charm": lambda: (
+        _greek("delta", time_to_maturity=-H) - _greek("delta", time_to_maturity=H)
+    ),
+    "speed": lambda: _greek("gamma", spot=H) - _greek("gamma", spot=-H),
+    "color": lambda: (
+        _greek("gamma", time_to_maturity=-H) - _greek("gamma", time_to_maturity=H)
+    ),
+    "dividend_rho": lambda: (
+        _greek("price", dividend_yield=H) - _greek("price", dividend_yield=-H)
+    ),
+}
+
+
+@pytest.mark.parametrize("name", HIGHER_ORDER_GREEKS)
+def test_higher_order_greeks_match_finite_differences(name):
+    """Analytic values agree with central differences of lower-order greeks."""
+    analytic = BSMBatchPricer(**INPUTS).greeks(higher_order=[name])[name]
+
+    assert analytic == pytest.approx(FINITE_DIFFERENCES[name]() / (2 * H), rel=1e-5)
+
+
+def test_only_requested_greeks_are_computed():
+    pricer = BSMBatchPricer(**INPUTS)
+
+    assert "vanna" not in pricer.greeks()
+    assert set(pricer.greeks(["Vomma", "charm"])) - set(pricer.greeks()) == {
+        "volga",
+        "charm",
+    }
+    with pytest.raises(ValueError, match="Unsupported greek: ultima"):
+        resolve_greek_names(["ultima"])
+
+
+def test_scalar_pricer_matches_batch():
+    as_of = datetime(2025, 10, 10)
+    option = Option(
+        strike_price=280.0,
+        expiration_date=datetime(2026, 12, 20),
+        underlying_ticker="AAPL",
+        underlying_type="EQUITY",
+        market_price=None,
+        volatility=0.35,
+        call_put=Option.CallPut.PUT,
+    )
+    market_data = {
+        "risk_free_rate": 0.05,
+        "dividend_yield": 0.02,
+        "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+    }
+    scalar = BSMPricer(option, as_of, market_data, getLogger("test")).greeks(
+        HIGHER_ORDER_GREEKS
+    )
+    batch = BSMBatchPricer(
+        **{
+            **INPUTS,
+            "strike": 280.0,
+            "time_to_maturity": option.time_to_maturity(as_of),
+            "cp_flag": -1.0,
+        }
+    ).greeks(HIGHER_ORDER_GREEKS)
+
+    for name in HIGHER_ORDER_GREEKS:
+        assert scalar[name] == pytest.approx(float(batch[name]), rel=1e-10)
+
+
+def test_options_without_time_value_get_limits():
+    greeks = BSMBatchPricer(
+        spot=100.0,
+        strike=[90.0, 90.0],
+        time_to_maturity=[0.0, 1.0],
+        risk_free_rate=0.05,
+        dividend_yield=0.02,
+        volatility=[0.2, 0.0],
+        cp_flag=1.0,
+    ).greeks(HIGHER_ORDER_GREEKS)
+
+    assert all(np.isfinite(greeks[name]).all() for name in HIGHER_ORDER_GREEKS)
+    assert greeks["vanna"].tolist() == [0.0, 0.0]
+    assert greeks["dividend_rho"][1] == pytest.approx(-100.0 * np.exp(-0.02))
+
+
+def test_batch_handler_adds_requested_columns():
+    """European rows get analytic values, tree priced rows NaN."""
+    instrument = {
+        "type": "OPTION",
+        "underlying": {"symbol": "AAPL", "type": "EQUITY"},
+        "option_type": "CALL",
+        "strike": 280.0,
+        "expiry": "20261220",
+    }
+    _, risk = risk_mode_option_batch_handler(
+        instruments=[
+            {**instrument, "style": "EUROPEAN"},
+            {**instrument, "style": "AMERICAN"},
+        ],
+        as_of_date=datetime(2025, 10, 10),
+        market_data={
+            "risk_free_rate": 0.05,
+            "dividend_yield": 0.02,
+            "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+        },
+        logger=getLogger("test"),
+        higher_order=["vanna", "speed"],
+    )
+
+    assert np.isfinite(risk["vanna"][0]) and np.isnan(risk["vanna"][1])
+    assert np.isfinite(risk["speed"][0]) and np.isnan(risk["speed"][1])
@@ -0,0 +1,35 @@
+import numpy as np
+from python_quant.pricers.bsm_batch import BSMBatchPricer
+from python_quant.pricers.implied_vol import implied_volatility
+
+
+def test_implied_volatility_round_trip():
+    """Recovers vols well outside the old [1e-6, 2.0] bracket."""
+    strike = np.array([95.0, 90.0, 100.0, 110.0, 150.0, 100.0, 100.0])
+    t = np.array([0.5, 0.5, 1.0, 2.0, 3.0, 0.25, 1.0])
+    vol = np.array([0.05, 0.2, 0.35, 0.8, 1.5, 2.5, 4.0])
+    cp = np.array([1.0, -1.0, 1.0, -1.0, 1.0, -1.0, 1.0])
+    price = BSMBatchPricer(100.0, strike, t, 0.03, 0.01, vol, cp).price()
+
+    result = implied_volatility(price, 100.0, strike, t, 0.03, 0.01, cp)
+
+    assert result.converged.all()
+    assert not result.arbitrage_violation.any()
+    assert (result.iterations < 20).all()
+    np.testing.assert_allclose(result.volatility, vol, rtol=1e-8)
+
+
+def test_implied_volatility_flags_arbitrage_violations():
+    """Prices outside no-arbitrage bounds are flagged, not raised."""
+    result = implied_volatility(
+        market_price=[1.0, 150.0, 5.0],
+        spot=100.0,
+        strike=[50.0, 100.0, 100.0],
+        time_to_maturity=1.0,
+        risk_free_rate=0.0,
+        dividend_yield=0.0,
+        cp_flag=1.0,
+    )
+    np.testing.assert_array_equal(result.arbitrage_violation, [True, True, False])
+    np.testing.assert_array_equal(result.converged, [False, False, True])
+    assert np.isnan(result.volatility[:2]).all()
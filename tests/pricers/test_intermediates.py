@@ -0,0 +1,55 @@
+from datetime import datetime
+from logging import getLogger
+from math import exp, sqrt
+import pytest
+from python_quant.instrument.option import Option
+from python_quant.pricers.bsm_pricer import BSMPricer
+from python_quant.pricers.intermediates import IntermediateCache
+
+AS_OF = datetime(2025, 10, 10)
+MARKET_DATA = {
+    "risk_free_rate": 0.05,
+    "dividend_yield": 0.02,
+    "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+}
+
+
+def _option(strike, expiry=datetime(2026, 12, 20)):
+    return Option(
+        strike_price=strike,
+        expiration_date=expiry,
+        underlying_ticker="AAPL",
+        underlying_type="EQUITY",
+        market_price=None,
+        volatility=0.35,
+    )
+
+
+def test_chain_shares_one_entry():
+    """A strike chain on one expiry computes its terms once."""
+    cache = IntermediateCache()
+    logger = getLogger("test")
+    for strike in range(200, 350, 5):
+        BSMPricer(_option(float(strike)), AS_OF, MARKET_DATA, logger, cache=cache)
+
+    assert cache.stats() == {"entries": 1, "hits": 29, "misses": 1, "evictions": 0}
+
+
+def test_terms_values():
+    """Cached terms match their closed forms."""
+    terms = IntermediateCache().terms(_option(250.0), AS_OF, 272.0, 0.05, 0.02)
+    t = (datetime(2026, 12, 20) - AS_OF).days / 365.0
+    assert terms.time_to_maturity == pytest.approx(t)
+    assert terms.sqrt_t == pytest.approx(sqrt(t))
+    assert terms.forward == pytest.approx(272.0 * exp((0.05 - 0.02) * t))
+
+
+def test_cache_evicts_least_recently_used():
+    """Entries beyond max_entries are evicted oldest first."""
+    cache = IntermediateCache(max_entries=2)
+    expiries = [datetime(2026, month, 1) for month in (1, 2, 3)]
+    for expiry in expiries:
+        cache.terms(_option(250.0, expiry), AS_OF, 272.0, 0.05, 0.02)
+    cache.terms(_option(250.0, expiries[0]), AS_OF, 272.0, 0.05, 0.02)
+
+    assert cache.stats() == {"entries": 2, "hits": 0, "misses": 4, "evictions": 2}
@@ -0,0 +1,38 @@
+import pytest
+from python_quant.pricers.bsm_batch import BSMBatchPricer
+from python_quant.pricers.monte_carlo import monte_carlo_price
+
+ARGS = (100.0, 100.0, 1.0, 0.05, 0.02, 0.25, -1.0)
+
+
+def test_monte_carlo_matches_bsm_within_standard_error():
+    """Vanilla MC price lies within a few standard errors of BSM."""
+    result = monte_carlo_price(*ARGS, n_paths=200_000, seed=7)
+    expected = float(BSMBatchPricer(*ARGS).price())
+    assert abs(result.price - expected) < 4.0 * result.std_error
+    assert result.n_paths == 200_000
+    assert result.paths_per_second > 0
+
+
+def test_monte_carlo_is_reproducible_across_worker_counts():
+    """Seeded runs are bit-identical whatever the number of workers."""
+    kwargs = dict(n_paths=50_000, chunk_size=5_000, seed=123, payoff="ASIAN", steps=4)
+    single = monte_carlo_price(*ARGS, workers=1, **kwargs)
+    pooled = monte_carlo_price(*ARGS, workers=2, **kwargs)
+    assert single.price == pooled.price
+    assert single.std_error == pooled.std_error
+
+
+def test_variance_reduction_lowers_standard_error():
+    """Antithetic and control variates reduce the standard error."""
+    plain = monte_carlo_price(
+        *ARGS, n_paths=50_000, seed=1, antithetic=False, control_variate=False
+    )
+    reduced = monte_carlo_price(*ARGS, n_paths=50_000, seed=1)
+    assert reduced.std_error < plain.std_error
+
+
+def test_unknown_payoff_is_rejected():
+    """Only the registered payoffs can be simulated."""
+    with pytest.raises(ValueError):
+        monte_carlo_price(*ARGS, payoff="RAINBOW")
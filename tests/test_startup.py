@@ -0,0 +1,59 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("scipy", "polars", "nicegui")
+# Generous budgets (seconds of cumulative import time) to catch regressions
+HELP_IMPORT_BUDGET = 0.5
+RISK_IMPORT_BUDGET = 1.0
+IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)")
+
+
+def _import_profile(*args: str) -> dict:
+    """Run the CLI under -X importtime; map top-level imports to seconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "python_quant.main", *args],
+        cwd=REPO,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = {}
+    for match in IMPORT_LINE.finditer(result.stderr):
+        cumulative_us, indent, module = match.groups()
+        imports[module] = (len(indent), int(cumulative_us) / 1e6)
+    return imports
+
+
+def _top_level_time(imports: dict) -> float:
+    return sum(seconds for depth, seconds in imports.values() if depth == 0)
+
+
+def test_help_skips_heavy_imports():
+    """--help never loads scipy, polars or nicegui."""
+    imports = _import_profile("--help")
+    loaded = {module.split(".")[0] for module in imports}
+    assert not loaded.intersection(HEAVY_MODULES)
+    assert _top_level_time(imports) < HELP_IMPORT_BUDGET
+
+
+def test_single_option_risk_skips_heavy_imports():
+    """
+    A single European option RISK run without CSV output skips polars; scipy
+    is only imported for the normal cdf of the implied volatility solve.
+    """
+    imports = _import_profile(
+        "--mode",
+        "RISK",
+        "--instrument",
+        "input_data/eq_option/bsm_eq_option.json",
+        "--input_data_path",
+        "input_data/market_data",
+        "--as_of_date",
+        "20251010",
+    )
+    loaded = {module.split(".")[0] for module in imports}
+    assert not loaded.intersection(HEAVY_MODULES).difference({"scipy"})
+    assert _top_level_time(imports) < RISK_IMPORT_BUDGET
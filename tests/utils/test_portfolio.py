@@ -0,0 +1,83 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import polars as pl
+import pytest
+from python_quant.utils.portfolio import (
+    PortfolioChunks,
+    instrument_from_row,
+    iter_portfolio_chunks,
+)
+
+INSTRUMENT = {
+    "type": "OPTION",
+    "underlying": {"type": "EQUITY", "symbol": "AAPL"},
+    "option_type": "PUT",
+    "strike": 280.0,
+    "expiry": "20261220",
+    "style": "EUROPEAN",
+}
+
+
+def _flat(instrument):
+    row = {k: v for k, v in instrument.items() if k != "underlying"}
+    row["underlying_symbol"] = instrument["underlying"]["symbol"]
+    row["underlying_type"] = instrument["underlying"]["type"]
+    return row
+
+
+def test_instrument_from_row():
+    """Flat rows are nested back into the instrument dict shape."""
+    row = {**_flat(INSTRUMENT), "market_price": None}
+    assert instrument_from_row(row) == INSTRUMENT
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".csv", ".parquet"])
+def test_iter_portfolio_chunks(suffix):
+    """Every format streams the same instruments in bounded chunks."""
+    instruments = [{**INSTRUMENT, "strike": 200.0 + i} for i in range(25)]
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname) / f"book{suffix}"
+        df = pl.DataFrame([_flat(i) for i in instruments])
+        match suffix:
+            case ".jsonl":
+                path.write_text("\n".join(json.dumps(i) for i in instruments))
+            case ".csv":
+                df.write_csv(path)
+            case ".parquet":
+                df.write_parquet(path)
+
+        chunks = list(iter_portfolio_chunks(path, chunk_size=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert [i for chunk in chunks for i in chunk] == instruments
+
+
+def test_iter_portfolio_chunks_unsupported_format():
+    """Unknown suffixes are rejected."""
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname) / "book.xlsx"
+        path.touch()
+        with pytest.raises(ValueError):
+            list(iter_portfolio_chunks(path))
+
+
+@pytest.mark.parametrize("memory_rows", [100, 15])
+def test_portfolio_chunks_parse_once(memory_rows):
+    """
+    Later passes reuse the parsed chunks, from memory or, for a book larger
+    than memory_rows, from the spill file, without reading the portfolio.
+    """
+    instruments = [{**INSTRUMENT, "strike": 200.0 + i} for i in range(25)]
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname) / "book.jsonl"
+        path.write_text("\n".join(json.dumps(i) for i in instruments))
+        with PortfolioChunks(path, chunk_size=10, memory_rows=memory_rows) as book:
+            first = list(book)
+            path.unlink()
+            second, third = list(book), list(book)
+            spilled = book._spill is not None
+
+    assert first == second == third
+    assert [i for chunk in first for i in chunk] == instruments
+    assert spilled == (memory_rows < len(instruments))
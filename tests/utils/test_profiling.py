@@ -0,0 +1,127 @@
+import json
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import polars as pl
+from python_quant.mode_handler.option.risk_mode_option_handler import (
+    risk_mode_option_handler,
+)
+from python_quant.utils.profiling import (
+    NULL_PROFILER,
+    Profiler,
+    get_profiler,
+    set_profiler,
+)
+
+MARKET_DATA = {
+    "risk_free_rate": 0.05,
+    "dividend_yield": 0.02,
+    "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+}
+INSTRUMENT = {
+    "type": "OPTION",
+    "underlying": {"type": "EQUITY", "symbol": "AAPL"},
+    "option_type": "PUT",
+    "strike": 280.0,
+    "expiry": "20261220",
+    "style": "EUROPEAN",
+    "market_price": 15.7,
+}
+
+
+def test_handler_stages_and_counters():
+    """A profiled RISK run records its stages and IV solver counters."""
+    profiler = Profiler()
+    set_profiler(profiler)
+    try:
+        risk_mode_option_handler(
+            INSTRUMENT, datetime(2025, 10, 10), MARKET_DATA, getLogger("test")
+        )
+    finally:
+        set_profiler(None)
+
+    assert {"option_construction", "pricer_init", "implied_volatility", "greeks"} <= (
+        profiler.stages.keys()
+    )
+    assert profiler.counters["iv_solves"] == 1
+    assert profiler.counters["iv_objective_evaluations"] >= 1
+    assert profiler.counters["options_priced"] == 1
+    assert get_profiler() is NULL_PROFILER
+
+
+def test_nested_stage_memory_and_json():
+    """Outer stages include the peak of nested stages; profiles dump to JSON."""
+    profiler = Profiler(trace_memory=True)
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            block = bytearray(1_000_000)
+        del block
+    profiler.finish()
+
+    stages = profiler.stages
+    assert stages["inner"]["allocated_bytes"] >= 1_000_000
+    assert stages["outer"]["peak_bytes"] >= stages["inner"]["peak_bytes"]
+    assert "inner" in profiler.summary_table()
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname) / "profile.json"
+        profiler.write_json(path)
+        assert json.loads(path.read_text())["stages"]["outer"]["calls"] == 1
+
+
+def test_memory_tracing_is_stopped_by_the_profiler_that_started_it():
+    """finish() stops tracing the profiler started, but not tracing it found."""
+    profiler = Profiler(trace_memory=True)
+    set_profiler(profiler)
+    with profiler.stage("stage"):
+        assert tracemalloc.is_tracing()
+    set_profiler(None)
+    assert not tracemalloc.is_tracing()
+
+    tracemalloc.start()
+    try:
+        profiler = Profiler(trace_memory=True)
+        with profiler.stage("stage"):
+            pass
+        profiler.finish()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_null_profiler_is_a_no_op():
+    """With profiling off, stages and counters record nothing."""
+    with NULL_PROFILER.stage("anything"):
+        NULL_PROFILER.count("anything", 10)
+    assert not NULL_PROFILER.enabled
+
+
+def test_cli_profile_report_keeps_stdout_csv_clean():
+    """With --profile, PRICE mode CSV on stdout still parses as one frame."""
+    repo = Path(__file__).resolve().parents[2]
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "python_quant.main",
+            "--mode",
+            "PRICE",
+            "--instrument",
+            "input_data/eq_option/bsm_eq_option.json",
+            "--input_data_path",
+            "input_data/market_data",
+            "--as_of_date",
+            "20251010",
+            "--profile",
+        ],
+        cwd=repo,
+        capture_output=True,
+        check=True,
+    )
+    df = pl.read_csv(result.stdout)
+
+    assert df.height == 1 and df.columns[-1] == "price"
+    assert b"PROFILE" in result.stderr
@@ -0,0 +1,126 @@
+import json
+from datetime import datetime
+from logging import getLogger
+from python_quant.mode_handler.risk_mode import risk_mode_batch, risk_mode_main
+from python_quant.utils.result_cache import ResultCache
+
+AS_OF = datetime(2025, 10, 10)
+LOGGER = getLogger("test")
+MARKET_DATA = {
+    "risk_free_rate": 0.05,
+    "dividend_yield": 0.02,
+    "AAPL": {"spot_price": 272.0, "volatility": 0.35},
+    "MSFT": {"spot_price": 510.0, "volatility": 0.25},
+}
+
+
+def _instrument(symbol, strike, style="EUROPEAN", **fields):
+    return {
+        "type": "OPTION",
+        "underlying": {"type": "EQUITY", "symbol": symbol},
+        "option_type": "CALL",
+        "strike": strike,
+        "expiry": "20261220",
+        "style": style,
+        **fields,
+    }
+
+
+INSTRUMENTS = [
+    _instrument("AAPL", 280.0),
+    _instrument("MSFT", 500.0, style="AMERICAN"),
+    _instrument("AAPL", 300.0, market_price=30.0),
+    _instrument("MSFT", 520.0),
+]
+
+
+def test_key_depends_only_on_the_priced_content(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite", version="1.0")
+    other = ResultCache(tmp_path / "other.sqlite", version="1.1")
+    instrument = INSTRUMENTS[0]
+    key = cache.result_key(instrument, AS_OF, MARKET_DATA)
+
+    moved_msft = {**MARKET_DATA, "MSFT": {"spot_price": 505.0, "volatility": 0.25}}
+    assert (
+        cache.result_key(dict(reversed(instrument.items())), AS_OF, moved_msft) == key
+    )
+    changed = [
+        cache.result_key(instrument, AS_OF, {**MARKET_DATA, "risk_free_rate": 0.04}),
+        cache.result_key(instrument, datetime(2025, 10, 13), MARKET_DATA),
+        cache.result_key({**instrument, "pricer": "HESTON"}, AS_OF, MARKET_DATA),
+        cache.result_key(instrument, AS_OF, MARKET_DATA, higher_order=("vanna",)),
+        other.result_key(instrument, AS_OF, MARKET_DATA),
+    ]
+    assert key not in changed and len(set(changed)) == len(changed)
+    cache.close()
+    other.close()
+
+
+def test_rerun_reprices_only_corrected_underlyings(tmp_path):
+    with ResultCache(tmp_path / "cache.sqlite") as cache:
+        first = risk_mode_batch(
+            INSTRUMENTS, AS_OF, MARKET_DATA, LOGGER, result_cache=cache
+        )
+        assert first.equals(risk_mode_batch(INSTRUMENTS, AS_OF, MARKET_DATA, LOGGER))
+
+    corrected = {**MARKET_DATA, "MSFT": {"spot_price": 512.5, "volatility": 0.26}}
+    # A new process reuses the file
+    with ResultCache(tmp_path / "cache.sqlite") as cache:
+        rerun = risk_mode_batch(
+            INSTRUMENTS, AS_OF, corrected, LOGGER, result_cache=cache
+        )
+        assert (cache.hits, cache.misses) == (2, 2)
+        assert cache.stats()["entries"] == 6
+
+    expected = risk_mode_batch(INSTRUMENTS, AS_OF, corrected, LOGGER)
+    assert rerun.select(expected.columns).equals(expected)
+
+
+def test_cached_values_keep_instrument_and_risk_apart(tmp_path):
+    """Single-option reruns read the instrument and risk parts back as stored."""
+    market_dir = tmp_path / "market_data"
+    market_dir.mkdir()
+    (market_dir / "20251010.json").write_text(json.dumps({"20251010": MARKET_DATA}))
+    instrument = INSTRUMENTS[2]
+    with ResultCache(tmp_path / "cache.sqlite") as cache:
+        for name in ("priced.csv", "cached.csv"):
+            risk_mode_main(
+                instrument=instrument,
+                as_of_date="20251010",
+                verbose="",
+                json_path=market_dir,
+                write_csv=True,
+                csv_path=str(tmp_path / name),
+                higher_order=("vanna",),
+                result_cache=cache,
+            )
+        assert (cache.hits, cache.misses) == (1, 1)
+        key = cache.result_key(instrument, AS_OF, MARKET_DATA, ("vanna",))
+        value = cache.get_many([key])[key]
+
+    assert set(value) == {"instrument", "risk"}
+    assert value["instrument"]["market_price"] == 30.0
+    assert {"price", "delta", "vanna"} <= value["risk"].keys()
+    priced = (tmp_path / "priced.csv").read_text()
+    assert (tmp_path / "cached.csv").read_text() == priced
+
+
+def test_size_eviction_and_invalidation(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite", max_bytes=1_500)
+    rows = risk_mode_batch(INSTRUMENTS, AS_OF, MARKET_DATA, LOGGER).to_dicts()
+    keys = [cache.result_key(i, AS_OF, MARKET_DATA) for i in INSTRUMENTS]
+    cache.put_many(keys[:3], INSTRUMENTS[:3], AS_OF, rows[:3])
+    cache.get_many(keys[:1])
+    cache.put_many(keys[3:], INSTRUMENTS[3:], AS_OF, rows[3:])
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 1_500 and stats["evictions"] == 1
+    # The least recently used entry goes first
+    assert set(cache.get_many(keys)) == {keys[0], keys[2], keys[3]}
+
+    assert cache.invalidate(["MSFT"], as_of_date=datetime(2025, 10, 13)) == 0
+    assert cache.invalidate(["MSFT"], as_of_date=AS_OF) == 1
+    assert set(cache.get_many(keys)) == {keys[0], keys[2]}
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    cache.close()
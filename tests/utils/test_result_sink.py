@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import polars as pl
+import pytest
+from python_quant.mode_handler.risk_mode import risk_mode_portfolio_main
+from python_quant.utils.result_sink import RESULT_SCHEMA, ResultSink
+
+ROW = {
+    "strike_price": 280.0,
+    "expiration_date": "2026-12-20",
+    "option_type": "European",
+    "call_put": "put",
+    "underlying_ticker": "AAPL",
+    "underlying_type": "EQUITY",
+    "market_price": None,
+    "volatility": 0.35,
+    "day_count_convention": "ACT/365",
+    "price": 30.1,
+    "implied_volatility": 0.35,
+    "delta": -0.4,
+    "gamma": 0.004,
+    "theta": -10.0,
+    "rho": -150.0,
+    "vega": 110.0,
+}
+
+
+def test_csv_sink_appends_batches_with_one_header():
+    """Several flushes append to one CSV with the schema's columns."""
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname) / "out.csv"
+        with ResultSink(path, batch_rows=2) as sink:
+            for strike in (250.0, 260.0, 270.0):
+                sink.write_rows([{**ROW, "strike_price": strike, "extra": 1}])
+        df = pl.read_csv(path)
+
+    assert sink.parts_written == 2
+    assert df.columns == list(RESULT_SCHEMA)
+    assert df["strike_price"].to_list() == [250.0, 260.0, 270.0]
+
+
+@pytest.mark.parametrize("output_format", ["PARQUET", "IPC"])
+def test_columnar_sink_writes_part_files_with_stable_schema(output_format):
+    """Each flush is one part file; parts share the schema and concatenate."""
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname) / "out"
+        with ResultSink(path, output_format, batch_rows=2) as sink:
+            sink.write_rows([ROW, {**ROW, "market_price": 31.0}])
+            sink.write_rows([{key: ROW[key] for key in ("strike_price", "price")}])
+        parts = sorted(path.iterdir())
+        if output_format == "IPC":
+            frames = [pl.read_ipc(part, memory_map=True) for part in parts]
+        else:
+            frames = [pl.read_parquet(part) for part in parts]
+        df = pl.concat(frames)
+
+    assert len(parts) == 2
+    assert dict(df.schema) == RESULT_SCHEMA
+    assert df["market_price"].to_list() == [None, 31.0, None]
+    assert df["delta"].null_count() == 1
+
+
+@pytest.mark.parametrize("output_format", ["PARQUET", "IPC"])
+def test_rerun_into_same_directory_replaces_part_files(output_format):
+    """A shorter second run leaves none of the first run's parts behind."""
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname) / "out"
+        with ResultSink(path, "PARQUET", batch_rows=1) as sink:
+            sink.write_rows([ROW, ROW, ROW])
+            sink.write_rows([ROW])
+        (path / "notes.txt").write_text("kept")
+        with ResultSink(path, output_format, batch_rows=1) as sink:
+            sink.write_rows([{**ROW, "strike_price": 300.0}])
+        names = sorted(part.name for part in path.iterdir())
+
+    extension = "parquet" if output_format == "PARQUET" else "arrow"
+    assert names == ["notes.txt", f"part-00000.{extension}"]
+
+
+def test_portfolio_run_writes_parquet_matching_csv():
+    """Portfolio RISK output is the same in CSV and Parquet."""
+    instrument = {
+        "type": "OPTION",
+        "underlying": {"type": "EQUITY", "symbol": "AAPL"},
+        "option_type": "CALL",
+        "expiry": "20261220",
+        "style": "EUROPEAN",
+    }
+    with TemporaryDirectory() as tmpdirname:
+        path = Path(tmpdirname)
+        portfolio = path / "book.jsonl"
+        portfolio.write_text(
+            "\n".join(json.dumps({**instrument, "strike": k}) for k in range(200, 320))
+        )
+        outputs = {}
+        for output_format, target in (("CSV", "risk.csv"), ("PARQUET", "risk")):
+            risk_mode_portfolio_main(
+                portfolio_path=portfolio,
+                as_of_date="20251010",
+                verbose="",
+                json_path="input_data/market_data",
+                write_csv=True,
+                csv_path=str(path / target),
+                chunk_size=50,
+                output_format=output_format,
+            )
+        outputs["CSV"] = pl.read_csv(path / "risk.csv", schema=RESULT_SCHEMA)
+        outputs["PARQUET"] = pl.read_parquet(path / "risk" / "*.parquet")
+
+    assert outputs["PARQUET"].height == 120
+    assert outputs["CSV"].equals(outputs["PARQUET"])